@@ -0,0 +1,85 @@
+"""Measure peak resident memory of the log viewer's whole-file scans.
+
+Usage:
+    python benchmarks/bench_memory.py [--size-mb 1024]
+
+A synthetic pip log of the requested size is written to a temporary
+directory and backdated so it is memory-mapped. Each operation then runs in
+its own child process, and the peak RSS of the child is printed next to
+that of a child that only imports the modules. Peak RSS should stay roughly
+the same whatever --size-mb is, except for line_index and page, which keep
+8 bytes per line for the index itself.
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tts_webui_extension", "log_viewer"))
+
+from bench_analyzer import write_synthetic_log  # noqa: E402
+
+
+OPERATIONS = ["baseline", "line_index", "page", "search", "search_context", "analyze"]
+
+
+def run_operation(name, path):
+    """Run one operation on path in this process."""
+    import analyzer
+    import utils
+    
+    if name == "line_index":
+        utils.count_lines(path)
+    elif name == "page":
+        total = utils.count_lines(path)
+        utils.read_line_range(path, total // 2, 1000)
+    elif name == "search":
+        utils.read_log_file(path, "flash-attn", max_lines=1000)
+    elif name == "search_context":
+        utils.read_log_file(path, "ERROR:", max_lines=1000, context_lines=3)
+    elif name == "analyze":
+        analyzer.get_pip_log_analysis(path)
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--child", nargs=2, metavar=("OPERATION", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        name, path = args.child
+        start = time.perf_counter()
+        run_operation(name, path)
+        print(f"{peak_rss_mb():.1f} {time.perf_counter() - start:.2f}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pip-install-synthetic.log")
+        write_synthetic_log(path, args.size_mb)
+        # Old enough to be mapped rather than read as a busy log
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+        
+        print(f"log size: {os.path.getsize(path) / (1024 * 1024):.0f} MB")
+        for name in OPERATIONS:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", name, path],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()
+            print(f"{name:<16} peak RSS {float(out[0]):8.1f} MB  {float(out[1]):7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Benchmark the log viewer's hot paths on synthetic logs at several scales.
+
+Usage:
+    python benchmarks/bench_suite.py [--preset quick|full] [--repeat 3]
+                                     [--save baseline.json] [--compare baseline.json]
+
+Directory benchmarks fill a temporary installer_scripts/logs with a mix of
+pip install, pip uninstall and other logs for each file count; file
+benchmarks write one pip install log for each size. Every case runs with
+cold caches, and reports the best wall time of --repeat runs plus the peak
+Python allocation of one more run, measured with tracemalloc (mapped file
+pages are not allocations, see bench_memory.py for RSS).
+
+--save writes the results as JSON. --compare reads such a file and exits
+with status 1 when a case got slower or hungrier than --tolerance allows.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tts_webui_extension", "log_viewer"))
+
+import analyzer  # noqa: E402
+import utils  # noqa: E402
+from bench_analyzer import PIP_LINES, WEIGHTS  # noqa: E402
+
+
+PRESETS = {
+    "quick": {"files": [10, 1000], "sizes": ["1KB", "1MB", "100MB"]},
+    "full": {"files": [10, 1000, 10000, 50000], "sizes": ["1KB", "1MB", "100MB", "1GB"]},
+}
+
+UNINSTALL_LINES = [
+    "Found existing installation: torch 2.3.0",
+    "Uninstalling torch-2.3.0:",
+    "  Would remove:",
+    "    /venv/lib/python3.10/site-packages/torch/*",
+    "  Successfully uninstalled torch-2.3.0",
+    "WARNING: Skipping flash-attn as it is not installed.",
+]
+
+OTHER_LINES = [
+    "Starting TTS Generation WebUI",
+    "Loading model from ./data/models/bark",
+    "Running on local URL:  http://127.0.0.1:7770",
+]
+
+# Share of the synthetic directory per log kind
+DIRECTORY_MIX = [("pip-install-", 6), ("pip-uninstall-", 2), ("webui-", 2)]
+
+# Size of each log in the directory benchmarks
+DIRECTORY_LOG_SIZE = 2048
+
+SEARCH_TERM = "flash-attn"
+
+
+def parse_size(text):
+    """Parse a size like 1KB, 100MB or 1GB into bytes."""
+    units = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+    text = text.strip().upper()
+    for unit, factor in units.items():
+        if text.endswith(unit):
+            return int(float(text[: -len(unit)]) * factor)
+    return int(text)
+
+
+def make_log_text(lines, weights, size, rng):
+    """Build a synthetic log of about size bytes from weighted template lines."""
+    parts = []
+    written = 0
+    while written < size:
+        line = f"{rng.choices(lines, weights=weights)[0]} [{rng.randrange(50)}]\n"
+        parts.append(line)
+        written += len(line.encode("utf-8"))
+    return "".join(parts)
+
+
+def write_log(path, lines, weights, size, rng):
+    """Write a synthetic log of about size bytes, in blocks for large sizes."""
+    block = make_log_text(lines, weights, min(size, 4 * 1024 * 1024), rng).encode("utf-8")
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            f.write(block)
+            written += len(block)
+
+
+def populate_directory(log_dir, count, seed=0):
+    """Fill log_dir with count small logs in the DIRECTORY_MIX proportions."""
+    rng = random.Random(seed)
+    templates = {
+        "pip-install-": [make_log_text(PIP_LINES, WEIGHTS, DIRECTORY_LOG_SIZE, rng) for _ in range(8)],
+        "pip-uninstall-": [make_log_text(UNINSTALL_LINES, None, DIRECTORY_LOG_SIZE, rng) for _ in range(4)],
+        "webui-": [make_log_text(OTHER_LINES, None, DIRECTORY_LOG_SIZE, rng) for _ in range(4)],
+    }
+    prefixes = [prefix for prefix, share in DIRECTORY_MIX for _ in range(share)]
+    now = time.time()
+    for i in range(count):
+        prefix = prefixes[i % len(prefixes)]
+        path = os.path.join(log_dir, f"{prefix}package{i}.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(rng.choice(templates[prefix]))
+        # Spread the mtimes out so the newest-first ordering means something
+        os.utime(path, (now - i * 60, now - i * 60))
+
+
+def clear_caches():
+    """Forget every in-memory cache, so each run starts cold."""
+    utils.invalidate_log_snapshot()
+    utils._line_indexes.clear()
+    analyzer._analysis_cache.clear()
+
+
+def measure(fn, repeat, setup=clear_caches):
+    """Best wall time of repeat runs and the peak allocation of one more."""
+    times = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    setup()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": peak}
+
+
+def bench_directory(count, repeat):
+    """Directory-wide operations over count logs."""
+    results = {}
+    log_dir = utils.get_log_directory()
+    populate_directory(log_dir, count)
+    
+    results["list_log_files"] = measure(utils.list_log_files, repeat)
+    results["get_log_stats"] = measure(utils.get_log_stats, repeat)
+    results["get_pip_log_summary"] = measure(analyzer.get_pip_log_summary, repeat)
+    # Every run deletes the logs, so each one repopulates first
+    results["delete_all_logs"] = measure(
+        utils.delete_all_logs, 1, setup=lambda: (populate_directory(log_dir, count), clear_caches()),
+    )
+    return results
+
+
+def bench_file(size, repeat, seed=0):
+    """Single-file operations on a pip install log of size bytes."""
+    results = {}
+    log_dir = utils.get_log_directory()
+    filename = "pip-install-synthetic.log"
+    path = os.path.join(log_dir, filename)
+    write_log(path, PIP_LINES, WEIGHTS, size, random.Random(seed))
+    # Old enough to be read like a finished log
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+    
+    results["read_log_file"] = measure(lambda: utils.read_log_file(filename), repeat)
+    results["read_log_file_search"] = measure(lambda: utils.read_log_file(filename, SEARCH_TERM), repeat)
+    results["analyze_pip_log"] = measure(lambda: analyzer.analyze_pip_log(filename), repeat)
+    os.remove(path)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print how results differ from baseline and return the regressed case names."""
+    regressions = []
+    for case, current in sorted(results.items()):
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            before, after = previous[metric], current[metric]
+            # Ignore noise on cases too small to time or measure reliably
+            floor = 0.005 if metric == "seconds" else 64 * 1024
+            if after > max(before, floor) * (1 + tolerance):
+                regressions.append(f"{case} {metric}")
+                print(f"REGRESSION {case} {metric}: {before:.4g} -> {after:.4g}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--files", help="comma-separated file counts, overriding the preset")
+    parser.add_argument("--sizes", help="comma-separated log sizes like 1KB,1MB,1GB, overriding the preset")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="PATH", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    args = parser.parse_args()
+    
+    preset = PRESETS[args.preset]
+    counts = [int(n) for n in args.files.split(",")] if args.files else preset["files"]
+    sizes = args.sizes.split(",") if args.sizes else preset["sizes"]
+    
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # get_log_directory is relative to the working directory
+        os.chdir(tmp)
+        try:
+            for count in counts:
+                for name, result in bench_directory(count, args.repeat).items():
+                    results[f"{name}@{count}files"] = result
+            for size in sizes:
+                for name, result in bench_file(parse_size(size), args.repeat).items():
+                    results[f"{name}@{size}"] = result
+        finally:
+            os.chdir(cwd)
+    
+    mb = 1024 * 1024
+    for case, result in results.items():
+        print(f"{case:<40} {result['seconds'] * 1000:10.1f} ms  peak {result['peak_bytes'] / mb:8.2f} MB")
+    
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Tests for incremental pip log analysis."""
+
+import os
+
+from tts_webui_extension.log_viewer.analyzer import get_pip_log_analysis, get_analysis_cache_stats
+from tts_webui_extension.log_viewer.models import Status
+
+
+FAILED_RUN = (
+    "Collecting torch==9.9\n"
+    "ERROR: No matching distribution found for torch==9.9\n"
+)
+
+SUCCESSFUL_RUN = (
+    "Collecting torch==2.4.0\n"
+    "  Downloading torch-2.4.0-cp311-cp311-manylinux1_x86_64.whl (797.2 MB)\n"
+    "Installing collected packages: torch\n"
+    "Successfully installed torch-2.4.0\n"
+)
+
+
+def test_appended_log_is_resumed(tmp_path):
+    path = str(tmp_path / "pip-install-torch.log")
+    with open(path, "w") as f:
+        f.write("Collecting torch==2.4.0\n")
+    assert get_pip_log_analysis(path).status == Status.UNKNOWN
+    resumed = get_analysis_cache_stats()["resumed"]
+    
+    with open(path, "a") as f:
+        f.write(SUCCESSFUL_RUN[len("Collecting torch==2.4.0\n"):])
+    result = get_pip_log_analysis(path)
+    
+    assert get_analysis_cache_stats()["resumed"] == resumed + 1
+    assert result.status == Status.SUCCESS
+    assert result.line_count == SUCCESSFUL_RUN.count("\n") + 1
+
+
+def test_log_rewritten_in_place_is_analyzed_from_the_start(tmp_path):
+    path = str(tmp_path / "pip-install-torch.log")
+    with open(path, "w") as f:
+        f.write(FAILED_RUN)
+    inode = os.stat(path).st_ino
+    assert get_pip_log_analysis(path).status == Status.FAILED
+    
+    # A new run reopens the same file with mode "w": same inode, larger size
+    with open(path, "w") as f:
+        f.write(SUCCESSFUL_RUN)
+    assert os.stat(path).st_ino == inode
+    result = get_pip_log_analysis(path)
+    
+    assert result.status == Status.SUCCESS
+    assert result.errors == []
+    assert [r.name for r in result.package_records] == ["torch"]
+
+
+def test_timeline_is_built_only_when_asked_for(tmp_path):
+    path = str(tmp_path / "pip-install-torch.log")
+    with open(path, "w") as f:
+        f.write(SUCCESSFUL_RUN[:SUCCESSFUL_RUN.index("Installing")])
+    assert get_pip_log_analysis(path).phases == []
+    assert [p.name for p in get_pip_log_analysis(path, with_timeline=True).phases] == ["resolve", "download"]
+    
+    with open(path, "a") as f:
+        f.write(SUCCESSFUL_RUN[SUCCESSFUL_RUN.index("Installing"):])
+    # A timeline that fell behind the log is left out until it is asked for again
+    assert get_pip_log_analysis(path).phases == []
+    result = get_pip_log_analysis(path, with_timeline=True)
+    
+    assert [p.name for p in result.phases] == ["resolve", "download", "install"]
+    assert [(p.name, p.download_bytes) for p in result.package_timings] == [("torch", 797200000)]
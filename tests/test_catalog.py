@@ -0,0 +1,106 @@
+"""Tests for incremental ingestion into the search catalog."""
+
+import os
+
+import pytest
+
+from tts_webui_extension.log_viewer.catalog import (
+    FTS5_AVAILABLE, update_catalog, search_catalog, get_top_failures, get_package_history, get_catalog_path,
+)
+from tts_webui_extension.log_viewer import catalog
+from tts_webui_extension.log_viewer.utils import set_log_directory
+
+
+pytestmark = pytest.mark.skipif(not FTS5_AVAILABLE, reason="SQLite without FTS5")
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    path = tmp_path / "logs"
+    path.mkdir()
+    set_log_directory(str(path))
+    yield path
+    set_log_directory(None)
+
+
+def test_appended_lines_are_indexed_once(log_dir):
+    path = log_dir / "pip-install-torch.log"
+    path.write_text("Collecting torch\nDownloading torch")
+    update_catalog()
+    
+    with open(path, "a") as f:
+        f.write("-2.4.0.whl\nSuccessfully installed torch-2.4.0\n")
+    update_catalog()
+    
+    hits, total, _ = search_catalog("torch")
+    assert [(line, text) for _, line, text, _ in hits] == [
+        (1, "Collecting torch"), (2, "Downloading torch-2.4.0.whl"), (3, "Successfully installed torch-2.4.0"),
+    ]
+
+
+def test_log_rewritten_in_place_is_indexed_again(log_dir):
+    path = log_dir / "pip-install-torch.log"
+    path.write_text("Collecting torch==9.9\nERROR: No matching distribution found for torch==9.9\n")
+    update_catalog()
+    assert get_top_failures()
+    inode = os.stat(path).st_ino
+    
+    # A new run reopens the same file with mode "w": same inode, larger size
+    with open(path, "w") as f:
+        f.write(
+            "Collecting torch==2.4.0\n"
+            "  Downloading torch-2.4.0-cp311-cp311-manylinux1_x86_64.whl (797.2 MB)\n"
+            "Successfully installed torch-2.4.0\n"
+        )
+    assert os.stat(path).st_ino == inode
+    update_catalog()
+    
+    assert search_catalog("No matching distribution")[1] == 0
+    assert search_catalog("Successfully installed")[1] == 1
+    assert get_top_failures() == []
+    records, _ = get_package_history("torch")
+    assert [(action, version) for _, _, _, action, _, version, _ in records] == [("installed", "2.4.0")]
+
+
+def test_catalog_is_compacted_after_logs_are_deleted(log_dir):
+    for i in range(20):
+        (log_dir / f"pip-install-pkg{i}.log").write_text("".join(f"Collecting pkg{i}-dep{n}\n" for n in range(2000)))
+    update_catalog()
+    catalog = get_catalog_path()
+    full = os.path.getsize(catalog)
+    
+    for path in list(log_dir.iterdir())[1:]:
+        path.unlink()
+    update_catalog()
+    
+    assert os.path.getsize(catalog) < full / 2
+    assert search_catalog("Collecting")[1] == 2000
+
+
+def test_failures_count_every_error_line(log_dir):
+    errors = "".join(f"ERROR: No matching distribution found for torch=={i}.0\n" for i in range(60))
+    (log_dir / "pip-install-py3.log").write_text(errors)
+    (log_dir / "pip-install-py.log").write_text(errors[:errors.index("\n") + 1])
+    update_catalog()
+    
+    [(signature, occurrences, logs, _, packages, _, _)] = get_top_failures()
+    assert occurrences == 61
+    assert logs == 2
+    assert packages == ["py", "py3"]
+
+
+def test_a_log_that_fails_to_ingest_does_not_stop_the_others(log_dir, monkeypatch):
+    (log_dir / "pip-install-bad.log").write_text("Collecting bad\n")
+    (log_dir / "pip-install-good.log").write_text("Collecting good\n")
+    analyze = catalog.get_pip_log_errors
+    
+    def get_pip_log_errors(filepath):
+        if filepath.endswith("bad.log"):
+            raise ValueError("unparseable")
+        return analyze(filepath)
+    
+    monkeypatch.setattr(catalog, "get_pip_log_errors", get_pip_log_errors)
+    update_catalog()
+    
+    assert [text for _, _, text, _ in search_catalog("Collecting")[0]] == ["Collecting good"]
+    assert "pip-install-bad.log" in catalog.format_catalog_state()
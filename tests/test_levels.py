@@ -0,0 +1,49 @@
+"""Tests for the per-line level filter."""
+
+from tts_webui_extension.log_viewer.levels import line_levels, level_table, select_lines, count_selected
+from tts_webui_extension.log_viewer.utils import read_log_file, set_log_directory
+
+
+LOG = (
+    "Collecting torch\n"
+    "WARNING: slow download\n"
+    "ERROR: boom\n"
+    "plain output\n"
+    "Successfully installed torch-2.4.0\n"
+    "ERROR: again"
+)
+
+
+def test_several_levels_select_the_union_of_their_lines():
+    levels = line_levels(LOG.encode())
+    
+    table = level_table(["error", "warning"])
+    assert select_lines(levels, table) == [(1, 3), (5, 6)]
+    assert count_selected(levels, table) == 3
+    
+    table = level_table(["error", "other"])
+    assert select_lines(levels, table) == [(2, 4), (5, 6)]
+    assert count_selected(levels, table) == 3
+
+
+def test_every_level_means_no_filter():
+    assert level_table(["error", "warning", "success", "phase", "other"]) is None
+    assert level_table([]) is None
+
+
+def test_appended_lines_are_counted_at_their_levels(tmp_path):
+    set_log_directory(str(tmp_path))
+    try:
+        path = tmp_path / "pip-install-torch.log"
+        path.write_text(LOG + "\n")
+        text = read_log_file(path.name, levels=["error", "warning"])
+        assert "[3 lines at the selected levels]" in text
+        
+        with open(path, "a") as f:
+            f.write("WARNING: retrying\nplain output\nERROR: third\n")
+        text = read_log_file(path.name, levels=["error", "warning"], max_lines=2)
+        assert "[Showing last 2 of 5 lines at the selected levels]" in text
+        assert "ERROR: third" in text
+        assert "plain output" not in text
+    finally:
+        set_log_directory(None)
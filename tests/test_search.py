@@ -0,0 +1,48 @@
+"""Tests for the streaming block search."""
+
+import re
+
+import pytest
+
+from tts_webui_extension.log_viewer.search import compile_search_pattern, iter_search_blocks
+
+
+def _search(path, term, context=0, block_size=16, use_regex=False):
+    pattern = compile_search_pattern(term, use_regex)
+    return [hit for _, hits in iter_search_blocks(str(path), pattern, context, block_size) for hit in hits]
+
+
+@pytest.fixture
+def numbered_log(tmp_path):
+    # Lines of 7 or 8 bytes, so 16-byte blocks end every line or two
+    path = tmp_path / "install.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 21)))
+    return path
+
+
+def test_context_spans_block_boundaries(numbered_log):
+    assert _search(numbered_log, "line 10", context=3) == [
+        (7, "line 7", False), (8, "line 8", False), (9, "line 9", False),
+        (10, "line 10", True),
+        (11, "line 11", False), (12, "line 12", False), (13, "line 13", False),
+    ]
+
+
+def test_overlapping_context_is_shown_once(numbered_log):
+    hits = _search(numbered_log, r"line 1[03]$", context=2, use_regex=True)
+    
+    assert [number for number, _, _ in hits] == list(range(8, 16))
+    assert [number for number, _, is_match in hits if is_match] == [10, 13]
+
+
+def test_invalid_regex_is_rejected():
+    with pytest.raises(re.error):
+        compile_search_pattern("pip (install", use_regex=True)
+
+
+def test_match_on_last_line_without_newline(tmp_path):
+    path = tmp_path / "install.log"
+    path.write_text("Collecting torch\nInstalling\nERROR: failed")
+    
+    assert _search(path, "error", context=1) == [(2, "Installing", False), (3, "ERROR: failed", True)]
+    assert _search(path, "error") == [(3, "ERROR: failed", True)]
@@ -0,0 +1,40 @@
+"""Tests for the cached line index behind log paging."""
+
+import os
+
+from tts_webui_extension.log_viewer.utils import get_line_index, read_log_file, set_log_directory
+
+
+def test_grown_log_extends_the_index(tmp_path):
+    path = str(tmp_path / "install.log")
+    with open(path, "w") as f:
+        f.write("one\ntwo\nunfin")
+    assert get_line_index(path).line_count == 3
+    
+    with open(path, "a") as f:
+        f.write("ished\nfour\n")
+    index = get_line_index(path)
+    
+    assert index.line_count == 4
+    assert [index.line_start(line) for line in range(4)] == [0, 4, 8, 19]
+
+
+def test_log_rewritten_in_place_is_indexed_again(tmp_path):
+    set_log_directory(str(tmp_path))
+    try:
+        path = str(tmp_path / "install.log")
+        with open(path, "w") as f:
+            f.write("first run\nfailed\n")
+        inode = os.stat(path).st_ino
+        assert "[Showing lines 1-2 of 2]" in read_log_file("install.log", start_line=1)
+        
+        # A new run reopens the same file with mode "w": same inode, larger size
+        with open(path, "w") as f:
+            f.write("second run, line 1\nline 2\nline 3\nline 4\n")
+        assert os.stat(path).st_ino == inode
+        
+        text = read_log_file("install.log", start_line=1)
+        assert "[Showing lines 1-4 of 4]" in text
+        assert "first run" not in text
+    finally:
+        set_log_directory(None)
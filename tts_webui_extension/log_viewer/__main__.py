@@ -0,0 +1,9 @@
+"""Run the Log Viewer command line: python -m tts_webui_extension.log_viewer --help"""
+
+import sys
+
+from .cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
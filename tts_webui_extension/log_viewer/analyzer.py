@@ -1,14 +1,858 @@
 """Log analysis functions for pip installation logs."""
 
+import functools
+import logging
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
 try:
     from .utils import get_log_directory, get_pip_install_logs, get_pip_uninstall_logs
+    from .models import AnalysisResult, Finding, PackageRecord, PhaseTiming, Status, normalize_package_name
+    from .compression import is_compressed, strip_log_suffix, get_raw_size
+    from .reader import iter_log_blocks, read_log_spans, update_fingerprint, read_fingerprint
+    from .diagnostics import instrument
+    from .rendering import clean_line
+    from .levels import PIP_LOG_RULES, PIP_LOG_CATEGORIES, PIP_STEP_PHASES, compile_rules
 except ImportError:
     from utils import get_log_directory, get_pip_install_logs, get_pip_uninstall_logs
+    from models import AnalysisResult, Finding, PackageRecord, PhaseTiming, Status, normalize_package_name
+    from compression import is_compressed, strip_log_suffix, get_raw_size
+    from reader import iter_log_blocks, read_log_spans, update_fingerprint, read_fingerprint
+    from diagnostics import instrument
+    from rendering import clean_line
+    from levels import PIP_LOG_RULES, PIP_LOG_CATEGORIES, PIP_STEP_PHASES, compile_rules
 
+logger = logging.getLogger(__name__)
 
+PIP_LOG_PATTERN, PIP_LOG_LOOKUP = compile_rules(PIP_LOG_RULES)
+
+
+def classify_pip_log(data, found=None, first_line=1, first_offset=0, package_records=None):
+    """Classify the lines of a pip log in a single pass over raw bytes.
+
+    Returns a dict mapping each category to {stripped line: [line number,
+    byte offset, count]}, in order of first appearance. Only matching lines
+    are sliced out; the rest of the data is never split or decoded. Pass the
+    dict from a previous call as found, with the line number and byte offset
+    where data starts, to keep adding to it.
+    
+    Given _PackageRecords too, the same pass records the package lines in
+    data, which must be whole lines.
+    """
+    if found is None:
+        found = {category: {} for category in PIP_LOG_CATEGORIES}
+    last_line = {category: -1 for category in PIP_LOG_CATEGORIES}
+    line = first_line
+    counted_to = 0
+    if package_records is None:
+        pattern, lookup = PIP_LOG_PATTERN, PIP_LOG_LOOKUP
+    else:
+        pattern, lookup = ANALYSIS_PATTERN, ANALYSIS_LOOKUP
+    
+    for m in pattern.finditer(data):
+        categories = lookup[m.group()]
+        line_start = data.rfind(b"\n", 0, m.start()) + 1
+        message = None
+        for category in categories:
+            if category == "packages":
+                line += data.count(b"\n", counted_to, line_start)
+                counted_to = line_start
+                package_records.add(data, m, line_start, line)
+                continue
+            if line_start == last_line[category]:
+                # Already counted this line for this category
+                continue
+            last_line[category] = line_start
+            if message is None:
+                line += data.count(b"\n", counted_to, line_start)
+                counted_to = line_start
+                line_end = data.find(b"\n", m.end())
+                if line_end == -1:
+                    line_end = len(data)
+                message = data[line_start:line_end].strip()
+            entry = found[category].get(message)
+            if entry is None:
+                found[category][message] = [line, first_offset + line_start, 1]
+            else:
+                entry[2] += 1
+    return found
+
+
+def _to_findings(found, limit):
+    """Turn one category of classify_pip_log output into Finding objects."""
+    findings = []
+    for message, (line, offset, count) in found.items():
+        if len(findings) >= limit:
+            break
+        findings.append(Finding(message.decode("utf-8", errors="ignore"), line, offset, count))
+    return findings
+
+
+def package_from_filename(filename):
+    """Get the package name from a pip log filename, e.g. pip-install-foo.log -> foo."""
+    name = os.path.basename(filename)
+    for prefix in ("pip-install-", "pip-uninstall-"):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    return strip_log_suffix(name)
+
+
+# Variable parts of error lines and what replaces them in failure
+# signatures, in order: later rules only see what earlier ones left
+_SIGNATURE_RULES = [
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), ""),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), ""),
+    (re.compile(r"\b[a-z][a-z0-9+.-]*://\S+", re.IGNORECASE), "<url>"),
+    (re.compile(r"(?:\b[A-Za-z]:)?(?:[\\/][\w.~+@-]+){2,}[\\/]?"), "<path>"),
+    (re.compile(r"\b(?:sha256[:=])?[0-9a-f]{12,}\b", re.IGNORECASE), "<hash>"),
+    (re.compile(r"\bv?\d+(?:\.\d+)+(?:[-_.]?(?:a|b|rc|dev|post)\d*)*(?:\+[\w.]+)?\b", re.IGNORECASE), "<version>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b\d+\b", re.IGNORECASE), "<n>"),
+]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def failure_signature(message):
+    """Normalize an error line so the same failure reads the same in every log.
+
+    Timestamps are dropped, and URLs, paths, hashes, versions and other
+    numbers are replaced by placeholders, e.g. "ERROR: No matching distribution found for
+    torch==2.3.0" becomes "ERROR: No matching distribution found for
+    torch==<version>".
+    """
+    for pattern, placeholder in _SIGNATURE_RULES:
+        message = pattern.sub(placeholder, message)
+    return _WHITESPACE.sub(" ", message).strip()
+
+
+def get_summary_status(result):
+    """Status for the summary list, where any success counts.
+
+    Failures count only when nothing succeeded: pip often logs harmless
+    errors for optional extras during a good install.
+    """
+    if result.error_count and not result.success_count:
+        return Status.FAILED
+    if result.success_count:
+        return Status.SUCCESS
+    return Status.UNKNOWN
+
+
+# Timestamp at the start of a line, as written by pip --log and most installers
+_TIMESTAMP = re.compile(rb"^\s*\[?(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})", re.MULTILINE)
+
+# How far into a log to look for its first timestamp, and back from the end
+# of a block for its last one. Lines without one are scanned slowly, and a
+# log that has none this far in mostly has none at all.
+_TIMESTAMP_TAIL = 64 * 1024
+
+
+def _parse_timestamp(match):
+    """Convert a _TIMESTAMP match to a POSIX timestamp (local time)."""
+    return _timestamp_value(match.group(1), match.group(2))
+
+
+# Consecutive lines mostly share a timestamp, and strptime is slow
+@functools.lru_cache(maxsize=1024)
+def _timestamp_value(date, clock):
+    text = (date + b" " + clock).decode("ascii")
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+# The phases of levels.PIP_STEP_PHASES, in the order a run goes through them
+PIP_PHASES = ("resolve", "download", "build", "install")
+
+# Lines listing the packages a pip run changed or found installed, and the
+# PackageRecord action of each. They double as classification rules, so the
+# literals must stay the same as in levels.PIP_LOG_RULES.
+PIP_PACKAGE_LINES = {
+    "Successfully installed": "installed",
+    "Successfully uninstalled": "uninstalled",
+    "Requirement already satisfied": "satisfied",
+}
+
+_STEP_PHASES = {step.encode(): phase for step, phase in PIP_STEP_PHASES.items()}
+_PACKAGE_ACTIONS = {prefix.encode(): action for prefix, action in PIP_PACKAGE_LINES.items()}
+
+# The classification rules with package lines marked as "packages" too. The
+# literals are the same as PIP_LOG_PATTERN's, so package records cost no
+# extra scanning.
+ANALYSIS_PATTERN, ANALYSIS_LOOKUP = compile_rules(
+    PIP_LOG_RULES + [("packages", prefix) for prefix in PIP_PACKAGE_LINES]
+)
+
+# Step lines, scanned for in a pass of their own only when a timeline is
+# asked for, see _AnalysisState.advance_timeline
+_STEP_PATTERN = re.compile(b"|".join(re.escape(step) for step in sorted(_STEP_PHASES, key=len, reverse=True)))
+
+# Only for package lines on an unfinished last line, see _PackageRecords.to_list
+_PACKAGE_LINE = re.compile(b"|".join(re.escape(prefix) for prefix in _PACKAGE_ACTIONS))
+
+# Steps naming a file or URL rather than a requirement
+_FILE_STEPS = (b"Downloading ", b"Using cached ", b"Processing ")
+
+# "(12.3 MB)" after a download, and the number before a progress bar's
+# rate, e.g. "45.2 MB/s"
+_DOWNLOAD_SIZE = re.compile(rb"\((\d+(?:\.\d+)?) (bytes|kB|MB|GB)\)")
+_RATE_VALUE = re.compile(rb"(\d+(?:\.\d+)?) ?$")
+_UNITS = {b"bytes": 1, b"kB": 1000, b"MB": 1000 ** 2, b"GB": 1000 ** 3}
+
+
+def _last_rate(data, start, end):
+    """Bytes per second of the last progress bar rate in data[start:end], or None.
+
+    Progress bars repeat their rate many times per line, so rather than
+    matching each one, only the last is looked for when a download ends.
+    """
+    while True:
+        unit = data.rfind(b"B/s", start, end)
+        if unit < start + 1:
+            return None
+        end = unit
+        scale = _UNITS.get(data[unit - 1:unit + 1])
+        if scale is not None:
+            value = _RATE_VALUE.search(data, max(start, unit - 33), unit - 1)
+            return float(value.group(1)) * scale if value else None
+
+
+_REQUIREMENT_NAME = re.compile(rb"[A-Za-z0-9][A-Za-z0-9._-]*")
+_ARCHIVE_NAME = re.compile(rb"(.+?)-\d")
+
+
+def _step_package(step, rest):
+    """Normalized name of the package a step line is about, or None."""
+    token = rest.split(None, 1)[0] if rest.strip() else b""
+    return _package_name(token, step in _FILE_STEPS)
+
+
+@functools.lru_cache(maxsize=4096)
+def _package_name(token, is_file):
+    token = token.rstrip(b":,")
+    if is_file:
+        # A wheel or sdist file name, possibly at the end of a URL or path
+        token = token.replace(b"\\", b"/").rstrip(b"/").rsplit(b"/", 1)[-1]
+        match = _ARCHIVE_NAME.match(token) or _REQUIREMENT_NAME.match(token)
+    else:
+        match = _REQUIREMENT_NAME.match(token)
+    if not match:
+        return None
+    name = match.group(1 if match.re is _ARCHIVE_NAME else 0).decode("utf-8", errors="ignore")
+    return normalize_package_name(name) or None
+
+
+def _add_step(phases, packages, step, offset, when):
+    """Add a step that ended at offset and time when to the totals; 1 if it was untimed."""
+    phase, package, start, started, size, rate = step
+    nbytes = offset - start
+    seconds = when - started if when is not None and started is not None else None
+    totals = phases.setdefault(phase, [0.0, 0])
+    totals[0] += seconds or 0.0
+    totals[1] += nbytes
+    if package is not None:
+        # seconds, bytes, downloaded bytes, seconds spent downloading, last reported rate
+        totals = packages.setdefault(package, [0.0, 0, 0, 0.0, None])
+        totals[0] += seconds or 0.0
+        totals[1] += nbytes
+        if phase == "download":
+            totals[2] += size
+            totals[3] += seconds or 0.0
+            totals[4] = rate or totals[4]
+    return 1 if seconds is None else 0
+
+
+class _Timeline:
+    """Where the time of a pip run went, built step by step as lines are analyzed.
+
+    A step runs from its line to the next step's line. Its seconds come from
+    the timestamps of both lines, and its share of the log from the bytes
+    written in between, which stands in for time in logs without timestamps.
+    """
+    
+    __slots__ = ("step", "phases", "packages", "resolving", "untimed")
+    
+    def __init__(self):
+        # [phase, package, offset, time, download size, rate] of the step in progress
+        self.step = None
+        self.phases = {}
+        self.packages = {}
+        # The package being resolved, for build steps that don't name one
+        self.resolving = None
+        self.untimed = 0
+    
+    def start_step(self, data, m, line_start, base):
+        """End the step in progress and start the one whose literal m matched.
+
+        data is whole lines starting at byte offset base, and line_start
+        where the line of m starts in it.
+        """
+        self._settle_rate(data, base, line_start)
+        stamp = _TIMESTAMP.match(data, line_start)
+        when = _parse_timestamp(stamp) if stamp else None
+        if self.step is not None:
+            self.untimed += _add_step(self.phases, self.packages, self.step, base + line_start, when)
+            self.step = None
+        
+        step = m.group()
+        phase = _STEP_PHASES[step]
+        if phase is None:
+            return
+        line_end = data.find(b"\n", m.end())
+        if line_end == -1:
+            line_end = len(data)
+        rest = data[m.end():line_end]
+        package = _step_package(step, rest) if step[-1:] == b" " else self.resolving
+        if phase == "resolve":
+            self.resolving = package
+        elif phase == "install":
+            package = None if step == b"Installing collected packages" else package
+        size = 0
+        if phase == "download":
+            found = _DOWNLOAD_SIZE.search(rest)
+            if found:
+                size = int(float(found.group(1)) * _UNITS[found.group(2)])
+        self.step = [phase, package, base + line_start, when, size, None]
+    
+    def feed(self, data, base):
+        """Add the steps in data, whole lines starting at byte offset base."""
+        for m in _STEP_PATTERN.finditer(data):
+            self.start_step(data, m, data.rfind(b"\n", 0, m.start()) + 1, base)
+        self.end_block(data, base)
+    
+    def end_block(self, data, base):
+        """Note the last rate of a download still in progress before the block goes away."""
+        self._settle_rate(data, base, len(data))
+    
+    def _settle_rate(self, data, base, end):
+        step = self.step
+        if step is not None and step[0] == "download":
+            rate = _last_rate(data, max(0, step[2] - base), end)
+            if rate is not None:
+                step[5] = rate
+    
+    def totals(self, offset, when):
+        """(phases, packages, untimed steps) with the step in progress ending at offset and when."""
+        phases = {phase: list(totals) for phase, totals in self.phases.items()}
+        packages = {package: list(totals) for package, totals in self.packages.items()}
+        untimed = self.untimed
+        if self.step is not None:
+            untimed += _add_step(phases, packages, self.step, offset, when)
+        return phases, packages, untimed
+
+
+# "(2.4.0)" ending a "Requirement already satisfied" line
+_SATISFIED_VERSION = re.compile(rb"\(([^()\s]+)\)\s*$")
+
+
+def _parse_packages(action, rest):
+    """(name, version) pairs listed after the prefix of a package line."""
+    if action == "satisfied":
+        # ": torch==2.4.0 in ./venv/lib/site-packages (from -r requirements.txt) (2.4.0)"
+        rest = rest.lstrip(b": ")
+        name = _package_name(rest.split(None, 1)[0], False) if rest.strip() else None
+        version = _SATISFIED_VERSION.search(rest)
+        return [(name, version.group(1).decode("utf-8", errors="ignore") if version else None)] if name else []
+    # " torch-2.4.0 typing-extensions-4.12.2"; names may contain "-", versions don't
+    pairs = []
+    for token in rest.split():
+        name, _, version = token.rpartition(b"-")
+        name = _package_name(name, False) if name else None
+        if name and version:
+            pairs.append((name, version.decode("utf-8", errors="ignore")))
+    return pairs
+
+
+class _PackageRecords:
+    """Packages a pip run installed, uninstalled or found satisfied, collected as lines are analyzed.
+
+    Each (action, name, version) is kept once, at the first line it appears on.
+    """
+    
+    __slots__ = ("records", "seen")
+    
+    def __init__(self):
+        # (action, name, version) -> PackageRecord, in log order
+        self.records = {}
+        # Package lines already parsed; repeated runs print the same ones again
+        self.seen = set()
+    
+    def add(self, data, m, line_start, line):
+        """Record the packages on line number line, at line_start in data, whose prefix m matched."""
+        line_end = data.find(b"\n", m.end())
+        if line_end == -1:
+            line_end = len(data)
+        text = data[m.start():line_end]
+        if text in self.seen:
+            return
+        self.seen.add(text)
+        action = _PACKAGE_ACTIONS[m.group()]
+        when = None
+        for name, version in _parse_packages(action, data[m.end():line_end]):
+            key = (action, name, version)
+            if key in self.records:
+                continue
+            if when is None:
+                stamp = _TIMESTAMP.match(data, line_start)
+                when = _parse_timestamp(stamp) if stamp else None
+            self.records[key] = PackageRecord(action, name, version, line, when)
+    
+    def to_list(self, tail=b"", tail_line=0):
+        """The records in log order, plus those on an unfinished last line tail."""
+        m = _PACKAGE_LINE.search(tail) if tail else None
+        if m is None:
+            return list(self.records.values())
+        merged = _PackageRecords()
+        merged.records = dict(self.records)
+        merged.seen = set(self.seen)
+        merged.add(tail, m, 0, tail_line)
+        return list(merged.records.values())
+
+
+# Size of the blocks read while analyzing
+ANALYSIS_BLOCK_SIZE = 4 * 1024 * 1024
+
+# How many per-file analysis states to keep in memory
+ANALYSIS_CACHE_SIZE = 256
+
+# How many unique lines per category an AnalysisResult carries
+MAX_REPORTED_FINDINGS = 50
+
+# How many packages, slowest first, an AnalysisResult carries timings for
+MAX_TIMED_PACKAGES = 50
+
+# Longest finding message shown in the Analysis tab
+MAX_FINDING_CHARS = 300
+
+# Minimum seconds between progress updates while a log is analyzed for the UI
+ANALYSIS_UPDATE_INTERVAL = 0.25
+
+# Plain logs at least this large get a sampled quick status while the full
+# analysis runs
+QUICK_STATUS_MIN_SIZE = 16 * 1024 * 1024
+
+# Bytes a quick status reads from the start and the end of a log; pip's
+# verdict is almost always in the last lines
+QUICK_STATUS_HEAD = 256 * 1024
+QUICK_STATUS_TAIL = 2 * 1024 * 1024
+
+# Evenly spaced blocks a quick status reads in between, and their size
+QUICK_STATUS_SAMPLES = 16
+QUICK_STATUS_SAMPLE_SIZE = 64 * 1024
+
+# path -> _AnalysisState, least recently used first
+_analysis_cache = OrderedDict()
+_analysis_cache_stats = {"hits": 0, "misses": 0, "resumed": 0}
+_analysis_cache_lock = threading.Lock()
+
+# Paths being analyzed by schedule_pip_log_analysis
+_background_analyses = set()
+_background_lock = threading.Lock()
+_background_done = threading.Condition(_background_lock)
+
+
+class _AnalysisState:
+    """Everything needed to resume analyzing a log where the last pass stopped.
+
+    Only complete lines are classified; bytes after the last newline are kept
+    in pending and picked up once the rest of the line has been written.
+    """
+    
+    __slots__ = (
+        "inode", "size", "file_size", "mtime_ns", "mtime", "newlines", "found", "pending",
+        "first_time", "last_time", "timeline", "timeline_end", "package_records", "fingerprint", "result",
+        "errors",
+    )
+    
+    def __init__(self):
+        self.inode = None
+        self.size = 0
+        self.file_size = 0
+        self.mtime_ns = None
+        self.mtime = 0
+        self.newlines = 0
+        self.found = {category: {} for category in PIP_LOG_CATEGORIES}
+        self.pending = b""
+        self.first_time = None
+        self.last_time = None
+        self.timeline = _Timeline()
+        # End of the bytes the timeline was built from; it lags behind size
+        # until a timeline is asked for
+        self.timeline_end = 0
+        self.package_records = _PackageRecords()
+        # Start and end of the bytes analyzed, see reader.update_fingerprint
+        self.fingerprint = (b"", b"")
+        self.result = None
+        # Every unique error line of result, which only carries the first ones
+        self.errors = {}
+    
+    def can_resume(self, filepath, stat):
+        """Whether the file only grew since this state was recorded.
+
+        Same inode and a larger size are not enough: an installer that
+        reopens the log with mode "w" for a new run keeps the inode, so the
+        bytes already analyzed must still be there too.
+        """
+        if self.inode != stat.st_ino or stat.st_size <= self.size:
+            return False
+        try:
+            return read_fingerprint(filepath, self.size) == self.fingerprint
+        except OSError:
+            return False
+    
+    def advance(self, filepath, stat):
+        """Classify the bytes appended since the last pass.
+
+        Archived logs never grow, so they are always read from the start and
+        to the end of the decompressed data; size counts decompressed bytes.
+        """
+        for _ in self.iter_advance(filepath, stat):
+            pass
+    
+    def iter_advance(self, filepath, stat):
+        """advance, yielding the bytes analyzed so far after each block.
+
+        Closing the generator early leaves a state that covers every block
+        seen, and can_resume treats it like a log that grew since.
+        """
+        self.inode = stat.st_ino
+        self.result = None
+        end = None if is_compressed(filepath) else stat.st_size
+        for offset, block in iter_log_blocks(filepath, ANALYSIS_BLOCK_SIZE, self.size, end):
+            data_offset = offset - len(self.pending)
+            self.size = offset + len(block)
+            self.fingerprint = update_fingerprint(self.fingerprint, block)
+            data = self.pending + block if self.pending else block
+            cut = data.rfind(b"\n") + 1
+            self.pending = data[cut:]
+            if cut:
+                # Blocks are whole lines except at the end, so this rarely copies
+                lines = data if cut == len(data) else data[:cut]
+                classify_pip_log(lines, self.found, self.newlines + 1, data_offset, self.package_records)
+                self.newlines += data.count(b"\n", 0, cut)
+                self._track_timestamps(data, cut, data_offset)
+            yield self.size
+        
+        self.file_size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.mtime = stat.st_mtime
+    
+    def _track_timestamps(self, data, cut, offset):
+        """Remember the first and latest line timestamps seen; data starts at byte offset."""
+        if self.first_time is None and offset < _TIMESTAMP_TAIL:
+            match = _TIMESTAMP.search(data, 0, min(cut, _TIMESTAMP_TAIL - offset))
+            if match:
+                self.first_time = _parse_timestamp(match)
+        last = None
+        for last in _TIMESTAMP.finditer(data, max(cut - _TIMESTAMP_TAIL, 0), cut):
+            pass
+        if last is not None:
+            self.last_time = _parse_timestamp(last) or self.last_time
+    
+    def has_timeline(self):
+        """Whether the timeline covers every complete line analyzed."""
+        return self.timeline_end == self.size - len(self.pending)
+    
+    def advance_timeline(self, filepath):
+        """Build the timeline from the steps in the lines analyzed since it was last built.
+
+        Most analyses never show a timeline, so it is a second pass, over
+        bytes that are usually still in the page cache, instead of a part of
+        every classification.
+        """
+        end = self.size - len(self.pending)
+        for offset, block in iter_log_blocks(filepath, ANALYSIS_BLOCK_SIZE, self.timeline_end, end):
+            # Archives ignore end, so leave out their unfinished last line here
+            data = block[:end - offset]
+            if not data:
+                break
+            self.timeline.feed(data, offset)
+            self.timeline_end = offset + len(data)
+        self.result = None
+    
+    def to_result(self, filepath, with_timeline=False):
+        """Build the AnalysisResult, counting the unfinished last line too.
+
+        Phase and package timings are only filled in with_timeline, or when
+        an earlier call built a timeline that is still up to date.
+        """
+        if with_timeline and not self.has_timeline():
+            self.advance_timeline(filepath)
+        if self.result is None:
+            found = self.found
+            if self.pending:
+                tail = classify_pip_log(self.pending, None, self.newlines + 1, self.size - len(self.pending))
+                found = {}
+                for category in PIP_LOG_CATEGORIES:
+                    merged = dict(self.found[category])
+                    for message, entry in tail[category].items():
+                        if message in merged:
+                            merged[message] = merged[message][:2] + [merged[message][2] + 1]
+                        else:
+                            merged[message] = entry
+                    found[category] = merged
+            
+            if found["error"]:
+                status = Status.FAILED
+            elif found["success"]:
+                status = Status.SUCCESS
+            else:
+                status = Status.UNKNOWN
+            
+            self.errors = found["error"]
+            phases, packages, estimated = self._timings() if self.has_timeline() else ([], [], False)
+            filename = os.path.basename(filepath)
+            self.result = AnalysisResult(
+                filename=filename,
+                package=package_from_filename(filename),
+                status=status,
+                size=self.size,
+                mtime=self.mtime,
+                line_count=self.newlines + 1,
+                error_count=len(found["error"]),
+                warning_count=len(found["warning"]),
+                success_count=len(found["success"]),
+                errors=_to_findings(found["error"], MAX_REPORTED_FINDINGS),
+                warnings=_to_findings(found["warning"], MAX_REPORTED_FINDINGS),
+                successes=_to_findings(found["success"], MAX_REPORTED_FINDINGS),
+                started=self.first_time,
+                finished=self.last_time,
+                phases=phases,
+                package_timings=packages,
+                timing_estimated=estimated,
+                package_records=self.package_records.to_list(self.pending, self.newlines + 1),
+            )
+        return self.result
+    
+    def _timings(self):
+        """PhaseTiming lists for the phases and the slowest packages, and whether seconds are estimated.
+
+        Without a timestamp on every step, seconds are the run's duration
+        split by each step's share of the log, or None if even that is unknown.
+        """
+        phases, packages, untimed = self.timeline.totals(self.size, self.last_time)
+        size = self.size or 1
+        estimated = bool(untimed)
+        duration = None
+        if self.first_time is not None and self.last_time is not None:
+            duration = max(0.0, self.last_time - self.first_time)
+        
+        def seconds(measured, nbytes):
+            if not estimated:
+                return measured
+            return None if duration is None else duration * nbytes / size
+        
+        phase_timings = [
+            PhaseTiming(phase, seconds(*phases[phase]), phases[phase][1] / size)
+            for phase in PIP_PHASES if phase in phases
+        ]
+        package_timings = []
+        for package, (measured, nbytes, downloaded, download_seconds, rate) in packages.items():
+            if not estimated and download_seconds > 0 and downloaded:
+                rate = downloaded / download_seconds
+            package_timings.append(PhaseTiming(package, seconds(measured, nbytes), nbytes / size, downloaded, rate))
+        package_timings.sort(key=lambda timing: (timing.seconds or 0.0, timing.share), reverse=True)
+        return phase_timings, package_timings[:MAX_TIMED_PACKAGES], estimated
+
+
+def _cache_state(filepath, state):
+    with _analysis_cache_lock:
+        _analysis_cache[filepath] = state
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+
+@instrument("analyzer.get_pip_log_analysis")
+def get_pip_log_analysis(filepath, with_timeline=False):
+    """Get the AnalysisResult of a pip log, reusing cached results.
+
+    State is cached per path and checked against the file's identity (size,
+    mtime and inode). An unchanged log is never reread, and a log that only
+    grew, like one from an install still in progress, is analyzed from the
+    last byte seen instead of from the start. with_timeline also fills in
+    the phase and package timings, which takes a second pass over the log.
+    """
+    for _, _, result in iter_pip_log_analysis(filepath, with_timeline):
+        pass
+    return result
+
+
+def get_pip_log_errors(filepath):
+    """Get (AnalysisResult, Findings of every unique error line) of a pip log.
+
+    AnalysisResult.errors stops at MAX_REPORTED_FINDINGS; these don't, for
+    counts over all of a log's errors.
+    """
+    result = get_pip_log_analysis(filepath)
+    with _analysis_cache_lock:
+        state = _analysis_cache.get(filepath)
+        errors = state.errors if state is not None and state.result is result else None
+    if errors is None:
+        # Another request is advancing the state already; settle for the capped list
+        return result, result.errors
+    return result, _to_findings(errors, len(errors))
+
+
+def iter_pip_log_analysis(filepath, with_timeline=False):
+    """get_pip_log_analysis as a generator of (bytes done, bytes total, result).
+
+    result is None until the last value. Closing the generator early, e.g.
+    when the user picks another log, keeps the work done so far: the next
+    request for this log carries on from the last block analyzed.
+    """
+    stat = os.stat(filepath)
+    compressed = is_compressed(filepath)
+    # A state is taken out of the cache while it is being advanced, so two
+    # requests never advance the same one
+    with _analysis_cache_lock:
+        state = _analysis_cache.pop(filepath, None)
+        fresh = state is not None and (state.inode, state.file_size, state.mtime_ns) == (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if fresh:
+            _analysis_cache_stats["hits"] += 1
+    
+    if not fresh:
+        # can_resume reads the log, so it runs outside the lock
+        if state is not None and not compressed and state.can_resume(filepath, stat):
+            counter = "resumed"
+        else:
+            counter = "misses"
+            state = _AnalysisState()
+        with _analysis_cache_lock:
+            _analysis_cache_stats[counter] += 1
+        total = get_raw_size(filepath) if compressed else stat.st_size
+        try:
+            for done in state.iter_advance(filepath, stat):
+                yield done, total, None
+        except GeneratorExit:
+            # Archives are always analyzed from the start, so only plain logs
+            # are worth resuming
+            if not compressed:
+                _cache_state(filepath, state)
+            raise
+    
+    try:
+        result = state.to_result(filepath, with_timeline)
+    finally:
+        _cache_state(filepath, state)
+    yield state.size, state.size, result
+
+
+def peek_pip_log_analysis(filepath, with_timeline=False):
+    """Get the cached AnalysisResult of a log if it is up to date, else None, without reading the log."""
+    stat = os.stat(filepath)
+    with _analysis_cache_lock:
+        state = _analysis_cache.get(filepath)
+    if state is None or (state.inode, state.file_size, state.mtime_ns) != (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+        return None
+    if with_timeline and not state.has_timeline():
+        return None
+    return state.to_result(filepath)
+
+
+def schedule_pip_log_analysis(filepath):
+    """Analyze a log and build its timeline on a daemon thread, filling the cache, unless that is already underway."""
+    with _background_lock:
+        if filepath in _background_analyses:
+            return None
+        _background_analyses.add(filepath)
+    
+    def run():
+        try:
+            get_pip_log_analysis(filepath, with_timeline=True)
+        except Exception:
+            logger.exception("Log Viewer: analyzing %s failed", filepath)
+        finally:
+            with _background_lock:
+                _background_analyses.discard(filepath)
+                _background_done.notify_all()
+    
+    thread = threading.Thread(target=run, name="log-viewer-analysis", daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_background_analyses(filepaths, timeout):
+    """Wait up to timeout seconds until none of filepaths is analyzed in the background.
+
+    Returns whether they are all done. Analyses of other logs, e.g. started
+    by other sessions, are not waited for.
+    """
+    deadline = time.monotonic() + timeout
+    with _background_done:
+        while _background_analyses.intersection(filepaths):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _background_done.wait(remaining)
+    return True
+
+
+def _quick_status_spans(size):
+    """Sorted, non-overlapping byte ranges a quick status reads from a log of size bytes."""
+    spans = [(0, QUICK_STATUS_HEAD), (size - QUICK_STATUS_TAIL, size)]
+    step = size / (QUICK_STATUS_SAMPLES + 1)
+    spans += [(int(step * i), int(step * i) + QUICK_STATUS_SAMPLE_SIZE) for i in range(1, QUICK_STATUS_SAMPLES + 1)]
+    merged = []
+    for start, end in sorted((max(start, 0), min(end, size)) for start, end in spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+@instrument("analyzer.quick_pip_log_status")
+def quick_pip_log_status(filepath, for_summary=False):
+    """Guess the Status of a pip log from its head, its tail and sampled blocks.
+
+    At most about 3 MB is read however large the log is, so the result is
+    provisional: an error in a part that wasn't read is missed. for_summary
+    applies the rule of get_summary_status instead of the full analysis's.
+    Archives can't be sampled without decompressing them and give UNKNOWN.
+    """
+    if is_compressed(filepath):
+        return Status.UNKNOWN
+    size = os.path.getsize(filepath)
+    spans = _quick_status_spans(size)
+    found = None
+    for (start, end), data in zip(spans, read_log_spans(filepath, spans)):
+        # Only classify whole lines
+        if start > 0:
+            data = data[data.find(b"\n") + 1:]
+        if end < size:
+            data = data[:data.rfind(b"\n") + 1]
+        found = classify_pip_log(data, found)
+    
+    errors, successes = found["error"], found["success"]
+    if errors and not (for_summary and successes):
+        return Status.FAILED
+    if successes:
+        return Status.SUCCESS
+    return Status.UNKNOWN
+
+
+def get_analysis_cache_stats():
+    """Get the analysis cache hit/miss counters and current size."""
+    with _analysis_cache_lock:
+        return dict(_analysis_cache_stats, size=len(_analysis_cache))
+
+
+def format_analysis_cache_stats():
+    """Format the analysis cache counters as a Markdown line."""
+    stats = get_analysis_cache_stats()
+    return (
+        f"_Analysis cache: {stats['hits']} hits, {stats['resumed']} resumed, "
+        f"{stats['misses']} misses, {stats['size']} cached_"
+    )
+
+
+@instrument("analyzer.analyze_pip_log")
 def analyze_pip_log(filename):
     """Analyze a pip installation log and return status information."""
     if not filename:
@@ -21,106 +865,175 @@ def analyze_pip_log(filename):
         return "File not found"
     
     try:
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-        
-        # Analysis results
-        result = []
-        result.append(f"# 📊 Analysis: {filename}\n")
-        
-        # Check for overall success/failure indicators
-        errors = []
-        warnings = []
-        success_indicators = []
-        
-        lines = content.split('\n')
-        
-        # Look for error patterns
-        error_patterns = [
-            "ERROR:",
-            "Error:",
-            "error:",
-            "FAILED",
-            "Failed",
-            "failed",
-            "Could not",
-            "could not",
-            "Exception:",
-            "Traceback",
-        ]
-        
-        warning_patterns = [
-            "WARNING:",
-            "Warning:",
-            "warning:",
-            "deprecated",
-            "DEPRECATION",
-        ]
-        
-        success_patterns = [
-            "Successfully installed",
-            "Successfully uninstalled",
-            "Requirement already satisfied",
-            "finished with status 'done'",
-        ]
-        
-        for line in lines:
-            for pattern in error_patterns:
-                if pattern in line:
-                    errors.append(line.strip())
-                    break
-            for pattern in warning_patterns:
-                if pattern in line:
-                    warnings.append(line.strip())
-                    break
-            for pattern in success_patterns:
-                if pattern in line:
-                    success_indicators.append(line.strip())
-                    break
-        
-        # Determine overall status
-        if errors:
-            result.append("## ❌ Status: FAILED\n")
-        elif success_indicators:
-            result.append("## ✅ Status: SUCCESS\n")
-        else:
-            result.append("## ❓ Status: UNKNOWN\n")
-        
-        # Add statistics
-        result.append(f"**Total Lines:** {len(lines)}")
-        result.append(f"**Errors Found:** {len(set(errors))}")
-        result.append(f"**Warnings Found:** {len(set(warnings))}")
-        result.append(f"**Success Messages:** {len(set(success_indicators))}\n")
-        
-        # Show success indicators
-        if success_indicators:
-            result.append("### ✅ Success Indicators:")
-            for msg in list(set(success_indicators))[:5]:  # Show first 5 unique
-                result.append(f"- {msg}")
-            result.append("")
-        
-        # Show errors
-        if errors:
-            result.append("### ❌ Errors Found:")
-            for error in list(set(errors))[:10]:  # Show first 10 unique errors
-                result.append(f"- {error}")
-            result.append("")
-        
-        # Show warnings
-        if warnings:
-            result.append("### ⚠️ Warnings Found:")
-            for warning in list(set(warnings))[:5]:  # Show first 5 unique warnings
-                result.append(f"- {warning}")
-            result.append("")
-        
-        return "\n".join(result)
-        
+        return render_analysis_markdown(get_pip_log_analysis(filepath))
     except Exception as e:
         return f"Error analyzing file: {str(e)}"
 
 
-def get_pip_log_summary():
-    """Generate a summary of all pip installation logs."""
+@instrument("analyzer.analyze_pip_log_timeline")
+def analyze_pip_log_timeline(filename):
+    """Render where the time of a pip install went, building the log's timeline if needed."""
+    if not filename:
+        return "No file selected"
+    
+    filepath = os.path.join(get_log_directory(), filename)
+    if not os.path.exists(filepath):
+        return "File not found"
+    
+    try:
+        return "\n".join(_render_timings(get_pip_log_analysis(filepath, with_timeline=True), 10))
+    except Exception as e:
+        return f"Error analyzing file: {str(e)}"
+
+
+def stream_pip_log_analysis(filename):
+    """analyze_pip_log as a generator, yielding progress while a large log is read.
+
+    The last value is the analysis. Closing the generator stops reading,
+    and the next analysis of the same log picks up where this one stopped.
+    """
+    if not filename:
+        yield "No file selected"
+        return
+    
+    filepath = os.path.join(get_log_directory(), filename)
+    if not os.path.exists(filepath):
+        yield "File not found"
+        return
+    
+    last_yield = time.monotonic()
+    try:
+        provisional = ""
+        if os.path.getsize(filepath) >= QUICK_STATUS_MIN_SIZE and peek_pip_log_analysis(filepath) is None:
+            status = quick_pip_log_status(filepath)
+            provisional = (
+                f"## {status.icon} Provisional Status: {status.label}\n\n"
+                "_Guessed from sampled parts of the log; the full analysis replaces it when done._\n\n"
+            )
+            yield provisional + f"⏳ Analyzing {filename}..."
+        
+        for done, total, result in iter_pip_log_analysis(filepath):
+            if result is not None:
+                yield render_analysis_markdown(result)
+                return
+            now = time.monotonic()
+            if now - last_yield >= ANALYSIS_UPDATE_INTERVAL:
+                last_yield = now
+                yield provisional + f"⏳ Analyzing {filename}... {done / (total or 1):.0%}"
+    except Exception as e:
+        yield f"Error analyzing file: {str(e)}"
+
+
+def _render_findings(title, findings, limit):
+    lines = [title]
+    for finding in findings[:limit]:
+        repeat = f" (×{finding.count})" if finding.count > 1 else ""
+        lines.append(f"- `L{finding.line}` {clean_line(finding.message, MAX_FINDING_CHARS)}{repeat}")
+    lines.append("")
+    return lines
+
+
+_PHASE_LABELS = {
+    "resolve": "🔎 Resolving",
+    "download": "⬇️ Downloading",
+    "build": "🔨 Building",
+    "install": "📦 Installing",
+}
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return "—"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}m {int(seconds % 60):02d}s"
+    return f"{seconds:.1f}s"
+
+
+def _format_download(nbytes, rate):
+    """Downloaded size and throughput table cells; pip reports sizes in SI units."""
+    size = f"{nbytes / 1000 ** 2:.1f} MB" if nbytes else "—"
+    return size, f"{rate / 1000 ** 2:.1f} MB/s" if rate else "—"
+
+
+def _render_timings(analysis, limit):
+    if not analysis.phases:
+        return ["_No pip steps found in this log._"]
+    lines = ["### ⏱️ Where Time Went"]
+    if analysis.timing_estimated:
+        if analysis.duration is None:
+            lines.append("_The log has no timestamps; only each step's share of the log is known._")
+        else:
+            lines.append("_Not every step has a timestamp; times are estimated from each step's share of the log._")
+    lines += ["", "| Phase | Time | Share of Log |", "|---|---|---|"]
+    for phase in analysis.phases:
+        lines.append(f"| {_PHASE_LABELS[phase.name]} | {_format_seconds(phase.seconds)} | {phase.share:.0%} |")
+    
+    if analysis.package_timings:
+        lines += ["", "**Slowest Packages:**", ""]
+        lines += ["| Package | Time | Share of Log | Downloaded | Throughput |", "|---|---|---|---|---|"]
+        for timing in analysis.package_timings[:limit]:
+            size, rate = _format_download(timing.download_bytes, timing.throughput)
+            lines.append(
+                f"| {timing.name} | {_format_seconds(timing.seconds)} | {timing.share:.0%} | {size} | {rate} |"
+            )
+    lines.append("")
+    return lines
+
+
+def get_slowest_packages(results, limit=10):
+    """The slowest packages across several AnalysisResults, slowest first.
+
+    Returns (PhaseTiming, filename, logs) tuples holding each package's
+    slowest timing, the log it is from and how many of the results mention
+    the package. Timings without seconds are left out.
+    """
+    slowest = {}
+    for result in results:
+        for timing in result.package_timings:
+            if timing.seconds is None:
+                continue
+            best = slowest.get(timing.name)
+            if best is None:
+                slowest[timing.name] = [timing, result.filename, 1]
+                continue
+            best[2] += 1
+            if timing.seconds > best[0].seconds:
+                best[0], best[1] = timing, result.filename
+    ranked = sorted(slowest.values(), key=lambda item: item[0].seconds, reverse=True)
+    return [tuple(item) for item in ranked[:limit]]
+
+
+def render_analysis_markdown(analysis):
+    """Render an AnalysisResult as the Markdown shown in the Analysis tab."""
+    result = []
+    result.append(f"# 📊 Analysis: {analysis.filename}\n")
+    result.append(f"## {analysis.status.icon} Status: {analysis.status.label}\n")
+    
+    # Add statistics
+    result.append(f"**Total Lines:** {analysis.line_count}")
+    result.append(f"**Errors Found:** {analysis.error_count}")
+    result.append(f"**Warnings Found:** {analysis.warning_count}")
+    result.append(f"**Success Messages:** {analysis.success_count}\n")
+    
+    # Show the first unique lines of each kind, with where they first appear
+    if analysis.successes:
+        result.extend(_render_findings("### ✅ Success Indicators:", analysis.successes, 5))
+    if analysis.errors:
+        result.extend(_render_findings("### ❌ Errors Found:", analysis.errors, 10))
+    if analysis.warnings:
+        result.extend(_render_findings("### ⚠️ Warnings Found:", analysis.warnings, 5))
+    
+    return "\n".join(result)
+
+
+@instrument("analyzer.get_pip_log_summary")
+def get_pip_log_summary(pending=None):
+    """Generate a summary of all pip installation logs.
+
+    Large logs without an up-to-date analysis get a provisional status and
+    are analyzed in the background; their paths are appended to pending
+    when it is a list.
+    """
     install_logs = get_pip_install_logs()
     uninstall_logs = get_pip_uninstall_logs()
     
@@ -132,31 +1045,54 @@ def get_pip_log_summary():
     # Quick status check for recent installs
     result.append("## Recent Installations (Last 10):")
     
+    analyses = []
+    provisional = 0
     for name, filename in install_logs[:10]:
         log_dir = get_log_directory()
         filepath = os.path.join(log_dir, filename)
         
         try:
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read().lower()
-            
-            # More accurate status detection
-            has_error = any(pattern in content for pattern in ["error:", "failed building", "exception:", "traceback (most"])
-            has_success = any(pattern in content for pattern in ["successfully installed", "requirement already satisfied"])
+            analysis = peek_pip_log_analysis(filepath, with_timeline=True)
+            stat = os.stat(filepath)
+            if analysis is None and stat.st_size >= QUICK_STATUS_MIN_SIZE:
+                # Sample large logs now and analyze them fully in the background
+                status = quick_pip_log_status(filepath, for_summary=True).icon
+                schedule_pip_log_analysis(filepath)
+                provisional += 1
+                if pending is not None:
+                    pending.append(filepath)
+                modified = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+                result.append(f"\n{status} **{name}** - {stat.st_size / 1024:.1f}KB - {modified} _(provisional)_")
+                continue
             
-            if has_error and not has_success:
-                status = "❌"
-            elif has_success or "finished with status 'done'" in content:
-                status = "✅"
-            else:
-                status = "❓"
+            analysis = analysis or get_pip_log_analysis(filepath, with_timeline=True)
+            analyses.append(analysis)
+            status = get_summary_status(analysis).icon
             
-            # Get file size
-            size_kb = os.path.getsize(filepath) / 1024
-            modified = datetime.fromtimestamp(os.path.getmtime(filepath)).strftime("%Y-%m-%d %H:%M")
+            size_kb = analysis.size / 1024
+            modified = datetime.fromtimestamp(analysis.mtime).strftime("%Y-%m-%d %H:%M")
             
             result.append(f"\n{status} **{name}** - {size_kb:.1f}KB - {modified}")
-        except:
+        except Exception:
             result.append(f"\n❓ **{name}** - Error reading file")
     
+    slowest = get_slowest_packages(analyses, 5)
+    if slowest:
+        result.append("\n## 🐢 Slowest Packages (Last 10):\n")
+        result.append("| Package | Time | Log | Downloaded | Throughput |")
+        result.append("|---|---|---|---|---|")
+        for timing, filename, logs in slowest:
+            size, rate = _format_download(timing.download_bytes, timing.throughput)
+            seen = f" (in {logs} logs)" if logs > 1 else ""
+            result.append(
+                f"| {timing.name}{seen} | {_format_seconds(timing.seconds)} | {filename} | {size} | {rate} |"
+            )
+    
+    if provisional:
+        result.append(
+            f"\n_{provisional} large log(s) show a provisional status sampled from parts of the log; "
+            "the summary updates when their full analysis is done._"
+        )
+    result.append(f"\n{format_analysis_cache_stats()}")
+    
     return "\n".join(result)
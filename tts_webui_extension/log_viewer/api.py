@@ -0,0 +1,186 @@
+"""Headless API for analyzing, searching and pruning logs from scripts.
+
+Nothing imported here loads gradio, so provisioning scripts and install
+hooks can use the analyzer without the UI stack. Every function returns
+or yields plain dicts that can be written as JSON. Modules that are only
+needed by some functions are imported when those functions run, which
+keeps importing this module fast.
+"""
+
+import os
+
+try:
+    from .utils import get_log_directory, set_log_directory, get_log_snapshot, iter_log_hits
+    from .compression import is_compressed, get_raw_size
+    from .search import compile_search_pattern
+except ImportError:
+    from utils import get_log_directory, set_log_directory, get_log_snapshot, iter_log_hits
+    from compression import is_compressed, get_raw_size
+    from search import compile_search_pattern
+
+
+def _batch():
+    # Process pools are slow to import and only needed with several jobs
+    try:
+        from . import batch
+    except ImportError:
+        import batch
+    return batch
+
+
+def resolve_log_paths(logs=None, pip_only=False):
+    """Turn log names or paths into full paths.
+
+    A name that isn't an existing path is looked up in the logs directory.
+    Without logs, every log in the logs directory is returned, newest first,
+    or every pip log with pip_only.
+    """
+    if not logs:
+        if pip_only:
+            return [entry.path for entry in _batch().get_pip_log_entries(refresh=True)]
+        return [entry.path for entry in get_log_snapshot(refresh=True)]
+    log_dir = get_log_directory()
+    return [log if os.path.exists(log) else os.path.join(log_dir, log) for log in logs]
+
+
+def analyze_log(path):
+    """Analyze one pip log: AnalysisResult.to_dict, with timings, plus its path and summary status.
+
+    A log that can't be read gives {"path": ..., "error": message}.
+    """
+    # The analyzer compiles its rule tables on import; stats and prune don't need it
+    try:
+        from .analyzer import get_pip_log_analysis, get_summary_status
+    except ImportError:
+        from analyzer import get_pip_log_analysis, get_summary_status
+    
+    try:
+        result = get_pip_log_analysis(path, with_timeline=True)
+    except OSError as e:
+        return {"path": path, "error": str(e)}
+    data = result.to_dict()
+    data["path"] = path
+    data["summary_status"] = get_summary_status(result).value
+    return data
+
+
+def _pool_map(fn, args, jobs):
+    """Yield fn(*arg) for every arg, in completion order, from jobs processes."""
+    from concurrent.futures import as_completed
+    
+    batch = _batch()
+    with batch._create_executor(jobs, use_processes=True) as pool:
+        futures = [pool.submit(fn, *arg) for arg in args]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def analyze_logs(paths, jobs=1):
+    """Yield analyze_log for each path; in completion order when jobs is more than 1."""
+    if jobs <= 1 or len(paths) < 2:
+        for path in paths:
+            yield analyze_log(path)
+        return
+    yield from _pool_map(analyze_log, [(path,) for path in paths], jobs)
+
+
+def search_log(path, term, use_regex=False, context_lines=0, levels=None, max_hits=None):
+    """Search one log, returning {"path", "hits", "matches", "truncated"}.
+
+    hits are {"line", "text", "match"} dicts with 1-based line numbers;
+    context lines have match False. Collection stops after max_hits hits.
+    Raises re.error for an invalid regex; an unreadable log gives
+    {"path": ..., "error": message}.
+    """
+    pattern = compile_search_pattern(term, use_regex)
+    hits = []
+    matches = 0
+    truncated = False
+    try:
+        for _, block_hits in iter_log_hits(path, pattern, int(context_lines or 0), levels):
+            for line, text, is_match in block_hits:
+                if max_hits is not None and len(hits) >= max_hits:
+                    truncated = True
+                    break
+                hits.append({"line": line, "text": text, "match": is_match})
+                matches += is_match
+            if truncated:
+                break
+    except OSError as e:
+        return {"path": path, "error": str(e)}
+    return {"path": path, "hits": hits, "matches": matches, "truncated": truncated}
+
+
+def search_logs(paths, term, use_regex=False, context_lines=0, levels=None, max_hits=None, jobs=1):
+    """Yield search_log for each path; in completion order when jobs is more than 1.
+
+    The pattern is checked first, so an invalid regex raises re.error
+    before any log is read.
+    """
+    compile_search_pattern(term, use_regex)
+    args = [(path, term, use_regex, context_lines, levels, max_hits) for path in paths]
+    if jobs <= 1 or len(paths) < 2:
+        for arg in args:
+            yield search_log(*arg)
+        return
+    yield from _pool_map(search_log, args, jobs)
+
+
+def get_stats():
+    """Statistics of the logs directory: counts, sizes and the oldest and newest log."""
+    entries = get_log_snapshot(refresh=True)
+    archived = [entry for entry in entries if is_compressed(entry.path)]
+    raw_bytes = sum(entry.size for entry in entries)
+    for entry in archived:
+        try:
+            raw_bytes += get_raw_size(entry.path) - entry.size
+        except OSError:
+            pass
+    return {
+        "log_dir": get_log_directory(),
+        "files": len(entries),
+        "pip_install": sum(entry.name.startswith("pip-install-") for entry in entries),
+        "pip_uninstall": sum(entry.name.startswith("pip-uninstall-") for entry in entries),
+        "archived": len(archived),
+        "total_bytes": sum(entry.size for entry in entries),
+        "raw_bytes": raw_bytes,
+        "oldest": min((entry.mtime for entry in entries), default=None),
+        "newest": max((entry.mtime for entry in entries), default=None),
+    }
+
+
+def prune_logs(max_total_bytes=None, max_age_days=None, keep_last_per_package=None, keep_failed=True, dry_run=False):
+    """Apply a retention policy to the logs directory, or with dry_run only plan it.
+
+    Returns the planned deletions with their reasons, what is kept, and
+    unless dry_run what was freed and any errors.
+    """
+    try:
+        from .models import RetentionPolicy
+        from .retention import plan_retention, run_retention
+    except ImportError:
+        from models import RetentionPolicy
+        from retention import plan_retention, run_retention
+
+    policy = RetentionPolicy(max_total_bytes, max_age_days, keep_last_per_package, keep_failed)
+    plan = plan_retention(policy)
+    result = {
+        "dry_run": dry_run,
+        "delete": [
+            {"name": entry.name, "size": entry.size, "mtime": entry.mtime, "reason": plan.reasons[entry.name]}
+            for entry in plan.delete
+        ],
+        "reclaimed_bytes": plan.reclaimed_bytes,
+        "kept": plan.kept,
+        "kept_bytes": plan.kept_bytes,
+        "protected": plan.protected,
+    }
+    if dry_run or not plan.delete:
+        return result
+    outcome = run_retention(plan)
+    if outcome is None:
+        result["errors"] = ["A retention policy is already being applied"]
+        return result
+    _, freed, errors = outcome
+    result.update(freed_bytes=freed, errors=errors)
+    return result
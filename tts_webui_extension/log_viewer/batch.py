@@ -0,0 +1,179 @@
+"""Batch analysis of every pip install and uninstall log."""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+try:
+    from .utils import get_log_snapshot
+    from .analyzer import get_pip_log_analysis, get_summary_status
+    from .models import AnalysisResult
+except ImportError:
+    from utils import get_log_snapshot
+    from analyzer import get_pip_log_analysis, get_summary_status
+    from models import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+PIP_LOG_PREFIXES = ("pip-install-", "pip-uninstall-")
+
+# Analysis is CPU bound, so a handful of processes is plenty
+BATCH_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# Forking the threaded Gradio server can copy a lock another thread holds
+# into a worker, which then hangs on it; start workers from a clean process.
+# Such workers re-import the host's __main__ module, so the host must be
+# importable: a script piped to "python -" can't start them (run it from a
+# file, guarded by if __name__ == "__main__", or pass use_processes=False)
+BATCH_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+BATCH_TABLE_HEADERS = ["Status", "Package", "Type", "Size (KB)", "Duration", "Errors", "Warnings", "Modified", "File"]
+
+# filename -> ((size, mtime), AnalysisResult or None) from previous batches.
+# None marks a failed analysis, shown as an error until it is retried.
+_batch_results = {}
+_batch_lock = threading.Lock()
+
+
+def _analyze_in_worker(filepath):
+    """Pool entry point: analyze one log and return picklable plain data."""
+    return get_pip_log_analysis(filepath).to_dict()
+
+
+def _create_executor(max_workers, use_processes):
+    if use_processes:
+        try:
+            context = multiprocessing.get_context(BATCH_START_METHOD)
+            return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        except (OSError, NotImplementedError, ValueError):
+            # No working multiprocessing here (e.g. a sandbox without /dev/shm)
+            pass
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def get_pip_log_entries(refresh=False):
+    """Get the snapshot entries of all pip install and uninstall logs."""
+    return [entry for entry in get_log_snapshot(refresh=refresh) if entry.name.startswith(PIP_LOG_PREFIXES)]
+
+
+def iter_batch_analysis(max_workers=BATCH_MAX_WORKERS, use_processes=True):
+    """Analyze every pip log in a pool, yielding (done, total, reused) as results arrive.
+
+    Logs whose size and mtime match the previous batch are not analyzed
+    again, unless their analysis failed. At most max_workers logs are
+    analyzed at a time.
+    """
+    # Appending to a log does not touch the directory, so always rescan
+    entries = get_pip_log_entries(refresh=True)
+    todo = []
+    with _batch_lock:
+        for entry in entries:
+            previous = _batch_results.get(entry.name)
+            if previous is None or previous[1] is None or previous[0] != (entry.size, entry.mtime):
+                todo.append(entry)
+        # Forget logs that no longer exist
+        current = set(entry.name for entry in entries)
+        for name in list(_batch_results):
+            if name not in current:
+                del _batch_results[name]
+    
+    total = len(entries)
+    reused = total - len(todo)
+    done = reused
+    yield done, total, reused
+    if not todo:
+        return
+    
+    with _create_executor(max_workers, use_processes) as pool:
+        futures = {pool.submit(_analyze_in_worker, entry.path): entry for entry in todo}
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                result = AnalysisResult.from_dict(future.result())
+            except Exception:
+                logger.exception("Log Viewer: analyzing %s failed", entry.name)
+                result = None
+            with _batch_lock:
+                _batch_results[entry.name] = ((entry.size, entry.mtime), result)
+            done += 1
+            yield done, total, reused
+
+
+def peek_cached_analysis(entry):
+    """Get the batch AnalysisResult of one snapshot entry if it is up to date, else None, without reading the log."""
+    with _batch_lock:
+        cached = _batch_results.get(entry.name)
+    if cached is not None and cached[0] == (entry.size, entry.mtime):
+        return cached[1]
+    return None
+
+
+def get_cached_analysis(entry):
+    """Get the AnalysisResult of one snapshot entry, reusing batch results.
+
+    Results are kept per file for the whole session (unlike the bounded
+    analysis cache), so evaluating every log again only reads logs that
+    changed, or whose analysis failed. Returns None if the log can't be
+    read or analyzed.
+    """
+    result = peek_cached_analysis(entry)
+    if result is not None:
+        return result
+    try:
+        result = get_pip_log_analysis(entry.path)
+    except Exception:
+        logger.exception("Log Viewer: analyzing %s failed", entry.name)
+        return None
+    with _batch_lock:
+        _batch_results[entry.name] = ((entry.size, entry.mtime), result)
+    return result
+
+
+def _format_duration(seconds):
+    if seconds is None:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    return f"{minutes}m {seconds:02d}s"
+
+
+def get_batch_rows():
+    """Get one table row per pip log from the latest batch, newest first."""
+    rows = []
+    for entry in get_pip_log_entries():
+        with _batch_lock:
+            cached = _batch_results.get(entry.name)
+        if cached is None:
+            continue
+        result = cached[1]
+        kind = "install" if entry.name.startswith("pip-install-") else "uninstall"
+        modified = datetime.fromtimestamp(entry.mtime).strftime("%Y-%m-%d %H:%M")
+        if result is None:
+            rows.append(["❓ error", entry.name, kind, round(entry.size / 1024, 1), "", "", "", modified, entry.name])
+            continue
+        status = get_summary_status(result)
+        rows.append([
+            f"{status.icon} {status.value}",
+            result.package,
+            kind,
+            round(result.size / 1024, 1),
+            _format_duration(result.duration),
+            result.error_count,
+            result.warning_count,
+            modified,
+            result.filename,
+        ])
+    return rows
+
+
+def format_batch_progress(done, total, reused):
+    """Format batch progress as a Markdown line."""
+    if total == 0:
+        return "No pip logs found"
+    state = "✅ Done" if done == total else "⏳ Analyzing"
+    return f"{state}: {done}/{total} logs ({reused} unchanged since the last batch)"
@@ -0,0 +1,553 @@
+"""On-disk SQLite catalog of log lines for full-text search across all logs."""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+
+try:
+    from .utils import get_log_directory, get_log_snapshot
+    from .analyzer import get_pip_log_errors, get_summary_status, failure_signature
+    from .batch import PIP_LOG_PREFIXES
+    from .compression import is_compressed, open_log
+    from .reader import update_fingerprint, read_fingerprint
+    from .models import normalize_package_name
+    from .diagnostics import instrument, record_read
+except ImportError:
+    from utils import get_log_directory, get_log_snapshot
+    from analyzer import get_pip_log_errors, get_summary_status, failure_signature
+    from batch import PIP_LOG_PREFIXES
+    from compression import is_compressed, open_log
+    from reader import update_fingerprint, read_fingerprint
+    from models import normalize_package_name
+    from diagnostics import instrument, record_read
+
+logger = logging.getLogger(__name__)
+
+
+CATALOG_FILENAME = "log_catalog.sqlite3"
+
+# Bump when the schema changes; older catalogs are rebuilt from the logs
+CATALOG_SCHEMA_VERSION = 5
+
+# Size of the blocks read while ingesting
+CATALOG_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Longer lines are cut before indexing (progress bars, minified output)
+CATALOG_MAX_LINE_LENGTH = 4096
+
+# Most hits returned by one search
+CATALOG_SEARCH_LIMIT = 500
+
+# Most failure signatures listed on the dashboard
+FAILURE_SIGNATURE_LIMIT = 50
+
+# Most records listed by one package history query
+PACKAGE_HISTORY_LIMIT = 500
+
+# Share of free pages, e.g. after logs were deleted or rewritten, at which
+# an update compacts the catalog file
+CATALOG_VACUUM_RATIO = 0.25
+
+# Line rowids are (file id << 32) | line number, so all lines of one file
+# form a rowid range that can be deleted without scanning the index
+_LINE_BITS = 32
+_LINE_MASK = (1 << _LINE_BITS) - 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_files (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    inode INTEGER,
+    size INTEGER,
+    mtime REAL,
+    offset INTEGER,
+    fingerprint BLOB,
+    lines INTEGER,
+    partial INTEGER,
+    package TEXT,
+    status TEXT,
+    error_count INTEGER,
+    warning_count INTEGER,
+    started REAL,
+    finished REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS log_lines USING fts5(text);
+CREATE TABLE IF NOT EXISTS log_failures (
+    file_id INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    example TEXT NOT NULL,
+    line INTEGER,
+    count INTEGER
+);
+CREATE INDEX IF NOT EXISTS log_failures_file ON log_failures(file_id);
+CREATE INDEX IF NOT EXISTS log_failures_signature ON log_failures(signature);
+CREATE TABLE IF NOT EXISTS log_packages (
+    file_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT,
+    line INTEGER,
+    time REAL
+);
+CREATE INDEX IF NOT EXISTS log_packages_file ON log_packages(file_id);
+CREATE INDEX IF NOT EXISTS log_packages_name ON log_packages(name);
+"""
+
+# Ingestion progress, read by the UI while the background thread runs
+# failed lists the logs the last update could not ingest
+_catalog_state = {
+    "running": False, "done": 0, "total": 0, "last_update": None, "last_seconds": 0.0, "error": None, "failed": [],
+}
+_ingest_lock = threading.Lock()
+
+
+def get_catalog_path():
+    """Get the path of the catalog database, next to the logs directory."""
+    return os.path.join(os.path.dirname(get_log_directory()), CATALOG_FILENAME)
+
+
+def _fts5_available():
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+FTS5_AVAILABLE = _fts5_available()
+
+
+def connect_catalog():
+    """Open the catalog, creating or rebuilding it when needed.
+
+    WAL mode lets searches read while the ingestion thread writes. Each
+    thread must open its own connection.
+    """
+    conn = sqlite3.connect(get_catalog_path(), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != CATALOG_SCHEMA_VERSION:
+        conn.executescript(
+            "DROP TABLE IF EXISTS log_lines; DROP TABLE IF EXISTS log_files; DROP TABLE IF EXISTS log_failures;"
+            " DROP TABLE IF EXISTS log_packages;"
+        )
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+
+def _delete_lines(conn, file_id, first_line=0):
+    """Delete the indexed lines of a file from first_line on."""
+    conn.execute(
+        "DELETE FROM log_lines WHERE rowid BETWEEN ? AND ?",
+        ((file_id << _LINE_BITS) | first_line, (file_id << _LINE_BITS) | _LINE_MASK),
+    )
+
+
+def _insert_lines(conn, file_id, data, first_line):
+    """Index the lines in data, numbered from first_line. Blank lines are skipped."""
+    base = file_id << _LINE_BITS
+    rows = []
+    line = first_line
+    for raw in data.split(b"\n"):
+        text = raw.decode("utf-8", errors="ignore").strip()
+        if text:
+            rows.append((base | line, text[:CATALOG_MAX_LINE_LENGTH]))
+        line += 1
+    conn.executemany("INSERT INTO log_lines(rowid, text) VALUES (?, ?)", rows)
+
+
+def _store_failures(conn, file_id, errors):
+    """Replace the failure signatures of a file with those of its error Findings."""
+    conn.execute("DELETE FROM log_failures WHERE file_id=?", (file_id,))
+    signatures = {}
+    for finding in errors:
+        signature = failure_signature(finding.message)
+        if signature in signatures:
+            signatures[signature][4] += finding.count
+        else:
+            signatures[signature] = [file_id, signature, finding.message[:CATALOG_MAX_LINE_LENGTH], finding.line, finding.count]
+    conn.executemany(
+        "INSERT INTO log_failures(file_id, signature, example, line, count) VALUES (?, ?, ?, ?, ?)",
+        list(signatures.values()),
+    )
+
+
+def _store_packages(conn, file_id, result):
+    """Replace the package records of a file with those of its analysis."""
+    conn.execute("DELETE FROM log_packages WHERE file_id=?", (file_id,))
+    if result is None:
+        return
+    conn.executemany(
+        "INSERT INTO log_packages(file_id, action, name, version, line, time) VALUES (?, ?, ?, ?, ?, ?)",
+        [(file_id, r.action, r.name, r.version, r.line, r.time) for r in result.package_records],
+    )
+
+
+def _digest(fingerprint):
+    return hashlib.blake2b(b"".join(fingerprint), digest_size=16).digest()
+
+
+def _ingest_file(conn, entry, row):
+    """Bring one file up to date in the catalog.
+
+    A file that only grew is read from the end of the last complete line
+    indexed; a new, truncated, replaced, rewritten or archived file is
+    indexed from the start. An unfinished last line is indexed too and
+    replaced once it is complete.
+    """
+    fingerprint = (b"", b"")
+    if row is None:
+        cursor = conn.execute("INSERT INTO log_files(name) VALUES (?)", (entry.name,))
+        file_id, offset, lines = cursor.lastrowid, 0, 0
+    else:
+        file_id, inode, size, mtime, offset, digest, lines, partial = row
+        if inode == entry.inode and size == entry.size and mtime == entry.mtime:
+            return False
+        grown = inode == entry.inode and entry.size >= offset and not is_compressed(entry.path)
+        if grown and offset:
+            # A log reopened with mode "w" for a new run keeps its inode; only
+            # carry on if the indexed bytes are still there
+            fingerprint = read_fingerprint(entry.path, offset)
+            grown = _digest(fingerprint) == digest
+        if not grown:
+            _delete_lines(conn, file_id)
+            offset, lines = 0, 0
+            fingerprint = (b"", b"")
+        elif partial:
+            _delete_lines(conn, file_id, lines + 1)
+    
+    partial = 0
+    with open_log(entry.path) as f:
+        if offset:
+            f.seek(offset)
+        pending = b""
+        while True:
+            block = f.read(CATALOG_BLOCK_SIZE)
+            if not block:
+                break
+            record_read(entry.path, len(block))
+            data = pending + block
+            cut = data.rfind(b"\n") + 1
+            pending = data[cut:]
+            if cut:
+                _insert_lines(conn, file_id, data[:cut - 1], lines + 1)
+                lines += data.count(b"\n", 0, cut)
+                offset += cut
+                fingerprint = update_fingerprint(fingerprint, data[:cut])
+        if pending:
+            _insert_lines(conn, file_id, pending, lines + 1)
+            partial = 1
+    
+    package = status = error_count = warning_count = started = finished = result = None
+    errors = []
+    if entry.name.startswith(PIP_LOG_PREFIXES):
+        result, errors = get_pip_log_errors(entry.path)
+        package, status = result.package, get_summary_status(result).value
+        error_count, warning_count = result.error_count, result.warning_count
+        started, finished = result.started, result.finished
+    _store_failures(conn, file_id, errors)
+    _store_packages(conn, file_id, result)
+    
+    conn.execute(
+        "UPDATE log_files SET inode=?, size=?, mtime=?, offset=?, fingerprint=?, lines=?, partial=?, package=?,"
+        " status=?, error_count=?, warning_count=?, started=?, finished=? WHERE id=?",
+        (entry.inode, entry.size, entry.mtime, offset, _digest(fingerprint), lines, partial, package, status,
+         error_count, warning_count, started, finished, file_id),
+    )
+    return True
+
+
+@instrument("catalog.update_catalog")
+def update_catalog():
+    """Ingest new and changed logs and drop deleted ones.
+
+    Returns the number of files (re)indexed, or None if another update is
+    already running. Each file is committed on its own, so searches see
+    progress as it happens and an interrupted update loses little work;
+    a log that can't be ingested is logged, listed in the state and
+    skipped. The file is compacted once removed lines leave enough of it free.
+    """
+    if not FTS5_AVAILABLE:
+        return 0
+    if not _ingest_lock.acquire(blocking=False):
+        return None
+    started = time.perf_counter()
+    changed = 0
+    try:
+        # Appends don't touch the directory, so always rescan
+        entries = get_log_snapshot(refresh=True)
+        _catalog_state.update(running=True, done=0, total=len(entries), error=None, failed=[])
+        conn = connect_catalog()
+        try:
+            rows = {
+                name: (file_id, inode, size, mtime, offset, digest, lines, partial)
+                for name, file_id, inode, size, mtime, offset, digest, lines, partial in conn.execute(
+                    "SELECT name, id, inode, size, mtime, offset, fingerprint, lines, partial FROM log_files"
+                )
+            }
+            current = set()
+            for entry in entries:
+                current.add(entry.name)
+                try:
+                    if _ingest_file(conn, entry, rows.get(entry.name)):
+                        changed += 1
+                    conn.commit()
+                except OSError:
+                    # Deleted or unreadable; picked up again next time
+                    conn.rollback()
+                except sqlite3.Error:
+                    raise
+                except Exception:
+                    # A log the analyzer chokes on must not stop the others
+                    conn.rollback()
+                    logger.exception("Log Viewer: cataloguing %s failed", entry.name)
+                    _catalog_state["failed"].append(entry.name)
+                _catalog_state["done"] += 1
+            
+            for name, row in rows.items():
+                if name not in current:
+                    _delete_lines(conn, row[0])
+                    conn.execute("DELETE FROM log_failures WHERE file_id=?", (row[0],))
+                    conn.execute("DELETE FROM log_packages WHERE file_id=?", (row[0],))
+                    conn.execute("DELETE FROM log_files WHERE id=?", (row[0],))
+                    changed += 1
+            conn.commit()
+            _vacuum_if_sparse(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        _catalog_state["error"] = str(e)
+        logger.exception("Log Viewer: updating the log catalog failed")
+    finally:
+        _catalog_state.update(running=False, last_update=time.time(), last_seconds=time.perf_counter() - started)
+        _ingest_lock.release()
+    return changed
+
+
+def _vacuum_if_sparse(conn):
+    """Give the pages freed by deleted lines back to the disk once enough of them pile up."""
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    if not pages or free < pages * CATALOG_VACUUM_RATIO:
+        return
+    try:
+        conn.execute("VACUUM")
+    except sqlite3.OperationalError:
+        # A search holds the database; the next update tries again
+        logger.info("Log Viewer: catalog busy, compacting it later")
+
+
+def schedule_catalog_update():
+    """Start update_catalog on a daemon thread unless one is already running."""
+    if not FTS5_AVAILABLE or _catalog_state["running"]:
+        return None
+    thread = threading.Thread(target=update_catalog, name="log-viewer-catalog", daemon=True)
+    thread.start()
+    return thread
+
+
+def _to_match_query(query, fts_syntax):
+    if fts_syntax:
+        return query
+    # Match the words as a phrase, in order, ignoring punctuation and case
+    return '"' + query.replace('"', '""') + '"'
+
+
+@instrument("catalog.search_catalog")
+def search_catalog(query, limit=CATALOG_SEARCH_LIMIT, fts_syntax=False):
+    """Search every catalogued log line.
+
+    Returns (hits, total matches, matching files), where hits are
+    (filename, line number, text, status) tuples, newest log first. Raises
+    sqlite3.OperationalError for invalid FTS5 syntax.
+    """
+    match = _to_match_query(query, fts_syntax)
+    conn = connect_catalog()
+    try:
+        total, files = conn.execute(
+            f"SELECT count(*), count(DISTINCT rowid >> {_LINE_BITS}) FROM log_lines WHERE log_lines MATCH ?",
+            (match,),
+        ).fetchone()
+        hits = conn.execute(
+            f"SELECT f.name, l.rowid & {_LINE_MASK}, l.text, f.status"
+            f" FROM log_lines AS l JOIN log_files AS f ON f.id = (l.rowid >> {_LINE_BITS})"
+            " WHERE log_lines MATCH ? ORDER BY f.mtime DESC, l.rowid LIMIT ?",
+            (match, int(limit)),
+        ).fetchall()
+    finally:
+        conn.close()
+    return hits, total, files
+
+
+@instrument("catalog.get_top_failures")
+def get_top_failures(limit=FAILURE_SIGNATURE_LIMIT):
+    """Get the most common failure signatures across all catalogued pip logs.
+
+    Returns (signature, occurrences, logs, failed logs, packages, example,
+    newest log) tuples, signatures seen in failed installs first; packages
+    is a sorted list of normalized package names. Only the catalog is read:
+    signatures are stored per log as it is ingested, so they stay current
+    as logs come and go.
+    """
+    conn = connect_catalog()
+    try:
+        rows = conn.execute(
+            "SELECT e.signature, sum(e.count), count(*), sum(f.status = 'failed'),"
+            " group_concat(DISTINCT f.package), min(e.example),"
+            " (SELECT f2.name FROM log_failures AS e2 JOIN log_files AS f2 ON f2.id = e2.file_id"
+            "  WHERE e2.signature = e.signature ORDER BY f2.mtime DESC LIMIT 1)"
+            " FROM log_failures AS e JOIN log_files AS f ON f.id = e.file_id"
+            " GROUP BY e.signature ORDER BY sum(f.status = 'failed') DESC, count(*) DESC, sum(e.count) DESC LIMIT ?",
+            (int(limit),),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        (signature, occurrences, logs, failed, _package_names(packages), example, newest)
+        for signature, occurrences, logs, failed, packages, example, newest in rows
+    ]
+
+
+def _package_names(packages):
+    """Sorted, distinct normalized names from a group_concat of log package names."""
+    return sorted(set(normalize_package_name(name) for name in (packages or "").split(",")) - {""})
+
+
+@instrument("catalog.get_package_history")
+def get_package_history(name, limit=PACKAGE_HISTORY_LIMIT):
+    """Get every catalogued install, uninstall and already-satisfied record of a package.
+
+    name is normalized like a pip package name; "*" and "?" are wildcards.
+    Returns (records, total), newest first, where records are (time,
+    filename, status, action, name, version, change) tuples. time falls
+    back to the log's first timestamp or modification time for lines
+    without one; change is "old → new" when an install changed the version
+    recorded before it.
+    """
+    conn = connect_catalog()
+    try:
+        rows = conn.execute(
+            "SELECT coalesce(p.time, f.started, f.mtime), f.name, f.status, p.action, p.name, p.version"
+            " FROM log_packages AS p JOIN log_files AS f ON f.id = p.file_id"
+            " WHERE p.name GLOB ? ORDER BY coalesce(f.started, f.mtime), f.id, p.line",
+            (normalize_package_name(name),),
+        ).fetchall()
+    finally:
+        conn.close()
+    # Versions are followed per package, log by log and line by line
+    seen = {}
+    records = []
+    for when, filename, status, action, package, version in rows:
+        before = seen.get(package)
+        change = ""
+        if action == "installed" and before and version and before != version:
+            change = f"{before} → {version}"
+        if version:
+            seen[package] = version
+        records.append((when, filename, status, action, package, version, change))
+    records.reverse()
+    return records[:int(limit)], len(records)
+
+
+def get_catalog_statuses():
+    """Get {filename: ((size, mtime), summary status value or None)} of every catalogued log."""
+    conn = connect_catalog()
+    try:
+        rows = conn.execute("SELECT name, size, mtime, status FROM log_files").fetchall()
+    finally:
+        conn.close()
+    return {name: ((size, mtime), status) for name, size, mtime, status in rows}
+
+
+def get_package_logs():
+    """Names of the catalogued logs that installed, uninstalled or checked packages, newest first."""
+    conn = connect_catalog()
+    try:
+        rows = conn.execute(
+            "SELECT name FROM log_files AS f WHERE EXISTS (SELECT 1 FROM log_packages AS p WHERE p.file_id = f.id)"
+            " ORDER BY mtime DESC"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [name for name, in rows]
+
+
+def get_package_set(filename):
+    """The packages a logged pip run left installed, as {name: version}.
+
+    Records apply in log order: installed and already-satisfied packages
+    are added and uninstalled ones removed. A log without records gives {}.
+    """
+    conn = connect_catalog()
+    try:
+        rows = conn.execute(
+            "SELECT p.action, p.name, p.version FROM log_packages AS p JOIN log_files AS f ON f.id = p.file_id"
+            " WHERE f.name = ? ORDER BY p.line",
+            (filename,),
+        ).fetchall()
+    finally:
+        conn.close()
+    packages = {}
+    for action, name, version in rows:
+        if action == "uninstalled":
+            packages.pop(name, None)
+        else:
+            packages[name] = version
+    return packages
+
+
+def _version_key(version):
+    # Release numbers only: "2.4.0+cu121" sorts as (2, 4, 0)
+    return [int(part) for part in re.findall(r"\d+", version.split("+", 1)[0])]
+
+
+def diff_package_sets(before, after):
+    """Compare two {name: version} package sets.
+
+    Returns (name, version before, version after, change) tuples for the
+    packages that differ, by name; change is "added", "removed",
+    "upgraded", "downgraded" or "changed".
+    """
+    rows = []
+    for name in sorted(before.keys() | after.keys()):
+        old, new = before.get(name, ""), after.get(name, "")
+        if name in before and name in after and old == new:
+            continue
+        if name not in before:
+            change = "added"
+        elif name not in after:
+            change = "removed"
+        elif old and new and _version_key(old) != _version_key(new):
+            change = "upgraded" if _version_key(new) > _version_key(old) else "downgraded"
+        else:
+            change = "changed"
+        rows.append((name, old or "", new or "", change))
+    return rows
+
+
+def format_catalog_state():
+    """Describe the catalog for the UI."""
+    if not FTS5_AVAILABLE:
+        return "⚠️ Full-text search needs SQLite with FTS5, which this Python does not have"
+    state = _catalog_state
+    if state["running"]:
+        return f"⏳ Indexing logs: {state['done']}/{state['total']}"
+    if state["error"]:
+        return f"⚠️ Catalog update failed: {state['error']}"
+    if state["last_update"] is None:
+        return "Catalog not updated yet in this session"
+    text = f"📚 {state['total']} logs indexed, last updated in {state['last_seconds']:.1f} s"
+    if state["failed"]:
+        text += f" (⚠️ {len(state['failed'])} could not be indexed: {', '.join(state['failed'][:5])})"
+    return text
@@ -0,0 +1,117 @@
+"""Command line interface to the headless API.
+
+Usage:
+    python -m tts_webui_extension.log_viewer [--log-dir DIR] [--format json|ndjson] COMMAND ...
+
+Commands:
+    analyze [LOG ...] [--jobs N]        analyze pip logs (all of them by default)
+    search TERM [LOG ...] [--regex] [--context N] [--level LEVEL ...] [--max-hits N] [--jobs N]
+    stats                               count and size the logs
+    prune [--max-size-mb MB] [--max-age-days DAYS] [--keep-last N] [--delete-failed] [--dry-run]
+
+Results go to stdout as one JSON document, or with --format ndjson as one
+JSON object per line, written as soon as each log is done. LOG is a path or
+a name in the logs directory.
+"""
+
+import argparse
+import json
+import re
+import sys
+
+try:
+    from .levels import LINE_LEVELS
+except ImportError:
+    from levels import LINE_LEVELS
+
+
+def _api():
+    # Imported after the arguments are parsed, so --help and usage errors stay instant
+    try:
+        from . import api
+    except ImportError:
+        import api
+    return api
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m tts_webui_extension.log_viewer",
+        description="Analyze, search and prune TTS WebUI installer logs without the UI.",
+    )
+    parser.add_argument("--log-dir", help="logs directory (default: installer_scripts/logs under the working directory)")
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json", help="output format (default: json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    analyze = commands.add_parser("analyze", help="analyze pip logs")
+    analyze.add_argument("logs", nargs="*", metavar="LOG", help="logs to analyze (default: every pip log)")
+    analyze.add_argument("--jobs", type=int, default=1, help="logs analyzed in parallel (default: 1)")
+    
+    search = commands.add_parser("search", help="search logs for a term")
+    search.add_argument("term")
+    search.add_argument("logs", nargs="*", metavar="LOG", help="logs to search (default: every log)")
+    search.add_argument("--regex", action="store_true", help="treat the term as a regular expression")
+    search.add_argument("--context", type=int, default=0, help="lines of context around each match")
+    search.add_argument("--level", action="append", choices=LINE_LEVELS, help="only matches at this level (repeatable)")
+    search.add_argument("--max-hits", type=int, default=None, help="most hits reported per log")
+    search.add_argument("--jobs", type=int, default=1, help="logs searched in parallel (default: 1)")
+    
+    commands.add_parser("stats", help="count and size the logs")
+    
+    prune = commands.add_parser("prune", help="delete logs by a retention policy")
+    prune.add_argument("--max-size-mb", type=float, default=None, help="keep at most this many MB of logs")
+    prune.add_argument("--max-age-days", type=float, default=None, help="delete logs older than this")
+    prune.add_argument("--keep-last", type=int, default=None, help="keep only the newest N logs per package")
+    prune.add_argument("--delete-failed", action="store_true", help="also delete logs of failed installs")
+    prune.add_argument("--dry-run", action="store_true", help="only report what would be deleted")
+    return parser
+
+
+def _write(record):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def _emit(records, ndjson):
+    """Write records as NDJSON as they come, or as one JSON list at the end."""
+    if ndjson:
+        for record in records:
+            _write(record)
+    else:
+        _write(list(records))
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    ndjson = args.format == "ndjson"
+    api = _api()
+    if args.log_dir:
+        api.set_log_directory(args.log_dir)
+    
+    failed = False
+    
+    def track(records):
+        nonlocal failed
+        for record in records:
+            failed = failed or "error" in record
+            yield record
+    
+    if args.command == "analyze":
+        paths = api.resolve_log_paths(args.logs, pip_only=True)
+        _emit(track(api.analyze_logs(paths, args.jobs)), ndjson)
+    elif args.command == "search":
+        paths = api.resolve_log_paths(args.logs)
+        try:
+            results = api.search_logs(paths, args.term, args.regex, args.context, args.level, args.max_hits, args.jobs)
+            _emit(track(results), ndjson)
+        except re.error as e:
+            print(f"Invalid regex: {e}", file=sys.stderr)
+            return 2
+    elif args.command == "stats":
+        _write(api.get_stats())
+    elif args.command == "prune":
+        max_bytes = None if args.max_size_mb is None else int(args.max_size_mb * 1024 * 1024)
+        result = api.prune_logs(max_bytes, args.max_age_days, args.keep_last, not args.delete_failed, args.dry_run)
+        failed = bool(result.get("errors"))
+        _write(result)
+    return 1 if failed else 0
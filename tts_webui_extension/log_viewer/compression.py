@@ -0,0 +1,150 @@
+"""Reading and writing archived (compressed) log files."""
+
+import gzip
+import os
+import shutil
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Every file name the log viewer treats as a log, plain or archived
+LOG_SUFFIXES = (".log", ".log.gz", ".log.zst")
+
+COMPRESSED_SUFFIXES = (".log.gz", ".log.zst")
+
+# Size of the chunks streamed through the compressor
+COMPRESS_CHUNK_SIZE = 1024 * 1024
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Deflate expands at most about 1032:1, so a gzip archive smaller than this
+# holds under 4 GiB and the size in its trailer, kept modulo 4 GiB, is exact
+GZIP_EXACT_SIZE_LIMIT = 2 ** 32 // 1032
+
+# What reading a damaged archive raises besides OSError
+_DECODE_ERRORS = (EOFError, zstandard.ZstdError) if zstandard is not None else (EOFError,)
+
+# Decompressed sizes by (path, size, mtime_ns), so stats don't reopen archives
+_raw_sizes = {}
+
+
+def get_archive_formats():
+    """Compression formats available here, preferred first."""
+    return ["zst", "gz"] if zstandard is not None else ["gz"]
+
+
+def is_log_filename(name):
+    """Whether name is a plain or archived log file name."""
+    return name.endswith(LOG_SUFFIXES) and not name.startswith(".")
+
+
+def is_compressed(path):
+    """Whether path is an archived log."""
+    return path.endswith(COMPRESSED_SUFFIXES)
+
+
+def strip_log_suffix(name):
+    """Remove .log, .log.gz or .log.zst from a file name."""
+    for suffix in COMPRESSED_SUFFIXES + (".log",):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def open_log(path):
+    """Open a plain or archived log for reading bytes.
+
+    Archives are decompressed as they are read, so memory stays constant.
+    They only support reading forwards: seek() to a later offset works by
+    decompressing up to it.
+    """
+    if path.endswith(".log.gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".log.zst"):
+        if zstandard is None:
+            raise OSError(f"Reading {os.path.basename(path)} needs the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def _read_raw_size(path):
+    if path.endswith(".log.gz") and os.path.getsize(path) < GZIP_EXACT_SIZE_LIMIT:
+        with open(path, "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return int.from_bytes(f.read(4), "little")
+    if path.endswith(".log.zst") and zstandard is not None:
+        with open(path, "rb") as f:
+            content_size = zstandard.frame_content_size(f.read(18))
+        if content_size >= 0:
+            return content_size
+    # Size not recorded in the archive, or maybe wrapped: count it
+    total = 0
+    with open_log(path) as f:
+        while True:
+            chunk = f.read(COMPRESS_CHUNK_SIZE)
+            if not chunk:
+                return total
+            total += len(chunk)
+
+
+def get_raw_size(path):
+    """Get the decompressed size of a log; the file size for plain logs.
+
+    Archives too large for their recorded size to be exact are counted by
+    decompressing them once. Raises OSError if an archive can't be read,
+    e.g. .log.zst without the zstandard package.
+    """
+    stat = os.stat(path)
+    if not is_compressed(path):
+        return stat.st_size
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    raw = _raw_sizes.get(key)
+    if raw is None:
+        try:
+            raw = _read_raw_size(path)
+        except _DECODE_ERRORS as e:
+            raise OSError(f"Reading {os.path.basename(path)} failed: {e}") from e
+        _raw_sizes[key] = raw
+    return raw
+
+
+def compress_log(path, fmt="gz"):
+    """Compress a plain log next to itself and remove the original.
+
+    The data is streamed in chunks, written to a temporary name and renamed
+    into place, so a failure never leaves a partial archive or loses the
+    log. The archive keeps the original modification time. Returns the
+    archive path.
+    """
+    if fmt not in get_archive_formats():
+        raise ValueError(f"Unsupported archive format: {fmt}")
+    stat = os.stat(path)
+    target = f"{path}.{fmt}"
+    temp = f"{target}.tmp"
+    try:
+        with open(path, "rb") as src, open(temp, "wb") as dst:
+            if fmt == "zst":
+                compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, write_content_size=True)
+                compressor.copy_stream(src, dst, size=stat.st_size, read_size=COMPRESS_CHUNK_SIZE)
+            else:
+                with gzip.GzipFile(filename=os.path.basename(path), mode="wb", fileobj=dst,
+                                   compresslevel=GZIP_LEVEL, mtime=int(stat.st_mtime)) as gz:
+                    shutil.copyfileobj(src, gz, COMPRESS_CHUNK_SIZE)
+        after = os.stat(path)
+        if (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            raise OSError(f"{os.path.basename(path)} changed while it was being compressed")
+        os.utime(temp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temp, target)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+    _raw_sizes[(target, os.path.getsize(target), stat.st_mtime_ns)] = stat.st_size
+    os.remove(path)
+    return target
@@ -0,0 +1,263 @@
+"""Per-call timing, I/O accounting and optional profiling of Log Viewer functions."""
+
+import functools
+import inspect
+import io
+import threading
+import time
+from bisect import bisect_left
+
+
+# Upper bounds of the latency histogram buckets in milliseconds; slower calls
+# land in one more, open-ended bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+DIAGNOSTICS_HEADERS = [
+    "Function", "Calls", "Errors", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)",
+    "First Output (ms)", "MB Read", "Files Touched",
+]
+
+# name -> CallStats
+_call_stats = {}
+_stats_lock = threading.Lock()
+
+# Per thread: .active is the list of [bytes read, files touched] records of
+# the instrumented calls running on that thread, outermost first
+_local = threading.local()
+
+# Only one cProfile profiler can be active at a time (on Python 3.12 it is
+# process-wide), so at most one call is profiled at once and others are
+# skipped while it runs
+_profiler_lock = threading.Lock()
+_profile = {"enabled": False, "stats": None, "calls": 0}
+
+
+class CallStats:
+    """Latency histogram and I/O totals for one instrumented function."""
+    
+    __slots__ = ("calls", "errors", "total", "max", "buckets", "first_total", "first_calls", "bytes_read", "files")
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.first_total = 0.0
+        self.first_calls = 0
+        self.bytes_read = 0
+        self.files = 0
+    
+    def add(self, seconds, failed, bytes_read, files, first=None):
+        self.calls += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        if first is not None:
+            self.first_total += first
+            self.first_calls += 1
+        self.bytes_read += bytes_read
+        self.files += files
+    
+    def percentile(self, q):
+        """Upper bound in ms of the bucket holding the q-th quantile."""
+        rank = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max * 1000
+        return 0.0
+
+
+def record_read(path, nbytes):
+    """Count bytes read from path towards every instrumented call on this thread."""
+    for record in getattr(_local, "active", ()):
+        record[0] += nbytes
+        record[1].add(path)
+
+
+def _push(record):
+    """Make record collect the I/O of this thread until popped; returns the stack."""
+    active = getattr(_local, "active", None)
+    if active is None:
+        active = _local.active = []
+    active.append(record)
+    return active
+
+
+def _start_profiler(active):
+    """Start a profiler for an outermost call when profiling is on and no other runs."""
+    if not _profile["enabled"] or len(active) > 1 or not _profiler_lock.acquire(blocking=False):
+        return None
+    # Imported on first use; profiling is rare and the headless CLI should start fast
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler (a debugger, an outside cProfile run) is active
+        _profiler_lock.release()
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler):
+    if profiler is None:
+        return
+    profiler.disable()
+    _profiler_lock.release()
+    with _stats_lock:
+        if _profile["stats"] is None:
+            import pstats
+            _profile["stats"] = pstats.Stats(profiler)
+        else:
+            _profile["stats"].add(profiler)
+        _profile["calls"] += 1
+
+
+def _record(name, started, failed, record, first=None):
+    seconds = time.perf_counter() - started
+    with _stats_lock:
+        stats = _call_stats.get(name)
+        if stats is None:
+            stats = _call_stats[name] = CallStats()
+        stats.add(seconds, failed, record[0], len(record[1]), first)
+
+
+def instrument(name):
+    """Decorate a function to record its latency, bytes read and files touched under name.
+
+    Generator functions (streamed UI handlers) stay generators; they are
+    timed from the first step until exhausted or closed, and the time to
+    their first value is recorded too. Bytes are attributed to every
+    instrumented call on the stack, so a UI callback includes what the
+    functions it calls read.
+    """
+    def decorate(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                first = None
+                failed = True
+                # Each step may run on a different worker thread, so the I/O
+                # record is pushed on the stepping thread's stack per step
+                record = [0, set()]
+                gen = fn(*args, **kwargs)
+                try:
+                    while True:
+                        active = _push(record)
+                        profiler = _start_profiler(active)
+                        try:
+                            value = next(gen)
+                        except StopIteration:
+                            failed = False
+                            return
+                        finally:
+                            _stop_profiler(profiler)
+                            active.pop()
+                        if first is None:
+                            first = time.perf_counter() - started
+                        yield value
+                except GeneratorExit:
+                    # Cancelled or superseded by a newer event
+                    failed = False
+                    raise
+                finally:
+                    gen.close()
+                    _record(name, started, failed, record, first)
+            return generator_wrapper
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            record = [0, set()]
+            active = _push(record)
+            profiler = _start_profiler(active)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _stop_profiler(profiler)
+                active.pop()
+                _record(name, started, failed, record)
+        return wrapper
+    return decorate
+
+
+def set_profiling(enabled):
+    """Turn cProfile capture of instrumented calls on or off."""
+    _profile["enabled"] = bool(enabled)
+
+
+def is_profiling():
+    return _profile["enabled"]
+
+
+def reset_diagnostics():
+    """Forget all recorded call statistics and profiles."""
+    with _stats_lock:
+        _call_stats.clear()
+        _profile["stats"] = None
+        _profile["calls"] = 0
+
+
+def get_call_stats():
+    """Get a copy of the recorded statistics as {name: dict}."""
+    with _stats_lock:
+        items = list(_call_stats.items())
+    result = {}
+    for name, stats in items:
+        result[name] = {
+            "calls": stats.calls,
+            "errors": stats.errors,
+            "mean_ms": stats.total / stats.calls * 1000 if stats.calls else 0.0,
+            "p50_ms": stats.percentile(0.5),
+            "p95_ms": stats.percentile(0.95),
+            "max_ms": stats.max * 1000,
+            "first_output_ms": stats.first_total / stats.first_calls * 1000 if stats.first_calls else None,
+            "bytes_read": stats.bytes_read,
+            "files_touched": stats.files,
+            "histogram": list(stats.buckets),
+        }
+    return result
+
+
+def get_diagnostics_rows():
+    """Get one table row per instrumented function, slowest total time first."""
+    stats = get_call_stats()
+    rows = []
+    for name, s in sorted(stats.items(), key=lambda item: item[1]["mean_ms"] * item[1]["calls"], reverse=True):
+        first = "" if s["first_output_ms"] is None else round(s["first_output_ms"], 1)
+        rows.append([
+            name,
+            s["calls"],
+            s["errors"],
+            round(s["mean_ms"], 1),
+            round(s["p50_ms"], 1),
+            round(s["p95_ms"], 1),
+            round(s["max_ms"], 1),
+            first,
+            round(s["bytes_read"] / (1024 * 1024), 2),
+            s["files_touched"],
+        ])
+    return rows
+
+
+def format_profile_report(limit=30):
+    """Format the captured profile, by cumulative time, as plain text."""
+    with _stats_lock:
+        stats = _profile["stats"]
+        calls = _profile["calls"]
+        if stats is None:
+            if _profile["enabled"]:
+                return "Profiling is on; use the Log Viewer and refresh to see the profile"
+            return "Profiling is off"
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(limit)
+    return f"{calls} profiled call(s)\n" + out.getvalue()
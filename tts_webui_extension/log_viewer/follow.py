@@ -0,0 +1,203 @@
+"""Follow a growing log file, like tail -f."""
+
+import os
+import sys
+import time
+import select
+import ctypes
+import ctypes.util
+from collections import deque
+from datetime import datetime
+
+try:
+    from .utils import get_log_directory, tail_lines
+    from .compression import is_compressed
+    from .diagnostics import record_read
+    from .reader import update_fingerprint, read_fingerprint
+    from .rendering import render_log_text
+except ImportError:
+    from utils import get_log_directory, tail_lines
+    from compression import is_compressed
+    from diagnostics import record_read
+    from reader import update_fingerprint, read_fingerprint
+    from rendering import render_log_text
+
+
+# Seconds between checks when inotify is unavailable, and the longest wait
+# between checks when it is (rotation is only seen by stat-ing the path)
+FOLLOW_POLL_INTERVAL = 1.0
+
+# Stop following after this many seconds so abandoned sessions end
+FOLLOW_MAX_SECONDS = 60 * 60
+
+# Largest amount of new data read in one go
+FOLLOW_READ_SIZE = 4 * 1024 * 1024
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+
+
+class _InotifyWatcher:
+    """Wake up when a file changes, using Linux inotify through libc."""
+    
+    def __init__(self, filepath):
+        self.fd = -1
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_ATTRIB | _IN_DELETE_SELF | _IN_MOVE_SELF
+        if libc.inotify_add_watch(fd, os.fsencode(filepath), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, "inotify_add_watch failed")
+        self.fd = fd
+    
+    def wait(self, timeout):
+        """Block until the file changes or timeout seconds pass."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            try:
+                # Drain the queued events; only the wake-up matters
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+    
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class _PollingWatcher:
+    """Fallback for platforms without inotify: just sleep."""
+    
+    def wait(self, timeout):
+        time.sleep(timeout)
+    
+    def close(self):
+        pass
+
+
+def _create_watcher(filepath):
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher(filepath)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return _PollingWatcher()
+
+
+def follow_log_file(filename, max_lines=1000):
+    """Yield the tail of a log every time new lines are appended to it.
+
+    Starts from the last max_lines lines and then reads only the bytes added
+    since the previous read. A truncated file, or one rewritten in place
+    (the bytes already read no longer match their fingerprint), is read
+    again from the start, and a rotated file (a new inode at the same path)
+    is reopened.
+    """
+    if not filename:
+        yield "No file selected"
+        return
+    
+    filepath = os.path.join(get_log_directory(), filename)
+    if not os.path.exists(filepath):
+        yield "File not found"
+        return
+    
+    max_lines = int(max_lines)
+    try:
+        stat = os.stat(filepath)
+        initial, _ = tail_lines(filepath, max_lines)
+        fingerprint = read_fingerprint(filepath, stat.st_size)
+    except OSError as e:
+        yield f"Error reading file: {str(e)}"
+        return
+    
+    if is_compressed(filepath):
+        # Archives are finished logs; there is nothing to follow
+        yield f"[{filename} is archived and no longer written to]\n\n" + "".join(initial)
+        return
+    
+    lines = deque(initial, maxlen=max_lines)
+    # A partial last line is re-read once it is complete
+    pending = b""
+    if lines and not lines[-1].endswith("\n"):
+        pending = lines.pop().encode("utf-8")
+    inode = stat.st_ino
+    offset = stat.st_size
+    mtime_ns = stat.st_mtime_ns
+    notice = ""
+    watcher = _create_watcher(filepath)
+    started = time.monotonic()
+    
+    def render():
+        updated = datetime.now().strftime("%H:%M:%S")
+        header = f"[Following {filename}, last checked {updated}]{notice}\n\n"
+        return render_log_text(list(lines) + [pending.decode("utf-8", errors="ignore")], header)
+    
+    try:
+        yield render()
+        while time.monotonic() - started < FOLLOW_MAX_SECONDS:
+            watcher.wait(FOLLOW_POLL_INTERVAL)
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                # Rotated away and not recreated yet
+                continue
+            
+            changed = (stat.st_size, stat.st_mtime_ns) != (offset, mtime_ns)
+            reset = True
+            if stat.st_ino != inode:
+                notice = " [file was rotated, showing the new file]"
+                lines.clear()
+                pending = b""
+                inode = stat.st_ino
+                offset = 0
+                watcher.close()
+                watcher = _create_watcher(filepath)
+            elif stat.st_size < offset:
+                notice = " [file was truncated, showing it from the start]"
+                lines.clear()
+                pending = b""
+                offset = 0
+            elif changed and offset and read_fingerprint(filepath, offset) != fingerprint:
+                # Same inode and no smaller, but reopened with mode "w" and written again
+                notice = " [file was rewritten, showing it from the start]"
+                lines.clear()
+                pending = b""
+                offset = 0
+            else:
+                reset = False
+            
+            if not changed and not reset:
+                continue
+            
+            mtime_ns = stat.st_mtime_ns
+            if offset == 0:
+                fingerprint = (b"", b"")
+            with open(filepath, "rb") as f:
+                f.seek(offset)
+                while True:
+                    chunk = f.read(FOLLOW_READ_SIZE)
+                    if not chunk:
+                        break
+                    record_read(filepath, len(chunk))
+                    offset += len(chunk)
+                    fingerprint = update_fingerprint(fingerprint, chunk)
+                    data = pending + chunk
+                    cut = data.rfind(b"\n") + 1
+                    pending = data[cut:]
+                    if cut:
+                        text = data[:cut - 1].decode("utf-8", errors="ignore")
+                        lines.extend(line + "\n" for line in text.split("\n"))
+            yield render()
+        
+        notice = f" [stopped following after {FOLLOW_MAX_SECONDS // 60} minutes]"
+        yield render()
+    finally:
+        watcher.close()
@@ -0,0 +1,154 @@
+"""Per-line severity levels of log files, for filtering by level."""
+
+import re
+from array import array
+
+
+# Line classification rules for pip logs: (category, literal). A line lands in
+# every category with a matching rule. Matching is case-sensitive, so list
+# each spelling that matters. Add new failure signatures here.
+PIP_LOG_RULES = [
+    ("error", "ERROR:"),
+    ("error", "Error:"),
+    ("error", "error:"),
+    ("error", "FAILED"),
+    ("error", "Failed"),
+    ("error", "failed"),
+    ("error", "Could not"),
+    ("error", "could not"),
+    ("error", "Exception:"),
+    ("error", "Traceback"),
+    ("warning", "WARNING:"),
+    ("warning", "Warning:"),
+    ("warning", "warning:"),
+    ("warning", "deprecated"),
+    ("warning", "DEPRECATION"),
+    ("success", "Successfully installed"),
+    ("success", "Successfully uninstalled"),
+    ("success", "Requirement already satisfied"),
+    ("success", "finished with status 'done'"),
+]
+
+PIP_LOG_CATEGORIES = ("error", "warning", "success")
+
+# Lines that start a step of a pip run, and the phase of that step. A step
+# lasts until the next one starts; None ends the run. The analyzer's timeline
+# is built from these.
+PIP_STEP_PHASES = {
+    "Collecting ": "resolve",
+    "Obtaining ": "resolve",
+    "Processing ": "resolve",
+    "Downloading ": "download",
+    "Using cached ": "download",
+    "Installing build dependencies": "build",
+    "Preparing metadata": "build",
+    "Building wheel for ": "build",
+    "Created wheel for ": "build",
+    "Installing collected packages": "install",
+    "Attempting uninstall: ": "install",
+    "Successfully installed": None,
+    "Successfully uninstalled": None,
+}
+
+# Lines that mark the progress of a pip run without starting a timed step
+PIP_PROGRESS_LINES = (
+    "Looking in indexes",
+    "Getting requirements to build",
+    "Building wheels",
+    "Found existing installation",
+    "Uninstalling ",
+)
+
+# Lines shown by the "phase" level: every step line that isn't a success
+# line, and the progress lines
+PIP_PHASE_RULES = (
+    [("phase", step) for step, phase in PIP_STEP_PHASES.items() if phase is not None]
+    + [("phase", line) for line in PIP_PROGRESS_LINES]
+)
+
+# Bit of each level in a line's level byte; lines with no bit set are "other"
+LEVEL_BITS = {"error": 1, "warning": 2, "success": 4, "phase": 8}
+
+LINE_LEVELS = ("error", "warning", "success", "phase", "other")
+
+# (label, level) choices for level filters in the UI
+LEVEL_CHOICES = [
+    ("❌ Errors", "error"),
+    ("⚠️ Warnings", "warning"),
+    ("✅ Success", "success"),
+    ("📦 pip Steps", "phase"),
+    ("Other", "other"),
+]
+
+
+def compile_rules(rules):
+    """Compile a rule table into one byte pattern plus a literal -> categories lookup.
+
+    A plain alternation of literals is the fastest form for the re module;
+    named groups or inline flags would make it try every branch at every
+    position.
+    """
+    categories = {}
+    for category, literal in rules:
+        categories.setdefault(literal.encode("utf-8"), set()).add(category)
+    # Longest first, so a literal that contains another one still wins
+    literals = sorted(categories, key=len, reverse=True)
+    pattern = re.compile(b"|".join(re.escape(literal) for literal in literals))
+    return pattern, {literal: tuple(sorted(cats)) for literal, cats in categories.items()}
+
+
+_LEVEL_PATTERN, _level_categories = compile_rules(PIP_LOG_RULES + PIP_PHASE_RULES)
+_LEVEL_LOOKUP = {
+    literal: sum(LEVEL_BITS[category] for category in cats)
+    for literal, cats in _level_categories.items()
+}
+
+_SELECTED_RUN = re.compile(b"\x01+")
+
+
+def line_levels(block):
+    """Level bytes of the lines in a block of whole lines, one per line.
+
+    A last line without a newline gets a byte too. Only lines with a match
+    are located; the rest of the block is left to the regex engine.
+    """
+    count = block.count(b"\n")
+    if block and not block.endswith(b"\n"):
+        count += 1
+    levels = array("B", bytes(count))
+    line = 0
+    counted_to = 0
+    for m in _LEVEL_PATTERN.finditer(block):
+        line += block.count(b"\n", counted_to, m.start())
+        counted_to = m.start()
+        levels[line] |= _LEVEL_LOOKUP[m.group()]
+    return levels
+
+
+def level_table(levels):
+    """Translate table mapping a level byte to 1 when it is at one of levels, else 0.
+
+    Returns None when levels selects every line or none is given, meaning
+    no filtering.
+    """
+    levels = set(levels or ()) & set(LINE_LEVELS)
+    if not levels or levels == set(LINE_LEVELS):
+        return None
+    bits = sum(LEVEL_BITS[level] for level in levels if level != "other")
+    other = "other" in levels
+    return bytes(1 if value & bits or (other and not value) else 0 for value in range(256))
+
+
+def select_lines(levels, table):
+    """(start, end) ranges of the 0-based lines whose level byte table selects.
+
+    The whole array is translated and scanned in C, so this takes
+    milliseconds even for millions of lines.
+    """
+    marks = levels.tobytes().translate(table)
+    return [m.span() for m in _SELECTED_RUN.finditer(marks)]
+
+
+def count_selected(levels, table):
+    """Number of lines whose level byte table selects."""
+    return levels.tobytes().translate(table).count(1)
@@ -0,0 +1,80 @@
+"""Deferred loading of the data shown when the UI first appears, and cancellable log loads."""
+
+import logging
+import threading
+
+try:
+    from gradio.context import Context
+except ImportError:
+    Context = None
+
+logger = logging.getLogger(__name__)
+
+# How many runs of an event that reads logs may run at once, across all
+# users. Gradio's default of one per event queues everybody behind whoever
+# opened the largest log.
+LOG_LOAD_CONCURRENCY = 4
+
+# (session, slot) -> token of the newest load, see latest_only
+_latest_loads = {}
+_latest_lock = threading.Lock()
+
+
+def on_page_load(fn, outputs, inputs=None):
+    """Run fn when a browser loads the page instead of while the layout is built.
+
+    The handler runs on a Gradio worker, so building the UI stays constant
+    time however many logs there are. Returns the event, or None outside a
+    Blocks context.
+    """
+    root = getattr(Context, "root_block", None)
+    if root is None:
+        logger.warning("Log Viewer: no Blocks context, initial data will load on Refresh")
+        return None
+    return root.load(fn=fn, inputs=inputs or [], outputs=outputs)
+
+
+def on_tab_select(tab, fn, outputs, inputs=None):
+    """Run fn when the user opens tab, for work only that tab needs.
+
+    Returns the event, or None without a tab.
+    """
+    if tab is None:
+        return None
+    return tab.select(fn=fn, inputs=inputs or [], outputs=outputs)
+
+
+def run_in_background(fn, name):
+    """Run fn once on a daemon thread, e.g. to warm caches before the first page load."""
+    def runner():
+        try:
+            fn()
+        except Exception:
+            logger.exception("Log Viewer: background task %s failed", name)
+    
+    thread = threading.Thread(target=runner, name=f"log-viewer-{name}", daemon=True)
+    thread.start()
+    return thread
+
+
+def latest_only(slot, request, values):
+    """Yield from the generator values until a newer load starts in the same session and slot.
+
+    A superseded load stops before showing its next value and closes values,
+    so picking another log abandons reading the previous one within one
+    progress update. request is the gr.Request of the event, or None.
+    """
+    key = (getattr(request, "session_hash", None), slot)
+    token = object()
+    with _latest_lock:
+        _latest_loads[key] = token
+    try:
+        for value in values:
+            if _latest_loads.get(key) is not token:
+                return
+            yield value
+    finally:
+        values.close()
+        with _latest_lock:
+            if _latest_loads.get(key) is token:
+                del _latest_loads[key]
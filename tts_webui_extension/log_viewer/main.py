@@ -1,19 +1,57 @@
 """Main entry point for the Log Viewer extension."""
 
+import time
+import logging
+
 import gradio as gr
 
 try:
     from .tab_pip_install import create_pip_install_tab
     from .tab_pip_uninstall import create_pip_uninstall_tab
     from .tab_all_logs import create_all_logs_tab
+    from .tab_search_all import create_search_all_tab
+    from .tab_failures import create_failures_tab
+    from .tab_packages import create_packages_tab
+    from .tab_diagnostics import create_diagnostics_tab
+    from .loading import run_in_background
+    from .utils import get_log_snapshot
+    from .analyzer import get_pip_log_summary
 except ImportError:
     from tab_pip_install import create_pip_install_tab
     from tab_pip_uninstall import create_pip_uninstall_tab
     from tab_all_logs import create_all_logs_tab
+    from tab_search_all import create_search_all_tab
+    from tab_failures import create_failures_tab
+    from tab_packages import create_packages_tab
+    from tab_diagnostics import create_diagnostics_tab
+    from loading import run_in_background
+    from utils import get_log_snapshot
+    from analyzer import get_pip_log_summary
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent building the UI on the last call to log_viewer_ui
+STARTUP_TIMINGS = {}
+
+
+def warm_caches():
+    """Scan the logs directory and analyze the newest installs ahead of the first page load.
+
+    The search catalog reads every log, so it is only brought up to date
+    once a tab that uses it is opened.
+    """
+    get_log_snapshot()
+    get_pip_log_summary()
 
 
 def log_viewer_ui():
-    """Create the main Log Viewer UI with tabs."""
+    """Create the main Log Viewer UI with tabs.
+
+    No log data is read here: each tab fills itself in on page load, and the
+    caches are warmed on a background thread in the meantime.
+    """
+    started = time.perf_counter()
+    
     gr.Markdown(
         """
     # 📋 Log Viewer
@@ -31,6 +69,23 @@ def log_viewer_ui():
         
         with gr.Tab("📁 All Logs"):
             create_all_logs_tab()
+        
+        with gr.Tab("🔎 Search All Logs") as search_all_tab:
+            create_search_all_tab(search_all_tab)
+        
+        with gr.Tab("🧯 Failures") as failures_tab:
+            create_failures_tab(failures_tab)
+        
+        with gr.Tab("📚 Packages") as packages_tab:
+            create_packages_tab(packages_tab)
+        
+        with gr.Tab("⏱️ Diagnostics"):
+            create_diagnostics_tab()
+    
+    run_in_background(warm_caches, "warm-caches")
+    
+    STARTUP_TIMINGS["ui_build_seconds"] = time.perf_counter() - started
+    logger.info("Log Viewer UI built in %.1f ms", STARTUP_TIMINGS["ui_build_seconds"] * 1000)
 
 
 def extension__tts_generation_webui():
@@ -0,0 +1,215 @@
+"""Structured results produced by the log analyzer and the retention planner."""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Optional
+
+
+# Slotted dataclasses need Python 3.10; older versions get plain ones
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_NAME_SEPARATORS = re.compile(r"[-_.]+")
+
+
+def normalize_package_name(name):
+    """Lowercase a package name and turn runs of "-", "_" and "." into "-", as pip compares names (PEP 503)."""
+    return _NAME_SEPARATORS.sub("-", name).strip("-").lower()
+
+
+class Status(Enum):
+    """Overall outcome of a pip log."""
+    
+    SUCCESS = "success"
+    FAILED = "failed"
+    UNKNOWN = "unknown"
+    
+    @property
+    def icon(self):
+        return {"success": "✅", "failed": "❌", "unknown": "❓"}[self.value]
+    
+    @property
+    def label(self):
+        return self.value.upper()
+
+
+@dataclass(**_SLOTS)
+class Finding:
+    """A unique classified line: where it first appeared and how often."""
+    
+    message: str
+    line: int
+    offset: int
+    count: int = 1
+    
+    def to_dict(self):
+        return {"message": self.message, "line": self.line, "offset": self.offset, "count": self.count}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["message"], data["line"], data["offset"], data.get("count", 1))
+
+
+@dataclass(**_SLOTS)
+class PhaseTiming:
+    """Time a pip run spent in one phase or on one package.
+
+    share is the fraction of the log's bytes written meanwhile. throughput
+    is in bytes per second, measured from timestamps or else as reported by
+    pip's progress bar.
+    """
+    
+    name: str
+    seconds: Optional[float] = None
+    share: float = 0.0
+    download_bytes: int = 0
+    throughput: Optional[float] = None
+    
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "share": self.share,
+            "download_bytes": self.download_bytes,
+            "throughput": self.throughput,
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["seconds"], data["share"], data["download_bytes"], data["throughput"])
+
+
+@dataclass(**_SLOTS)
+class PackageRecord:
+    """A package a pip run installed, uninstalled or found already satisfied.
+
+    action is "installed", "uninstalled" or "satisfied"; name is normalized
+    (lowercase, runs of "-", "_" and "." as "-"). version is None when pip
+    didn't print one, and time when the line had no timestamp.
+    """
+    
+    action: str
+    name: str
+    version: Optional[str]
+    line: int
+    time: Optional[float] = None
+    
+    def to_dict(self):
+        return {"action": self.action, "name": self.name, "version": self.version, "line": self.line, "time": self.time}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["action"], data["name"], data["version"], data["line"], data.get("time"))
+
+
+@dataclass(**_SLOTS)
+class AnalysisResult:
+    """Analysis of one pip log, independent of how it is displayed.
+
+    Findings are unique lines in order of first appearance, capped per
+    category; the *_count fields hold the full number of unique lines.
+    started and finished are the first and last line timestamps, when the
+    log has them. phases and package_timings break the run down into pip
+    steps, slowest packages first, and are empty unless the timeline was
+    asked for; their seconds are estimated from log positions when
+    timing_estimated is set. package_records are the
+    packages the run installed, uninstalled or found satisfied, in log order.
+    """
+    
+    filename: str
+    package: str
+    status: Status
+    size: int
+    mtime: float
+    line_count: int
+    error_count: int = 0
+    warning_count: int = 0
+    success_count: int = 0
+    errors: list = field(default_factory=list)
+    warnings: list = field(default_factory=list)
+    successes: list = field(default_factory=list)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    phases: list = field(default_factory=list)
+    package_timings: list = field(default_factory=list)
+    timing_estimated: bool = False
+    package_records: list = field(default_factory=list)
+    
+    @property
+    def duration(self):
+        """Seconds between the first and last timestamp, or None without timestamps."""
+        if self.started is None or self.finished is None:
+            return None
+        return max(0.0, self.finished - self.started)
+    
+    def to_dict(self):
+        """Convert to plain types for JSON or cross-process transfer."""
+        return {
+            "filename": self.filename,
+            "package": self.package,
+            "status": self.status.value,
+            "size": self.size,
+            "mtime": self.mtime,
+            "line_count": self.line_count,
+            "error_count": self.error_count,
+            "warning_count": self.warning_count,
+            "success_count": self.success_count,
+            "errors": [f.to_dict() for f in self.errors],
+            "warnings": [f.to_dict() for f in self.warnings],
+            "successes": [f.to_dict() for f in self.successes],
+            "started": self.started,
+            "finished": self.finished,
+            "phases": [p.to_dict() for p in self.phases],
+            "package_timings": [p.to_dict() for p in self.package_timings],
+            "timing_estimated": self.timing_estimated,
+            "package_records": [r.to_dict() for r in self.package_records],
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            filename=data["filename"],
+            package=data["package"],
+            status=Status(data["status"]),
+            size=data["size"],
+            mtime=data["mtime"],
+            line_count=data["line_count"],
+            error_count=data["error_count"],
+            warning_count=data["warning_count"],
+            success_count=data["success_count"],
+            errors=[Finding.from_dict(f) for f in data["errors"]],
+            warnings=[Finding.from_dict(f) for f in data["warnings"]],
+            successes=[Finding.from_dict(f) for f in data["successes"]],
+            started=data.get("started"),
+            finished=data.get("finished"),
+            phases=[PhaseTiming.from_dict(p) for p in data.get("phases", [])],
+            package_timings=[PhaseTiming.from_dict(p) for p in data.get("package_timings", [])],
+            timing_estimated=data.get("timing_estimated", False),
+            package_records=[PackageRecord.from_dict(r) for r in data.get("package_records", [])],
+        )
+
+
+@dataclass(**_SLOTS)
+class RetentionPolicy:
+    """Limits a set of logs must meet. None means no limit."""
+    
+    max_total_bytes: Optional[int] = None
+    max_age_days: Optional[float] = None
+    keep_last_per_package: Optional[int] = None
+    keep_failed: bool = True
+
+
+@dataclass(**_SLOTS)
+class RetentionPlan:
+    """The logs a policy deletes, each with the reason, and what is kept."""
+    
+    delete: list = field(default_factory=list)
+    reasons: dict = field(default_factory=dict)
+    kept: int = 0
+    kept_bytes: int = 0
+    protected: int = 0
+    
+    @property
+    def reclaimed_bytes(self):
+        return sum(entry.size for entry in self.delete)
@@ -0,0 +1,180 @@
+"""Zero-copy access to the bytes of log files through mmap."""
+
+import mmap
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    from .compression import is_compressed, open_log
+    from .diagnostics import record_read
+except ImportError:
+    from compression import is_compressed, open_log
+    from diagnostics import record_read
+
+
+# Size of the blocks handed to scanners
+READ_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Only map files left alone this long. Touching a mapped page past the end
+# of a file that was truncated meanwhile kills the process with SIGBUS, and
+# a log that is being written to is the one likely to be truncated (an
+# install log reopened for a new run). Busy files are read normally.
+MMAP_MIN_IDLE_SECONDS = 5.0
+
+# Bytes compared at the start of a log and just before the last offset read,
+# to tell a log that only grew from one rewritten in place
+FINGERPRINT_SIZE = 4096
+
+_CAN_DROP_PAGES = hasattr(mmap.mmap, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+
+
+@contextmanager
+def map_log(filepath):
+    """Map a plain log read-only, yielding the mmap or None.
+
+    None means the file should be read with open_log instead: it is
+    archived, empty, busy or can't be mapped on this platform.
+    """
+    if is_compressed(filepath):
+        yield None
+        return
+    with open(filepath, "rb") as f:
+        stat = os.fstat(f.fileno())
+        mm = None
+        if stat.st_size and time.time() - stat.st_mtime >= MMAP_MIN_IDLE_SECONDS:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mm = None
+        try:
+            yield mm
+        finally:
+            if mm is not None:
+                try:
+                    mm.close()
+                except BufferError:
+                    # A scanner abandoned mid-way still holds a view; the
+                    # mapping goes away when it is collected
+                    pass
+
+
+def drop_pages(mm, start, end):
+    """Let the kernel unmap pages in [start, end) that were already scanned.
+
+    The data stays in the page cache, but it stops counting towards this
+    process's resident memory, so scanning a huge log keeps RSS flat.
+    """
+    if not _CAN_DROP_PAGES:
+        return
+    start -= start % mmap.PAGESIZE
+    end -= end % mmap.PAGESIZE
+    if end > start:
+        try:
+            mm.madvise(mmap.MADV_DONTNEED, start, end - start)
+        except OSError:
+            pass
+
+
+def iter_log_blocks(filepath, block_size=READ_BLOCK_SIZE, start=0, end=None):
+    """Yield (offset, block) pairs of whole lines from a log, from byte start to end.
+
+    Mapped files are sliced once per block, without joining partial lines
+    across reads; other files are read and carried over. Only the last block
+    can end without a newline. Offsets of archived logs are positions in the
+    decompressed data, and end is ignored for them.
+    """
+    with map_log(filepath) as mm:
+        if mm is not None:
+            size = len(mm) if end is None else min(end, len(mm))
+            pos = start
+            while pos < size:
+                stop = min(pos + block_size, size)
+                if stop < size:
+                    cut = mm.rfind(b"\n", pos, stop) + 1
+                    if cut == 0:
+                        # A line longer than a block: take all of it
+                        cut = mm.find(b"\n", stop, size) + 1 or size
+                    stop = cut
+                record_read(filepath, stop - pos)
+                yield pos, mm[pos:stop]
+                drop_pages(mm, pos, stop)
+                pos = stop
+            return
+
+    with open_log(filepath) as f:
+        if start:
+            f.seek(start)
+        remaining = None if end is None or is_compressed(filepath) else end - start
+        pos = start
+        carry = b""
+        while remaining is None or remaining > 0:
+            chunk = f.read(block_size if remaining is None else min(block_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            record_read(filepath, len(chunk))
+            data = carry + chunk if carry else chunk
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data
+                continue
+            carry = data[cut:]
+            yield pos, data[:cut] if carry else data
+            pos += cut
+        if carry:
+            yield pos, carry
+
+
+def read_log_bytes(filepath, start, end):
+    """Read bytes [start, end) of a log, slicing the mapping when possible."""
+    with map_log(filepath) as mm:
+        if mm is not None:
+            data = mm[start:end]
+        else:
+            with open_log(filepath) as f:
+                if start:
+                    f.seek(start)
+                data = f.read(end - start)
+    record_read(filepath, len(data))
+    return data
+
+
+def read_log_spans(filepath, spans):
+    """Read the byte ranges [start, end) in spans, in ascending order, opening the log once."""
+    with map_log(filepath) as mm:
+        if mm is not None:
+            chunks = [mm[start:end] for start, end in spans]
+        else:
+            chunks = []
+            with open_log(filepath) as f:
+                for start, end in spans:
+                    f.seek(start)
+                    chunks.append(f.read(end - start))
+    record_read(filepath, sum(len(chunk) for chunk in chunks))
+    return chunks
+
+
+def update_fingerprint(fingerprint, data):
+    """Extend a (head, tail) fingerprint by data, the bytes right after those it covers.
+
+    head is the first FINGERPRINT_SIZE bytes of a log and tail the last
+    FINGERPRINT_SIZE bytes read; start from (b"", b"").
+    """
+    head, tail = fingerprint
+    if len(head) < FINGERPRINT_SIZE:
+        head += data[:FINGERPRINT_SIZE - len(head)]
+    tail = (tail + data[-FINGERPRINT_SIZE:])[-FINGERPRINT_SIZE:]
+    return head, tail
+
+
+def read_fingerprint(filepath, end):
+    """The (head, tail) fingerprint of the first end bytes of a log, as it is now on disk.
+
+    A log that only grew past end matches the fingerprint recorded while
+    reading up to end. One rewritten in place, e.g. reopened with mode "w"
+    for a new install run, keeps its inode but almost never matches.
+    """
+    head, tail = read_log_spans(filepath, [(0, min(FINGERPRINT_SIZE, end)), (max(0, end - FINGERPRINT_SIZE), end)])
+    return head, tail
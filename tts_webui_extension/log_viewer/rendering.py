@@ -0,0 +1,97 @@
+"""Turn log lines into the bounded text shown in a log textbox."""
+
+# Most UTF-8 bytes of log text sent to the browser in one update
+MAX_OUTPUT_BYTES = 2 * 1024 * 1024
+
+# Longer lines are cut, keeping their start
+MAX_LINE_CHARS = 2000
+
+
+def collapse_redraws(line):
+    """Keep only what a terminal would show of a line redrawn with carriage returns.
+
+    pip progress bars rewrite one line many times; only the text after the
+    last carriage return survives, and a carriage return ending the line is
+    dropped. Returns the line and whether anything was collapsed.
+    """
+    ending = "\n" if line.endswith("\n") else ""
+    body = line[:len(line) - len(ending)].rstrip("\r")
+    cut = body.rfind("\r")
+    if cut == -1:
+        return body + ending, False
+    return body[cut + 1:] + ending, True
+
+
+def shorten_line(line, max_chars=MAX_LINE_CHARS):
+    """Cut a line to max_chars characters plus a marker saying how much was left out.
+
+    Returns the line and whether it was shortened.
+    """
+    ending = "\n" if line.endswith("\n") else ""
+    body = line[:len(line) - len(ending)]
+    if len(body) <= max_chars:
+        return line, False
+    return f"{body[:max_chars]} … [{len(body) - max_chars} more characters]{ending}", True
+
+
+def clean_line(line, max_chars=MAX_LINE_CHARS):
+    """collapse_redraws and shorten_line in one, for short texts like analysis findings."""
+    return shorten_line(collapse_redraws(line)[0], max_chars)[0]
+
+
+def _format_size(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB"
+
+
+def render_log_text(lines, header="", keep_end=True, max_bytes=MAX_OUTPUT_BYTES, max_line_chars=MAX_LINE_CHARS):
+    """Join log lines into textbox content of at most about max_bytes.
+
+    Items are lines, or (prefix, line) pairs whose prefix, such as a search
+    hit's line number, is kept as it is. Redrawn lines are collapsed and long
+    ones shortened; if the result is still too large, the lines furthest from
+    the end (or, with keep_end False, from the start) are left out. A note
+    under the header says what was changed.
+    """
+    rendered = []
+    redraws = shortened = 0
+    for item in lines:
+        prefix, line = item if isinstance(item, tuple) else ("", item)
+        line, collapsed = collapse_redraws(line)
+        line, cut = shorten_line(line, max_line_chars)
+        redraws += collapsed
+        shortened += cut
+        rendered.append(prefix + line)
+    
+    budget = max_bytes
+    kept = 0
+    for text in (reversed(rendered) if keep_end else rendered):
+        size = len(text.encode("utf-8", errors="ignore"))
+        if size > budget:
+            break
+        budget -= size
+        kept += 1
+    dropped = len(rendered) - kept
+    dropped_bytes = 0
+    if dropped:
+        left_out = rendered[:dropped] if keep_end else rendered[kept:]
+        dropped_bytes = sum(len(text.encode("utf-8", errors="ignore")) for text in left_out)
+        rendered = rendered[dropped:] if keep_end else rendered[:kept]
+    
+    notes = []
+    if redraws:
+        notes.append(f"collapsed {redraws} progress redraw line(s) to their final state")
+    if shortened:
+        notes.append(f"shortened {shortened} line(s) longer than {max_line_chars} characters")
+    if dropped:
+        where = "earlier" if keep_end else "later"
+        notes.append(
+            f"left out {dropped} {where} line(s) ({_format_size(dropped_bytes)}) "
+            f"to stay under {_format_size(max_bytes)}"
+        )
+    
+    if notes:
+        note = "[Output limited: " + ", ".join(notes) + "]"
+        header = (header.rstrip("\n") + "\n" if header else "") + note + "\n\n"
+    return header + "".join(rendered)
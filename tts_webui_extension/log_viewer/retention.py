@@ -0,0 +1,236 @@
+"""Retention policies: decide which logs to delete and delete them in the background."""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+try:
+    from .utils import get_log_snapshot, invalidate_log_snapshot
+    from .batch import PIP_LOG_PREFIXES, peek_cached_analysis
+    from .analyzer import get_summary_status, peek_pip_log_analysis, quick_pip_log_status
+    from .catalog import get_catalog_statuses
+    from .compression import is_compressed, strip_log_suffix
+    from .models import Status, RetentionPlan
+except ImportError:
+    from utils import get_log_snapshot, invalidate_log_snapshot
+    from batch import PIP_LOG_PREFIXES, peek_cached_analysis
+    from analyzer import get_summary_status, peek_pip_log_analysis, quick_pip_log_status
+    from catalog import get_catalog_statuses
+    from compression import is_compressed, strip_log_suffix
+    from models import Status, RetentionPlan
+
+logger = logging.getLogger(__name__)
+
+# Files deleted between progress updates
+RETENTION_BATCH_SIZE = 100
+
+# Most files listed in a preview
+RETENTION_PREVIEW_ROWS = 100
+
+# A date, time or counter at the end of a log name, e.g. -2024-05-01_10-00-00
+_NAME_SUFFIX = re.compile(r"[-_.]*\d[\d\-_.:T]*$")
+
+# Progress of the running deletion, read by the UI
+_retention_job = {"running": False, "done": 0, "total": 0, "freed": 0, "errors": []}
+_retention_lock = threading.Lock()
+
+
+def package_key(name):
+    """Group logs of the same package or tool: the name without suffixes or timestamps."""
+    stem = strip_log_suffix(name)
+    return _NAME_SUFFIX.sub("", stem) or stem
+
+
+def _load_catalog_statuses():
+    try:
+        return get_catalog_statuses()
+    except sqlite3.Error:
+        logger.exception("Log Viewer: reading log statuses from the catalog failed")
+        return {}
+
+
+def _is_failed_install(entry, catalogued):
+    """Whether a pip log is a failed install, without a full analysis.
+
+    An up-to-date batch or cached analysis decides first, then the status
+    stored in the catalog, then a sampled quick status; full analysis is
+    left to the background batch and catalog workers. Archives can't be
+    sampled, so one in neither is kept to be safe.
+    """
+    if not entry.name.startswith(PIP_LOG_PREFIXES):
+        return False
+    result = peek_cached_analysis(entry)
+    if result is None:
+        try:
+            result = peek_pip_log_analysis(entry.path)
+        except OSError:
+            return False
+    if result is not None:
+        return get_summary_status(result) == Status.FAILED
+    stored = catalogued.get(entry.name)
+    if stored is not None and stored[0] == (entry.size, entry.mtime):
+        return stored[1] == Status.FAILED.value
+    if is_compressed(entry.path):
+        return True
+    try:
+        return quick_pip_log_status(entry.path, for_summary=True) == Status.FAILED
+    except OSError:
+        return False
+
+
+def plan_retention(policy, entries=None):
+    """Work out which logs the policy deletes, from one directory snapshot.
+
+    Rules apply in order: age, then the newest N per package, then the total
+    size limit, deleting the oldest remaining logs first. Failed installs are
+    never deleted when policy.keep_failed is set; their status comes from
+    cached analysis or the catalog, and only logs in neither are sampled.
+    """
+    if entries is None:
+        entries = get_log_snapshot(refresh=True)
+    plan = RetentionPlan()
+    # Snapshot entries are newest first
+    kept = []
+    per_package = {}
+    cutoff = None
+    catalogued = _load_catalog_statuses() if policy.keep_failed else {}
+    if policy.max_age_days is not None:
+        cutoff = time.time() - policy.max_age_days * 24 * 60 * 60
+    
+    for entry in entries:
+        if policy.keep_failed and _is_failed_install(entry, catalogued):
+            plan.protected += 1
+            kept.append((entry, True))
+            continue
+        
+        reason = None
+        if cutoff is not None and entry.mtime < cutoff:
+            reason = f"older than {policy.max_age_days:g} days"
+        elif policy.keep_last_per_package is not None:
+            key = package_key(entry.name)
+            per_package[key] = per_package.get(key, 0) + 1
+            if per_package[key] > policy.keep_last_per_package:
+                reason = f"more than {policy.keep_last_per_package} logs for {key}"
+        
+        if reason:
+            plan.delete.append(entry)
+            plan.reasons[entry.name] = reason
+        else:
+            kept.append((entry, False))
+    
+    total = sum(entry.size for entry, _ in kept)
+    if policy.max_total_bytes is not None and total > policy.max_total_bytes:
+        limit_mb = policy.max_total_bytes / (1024 * 1024)
+        survivors = []
+        # Oldest first
+        for entry, protected in reversed(kept):
+            if total > policy.max_total_bytes and not protected:
+                total -= entry.size
+                plan.delete.append(entry)
+                plan.reasons[entry.name] = f"over the {limit_mb:g} MB limit"
+            else:
+                survivors.append((entry, protected))
+        kept = survivors
+    
+    plan.kept = len(kept)
+    plan.kept_bytes = total
+    plan.delete.sort(key=lambda entry: entry.mtime)
+    return plan
+
+
+def format_retention_plan(plan):
+    """Format a dry-run preview of a plan as Markdown."""
+    mb = 1024 * 1024
+    lines = [
+        f"**Would delete:** {len(plan.delete)} log(s), reclaiming {plan.reclaimed_bytes / mb:.2f} MB",
+        f"**Would keep:** {plan.kept} log(s), {plan.kept_bytes / mb:.2f} MB",
+    ]
+    if plan.protected:
+        lines.append(f"**Failed installs kept:** {plan.protected}")
+    if plan.delete:
+        lines += ["", "| File | Size (KB) | Reason |", "|---|---|---|"]
+        for entry in plan.delete[:RETENTION_PREVIEW_ROWS]:
+            lines.append(f"| {entry.name} | {entry.size / 1024:.1f} | {plan.reasons[entry.name]} |")
+        if len(plan.delete) > RETENTION_PREVIEW_ROWS:
+            lines.append(f"\n_...and {len(plan.delete) - RETENTION_PREVIEW_ROWS} more_")
+    return "\n".join(lines)
+
+
+def _delete_planned(entries):
+    """Delete the planned files in batches, skipping any that changed since planning."""
+    try:
+        for start in range(0, len(entries), RETENTION_BATCH_SIZE):
+            batch = entries[start:start + RETENTION_BATCH_SIZE]
+            freed = 0
+            for entry in batch:
+                try:
+                    stat = os.stat(entry.path)
+                    if (stat.st_size, stat.st_mtime) != (entry.size, entry.mtime):
+                        # Written to since the plan was made
+                        _retention_job["errors"].append(f"{entry.name}: changed since the preview")
+                        continue
+                    os.remove(entry.path)
+                    freed += entry.size
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    _retention_job["errors"].append(f"{entry.name}: {str(e)}")
+            _retention_job["freed"] += freed
+            _retention_job["done"] += len(batch)
+    finally:
+        invalidate_log_snapshot()
+        _retention_job["running"] = False
+
+
+def _claim_retention(plan):
+    """Mark a deletion of plan's logs as running, unless one already is."""
+    with _retention_lock:
+        if _retention_job["running"]:
+            return False
+        _retention_job.update(running=True, done=0, total=len(plan.delete), freed=0, errors=[])
+    return True
+
+
+def start_retention(plan):
+    """Delete a plan's logs on a daemon thread. Returns False if a deletion is already running."""
+    if not _claim_retention(plan):
+        return False
+    thread = threading.Thread(
+        target=_delete_planned, args=(list(plan.delete),), name="log-viewer-retention", daemon=True
+    )
+    thread.start()
+    return True
+
+
+def run_retention(plan):
+    """Delete a plan's logs on the calling thread.
+
+    Returns (logs handled, bytes freed, errors), or None if a deletion is
+    already running.
+    """
+    if not _claim_retention(plan):
+        return None
+    _delete_planned(list(plan.delete))
+    _, done, _, freed, errors = get_retention_progress()
+    return done, freed, errors
+
+
+def get_retention_progress():
+    """Get (running, done, total, bytes freed, errors) of the latest deletion."""
+    job = _retention_job
+    return job["running"], job["done"], job["total"], job["freed"], list(job["errors"])
+
+
+def format_retention_progress():
+    """Format the latest deletion's progress as Markdown."""
+    running, done, total, freed, errors = get_retention_progress()
+    state = "⏳ Deleting" if running else "✅ Deleted"
+    result = f"{state} {done}/{total} log file(s), {freed / (1024 * 1024):.2f} MB freed"
+    if errors:
+        result += "\n\nNot deleted:\n" + "\n".join(errors[:20])
+        if len(errors) > 20:
+            result += f"\n...and {len(errors) - 20} more"
+    return result
@@ -0,0 +1,147 @@
+"""Streaming search over log files."""
+
+import re
+from collections import deque
+
+try:
+    from .reader import iter_log_blocks
+except ImportError:
+    from reader import iter_log_blocks
+
+
+# Size of the binary blocks read while searching
+SEARCH_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def compile_search_pattern(search_term, use_regex=False):
+    """Compile a case-insensitive pattern for a search term.
+
+    ASCII terms are matched against raw bytes so nothing has to be decoded
+    until a line is shown. Other terms fall back to a str pattern, since byte
+    patterns only fold ASCII case.
+    """
+    if search_term.isascii():
+        term = search_term.encode("ascii")
+        if not use_regex:
+            term = re.escape(term)
+    else:
+        term = search_term if use_regex else re.escape(search_term)
+    return re.compile(term, re.IGNORECASE | re.MULTILINE)
+
+
+def _decode(line):
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="ignore")
+    return line.rstrip("\r")
+
+
+def _matching_lines(pattern, block, nl):
+    """Yield (line index within block, line start, line end) for each matching line."""
+    line = 0
+    counted_to = 0
+    next_line_start = 0
+    for m in pattern.finditer(block):
+        start = m.start()
+        if start < next_line_start:
+            # Another match on a line that was already reported
+            continue
+        line_start = block.rfind(nl, 0, start) + 1
+        line_end = block.find(nl, start)
+        if line_end == -1:
+            line_end = len(block)
+        line += block.count(nl, counted_to, line_start)
+        counted_to = line_start
+        next_line_start = line_end + 1
+        yield line, line_start, line_end
+
+
+def _line_end(block, pos, nl):
+    """End of the line starting at pos, excluding its newline."""
+    end = block.find(nl, pos)
+    return len(block) if end == -1 else end
+
+
+def _lines_before(block, pos, count, nl):
+    """(start, end) spans of up to count lines just before the line starting at pos."""
+    spans = []
+    end = pos - 1
+    while len(spans) < count and end >= 0:
+        start = block.rfind(nl, 0, end) + 1
+        spans.append((start, end))
+        end = start - 1
+    spans.reverse()
+    return spans
+
+
+def iter_search_blocks(filepath, pattern, context=0, block_size=SEARCH_BLOCK_SIZE):
+    """Search a file block by block, yielding (bytes_scanned, hits) per block.
+
+    hits is a list of (line_number, text, is_match) tuples with 1-based line
+    numbers; context lines around matches have is_match False. Memory use is
+    bounded by the block size no matter how large the file is, and only the
+    lines in hits are sliced out and decoded; context lines are found by
+    walking newlines around each match.
+    """
+    text_mode = isinstance(pattern.pattern, str)
+    nl = "\n" if text_mode else b"\n"
+    first_line = 1
+    # The last lines of earlier blocks not shown yet, for context
+    before = deque(maxlen=context or None)
+    after_left = 0
+    last_shown = 0
+    
+    for offset, block in iter_log_blocks(filepath, block_size):
+        scanned = offset + len(block)
+        if text_mode:
+            # Lines never straddle blocks, so a multi-byte character never does either
+            block = block.decode("utf-8", errors="ignore")
+        hits = []
+        if not context:
+            for line, start, end in _matching_lines(pattern, block, nl):
+                hits.append((first_line + line, _decode(block[start:end]), True))
+        else:
+            # Position and number of the first line not yet looked at
+            cursor, cursor_line = 0, first_line
+            for line, start, end in _matching_lines(pattern, block, nl):
+                number = first_line + line
+                while after_left and cursor_line < number:
+                    line_end = _line_end(block, cursor, nl)
+                    hits.append((cursor_line, _decode(block[cursor:line_end]), False))
+                    last_shown = cursor_line
+                    cursor, cursor_line = line_end + 1, cursor_line + 1
+                    after_left -= 1
+                
+                lowest = max(number - context, last_shown + 1)
+                if lowest < first_line:
+                    hits.extend((n, _decode(text), False) for n, text in before if n >= lowest)
+                spans = _lines_before(block, start, number - max(lowest, first_line), nl)
+                for i, (span_start, span_end) in enumerate(spans):
+                    hits.append((number - len(spans) + i, _decode(block[span_start:span_end]), False))
+                
+                hits.append((number, _decode(block[start:end]), True))
+                last_shown = number
+                after_left = context
+                cursor, cursor_line = end + 1, number + 1
+            
+            while after_left and cursor < len(block):
+                line_end = _line_end(block, cursor, nl)
+                hits.append((cursor_line, _decode(block[cursor:line_end]), False))
+                last_shown = cursor_line
+                cursor, cursor_line = line_end + 1, cursor_line + 1
+                after_left -= 1
+            
+            if block.endswith(nl):
+                last_line = first_line + block.count(nl) - 1
+                spans = _lines_before(block, len(block), context, nl)
+                for i, (span_start, span_end) in enumerate(spans):
+                    before.append((last_line - len(spans) + 1 + i, block[span_start:span_end]))
+            # Lines already shown must not be repeated as context later
+            while before and before[0][0] <= last_shown:
+                before.popleft()
+        first_line += block.count(nl)
+        yield scanned, hits
+
+
+def search_hit_prefix(line_number, is_match):
+    """The grep-style line number before a hit: ':' after matches, '-' after context lines."""
+    return f"{line_number:>7}{':' if is_match else '-'} "
@@ -1,25 +1,51 @@
 """UI for All Logs tab."""
 
+import time
+
 import gradio as gr
 
 try:
+    from .follow import follow_log_file
+    from .loading import on_page_load, latest_only, LOG_LOAD_CONCURRENCY
+    from .diagnostics import instrument
     from .utils import (
         list_log_files,
         get_log_stats,
         get_log_file_info,
         read_log_file,
+        stream_log_view,
+        get_log_line_count,
         delete_log_file,
-        delete_all_logs,
+        archive_old_logs,
+        ARCHIVE_MIN_AGE_DAYS,
     )
+    from .compression import get_archive_formats
+    from .levels import LEVEL_CHOICES
+    from .models import RetentionPolicy
+    from .retention import plan_retention, format_retention_plan, start_retention, get_retention_progress, format_retention_progress
 except ImportError:
+    from follow import follow_log_file
+    from loading import on_page_load, latest_only, LOG_LOAD_CONCURRENCY
+    from diagnostics import instrument
     from utils import (
         list_log_files,
         get_log_stats,
         get_log_file_info,
         read_log_file,
+        stream_log_view,
+        get_log_line_count,
         delete_log_file,
-        delete_all_logs,
+        archive_old_logs,
+        ARCHIVE_MIN_AGE_DAYS,
     )
+    from compression import get_archive_formats
+    from levels import LEVEL_CHOICES
+    from models import RetentionPolicy
+    from retention import plan_retention, format_retention_plan, start_retention, get_retention_progress, format_retention_progress
+
+
+# Seconds between progress updates while a retention policy is applied
+RETENTION_UPDATE_INTERVAL = 0.25
 
 
 def create_all_logs_tab():
@@ -27,19 +53,43 @@ def create_all_logs_tab():
     with gr.Row():
         with gr.Column(scale=1):
             gr.Markdown("### Log Files")
-            log_stats = gr.Markdown(get_log_stats())
+            log_stats = gr.Markdown("Loading...")
             refresh_btn = gr.Button("🔄 Refresh List", size="sm")
+            # Choices are filled in on page load, see refresh_all
             log_dropdown = gr.Dropdown(
                 label="Select Log File",
-                choices=list_log_files(),
+                choices=[],
                 value=None,
                 interactive=True,
             )
             log_info = gr.Markdown("No file selected")
             
+            delete_btn = gr.Button("🗑️ Delete Selected", size="sm", variant="stop")
+            
             with gr.Row():
-                delete_btn = gr.Button("🗑️ Delete Selected", size="sm", variant="stop")
-                delete_all_btn = gr.Button("🗑️ Delete All", size="sm", variant="stop")
+                archive_days = gr.Number(
+                    label="Archive Logs Older Than (days)",
+                    value=30,
+                    minimum=ARCHIVE_MIN_AGE_DAYS,
+                    precision=0,
+                )
+                archive_format = gr.Dropdown(
+                    label="Format",
+                    choices=get_archive_formats(),
+                    value=get_archive_formats()[0],
+                )
+            archive_btn = gr.Button("🗜️ Archive Old Logs", size="sm")
+            
+            with gr.Accordion("🧹 Retention Policy", open=False):
+                gr.Markdown("Leave a limit empty to not apply it. Preview before applying.")
+                retention_max_mb = gr.Number(label="Max Total Size (MB)", value=None, minimum=0)
+                retention_max_age = gr.Number(label="Max Age (days)", value=None, minimum=0)
+                retention_keep_last = gr.Number(label="Keep Last N per Package", value=None, minimum=0, precision=0)
+                retention_keep_failed = gr.Checkbox(label="Always keep failed installs", value=True)
+                with gr.Row():
+                    retention_preview_btn = gr.Button("👁️ Preview", size="sm")
+                    retention_apply_btn = gr.Button("🧹 Apply Policy", size="sm", variant="stop")
+                retention_result = gr.Markdown("")
         
         with gr.Column(scale=3):
             gr.Markdown("### Log Content")
@@ -60,6 +110,23 @@ def create_all_logs_tab():
                 )
                 view_btn = gr.Button("👁️ View", scale=1)
             
+            with gr.Row():
+                search_regex = gr.Checkbox(label="Regex", value=False)
+                search_context = gr.Number(
+                    label="Context Lines",
+                    value=0,
+                    minimum=0,
+                    maximum=20,
+                    step=1,
+                    precision=0,
+                )
+                level_filter = gr.CheckboxGroup(
+                    label="Levels (none checked shows all lines)",
+                    choices=LEVEL_CHOICES,
+                    value=[],
+                    scale=3,
+                )
+            
             log_content = gr.Textbox(
                 label="Log Content",
                 lines=25,
@@ -68,45 +135,166 @@ def create_all_logs_tab():
                 interactive=False,
             )
             
+            with gr.Row():
+                prev_page_btn = gr.Button("⏮️ Previous Page", size="sm")
+                next_page_btn = gr.Button("⏭️ Next Page", size="sm")
+                page_start = gr.Number(
+                    label="Jump to Line",
+                    value=None,
+                    minimum=1,
+                    precision=0,
+                    scale=2,
+                )
+                jump_btn = gr.Button("↪️ Go", size="sm")
+                last_page_btn = gr.Button("⏬ Last Page", size="sm")
+            
+            with gr.Row():
+                follow_btn = gr.Button("▶️ Follow", size="sm")
+                stop_follow_btn = gr.Button("⏹️ Stop Following", size="sm")
+            
             status_text = gr.Textbox(label="Status", visible=False)
     
     # Event handlers
+    @instrument("all_logs.refresh_all")
     def refresh_all():
         files = list_log_files()
         stats = get_log_stats()
-        return gr.update(choices=files, value=None), stats, "No file selected", ""
+        return gr.update(choices=files, value=None), stats, "No file selected", "", None
     
     refresh_btn.click(
         fn=refresh_all,
         inputs=[],
-        outputs=[log_dropdown, log_stats, log_info, log_content],
+        outputs=[log_dropdown, log_stats, log_info, log_content, page_start],
+    )
+    
+    on_page_load(refresh_all, outputs=[log_dropdown, log_stats, log_info, log_content, page_start])
+    
+    @instrument("all_logs.update_log_info_and_content")
+    def update_log_info_and_content(filename, search_term, max_lines_val, use_regex, context_val, levels, request: gr.Request):
+        if not filename:
+            yield "No file selected", "", None
+            return
+        info = get_log_file_info(filename)
+        view = stream_log_view(filename, search_term, max_lines_val, use_regex, context_val, levels)
+        for content in latest_only("all_logs.content", request, view):
+            yield info, content, None
+    
+    # Follow mode streams appended lines until stopped or another log is picked
+    follow_event = follow_btn.click(
+        fn=instrument("all_logs.follow_log_file")(follow_log_file),
+        inputs=[log_dropdown, max_lines],
+        outputs=[log_content],
     )
     
-    def update_log_info_and_content(filename, search_term, max_lines_val):
-        if filename:
-            info = get_log_file_info(filename)
-            content = read_log_file(filename, search_term, max_lines_val)
-            return info, content
-        return "No file selected", ""
+    stop_follow_btn.click(fn=None, inputs=None, outputs=None, cancels=[follow_event])
     
     log_dropdown.change(
         fn=update_log_info_and_content,
-        inputs=[log_dropdown, search_box, max_lines],
-        outputs=[log_info, log_content],
+        inputs=[log_dropdown, search_box, max_lines, search_regex, search_context, level_filter],
+        outputs=[log_info, log_content, page_start],
+        cancels=[follow_event],
+        # A newer selection starts at once and stops the stale load
+        trigger_mode="multiple",
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
     )
     
+    @instrument("all_logs.view_tail")
+    def view_tail(filename, search_term, max_lines_val, use_regex, context_val, levels, request: gr.Request):
+        view = stream_log_view(filename, search_term, max_lines_val, use_regex, context_val, levels)
+        for content in latest_only("all_logs.content", request, view):
+            yield content, None
+    
+    view_inputs = [log_dropdown, search_box, max_lines, search_regex, search_context, level_filter]
+    
     view_btn.click(
-        fn=read_log_file,
-        inputs=[log_dropdown, search_box, max_lines],
-        outputs=[log_content],
+        fn=view_tail,
+        inputs=view_inputs,
+        outputs=[log_content, page_start],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
     )
     
     search_box.submit(
-        fn=read_log_file,
-        inputs=[log_dropdown, search_box, max_lines],
-        outputs=[log_content],
+        fn=view_tail,
+        inputs=view_inputs,
+        outputs=[log_content, page_start],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
     )
     
+    # Checking a level shows the filtered view at once; a newer change stops an older one
+    level_filter.change(
+        fn=view_tail,
+        inputs=view_inputs,
+        outputs=[log_content, page_start],
+        trigger_mode="multiple",
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
+    )
+    
+    # Paging: page_start holds the first line shown, or None for the tail view
+    @instrument("all_logs.show_page")
+    def show_page(filename, start, max_lines_val, levels):
+        if not filename:
+            return "No file selected", None
+        start = max(int(start), 1)
+        return read_log_file(filename, "", max_lines_val, start, levels=levels), start
+    
+    def last_page_start(filename, max_lines_val):
+        return max(get_log_line_count(filename) - int(max_lines_val) + 1, 1)
+    
+    @instrument("all_logs.prev_page")
+    def prev_page(filename, start, max_lines_val, levels):
+        if start is None:
+            start = last_page_start(filename, max_lines_val)
+        return show_page(filename, int(start) - int(max_lines_val), max_lines_val, levels)
+    
+    @instrument("all_logs.next_page")
+    def next_page(filename, start, max_lines_val, levels):
+        if start is None:
+            start = last_page_start(filename, max_lines_val)
+        else:
+            start = min(int(start) + int(max_lines_val), last_page_start(filename, max_lines_val))
+        return show_page(filename, start, max_lines_val, levels)
+    
+    @instrument("all_logs.show_last_page")
+    def show_last_page(filename, max_lines_val, levels):
+        return read_log_file(filename, "", max_lines_val, levels=levels), None
+    
+    @instrument("all_logs.jump_to_line")
+    def jump_to_line(filename, start, max_lines_val, levels):
+        if start is None:
+            return show_last_page(filename, max_lines_val, levels)
+        return show_page(filename, start, max_lines_val, levels)
+    
+    prev_page_btn.click(
+        fn=prev_page,
+        inputs=[log_dropdown, page_start, max_lines, level_filter],
+        outputs=[log_content, page_start],
+    )
+    
+    next_page_btn.click(
+        fn=next_page,
+        inputs=[log_dropdown, page_start, max_lines, level_filter],
+        outputs=[log_content, page_start],
+    )
+    
+    jump_btn.click(
+        fn=jump_to_line,
+        inputs=[log_dropdown, page_start, max_lines, level_filter],
+        outputs=[log_content, page_start],
+    )
+    
+    page_start.submit(
+        fn=jump_to_line,
+        inputs=[log_dropdown, page_start, max_lines, level_filter],
+        outputs=[log_content, page_start],
+    )
+    
+    last_page_btn.click(
+        fn=show_last_page,
+        inputs=[log_dropdown, max_lines, level_filter],
+        outputs=[log_content, page_start],
+    )
+    
+    @instrument("all_logs.handle_delete")
     def handle_delete(filename):
         status, files = delete_log_file(filename)
         stats = get_log_stats()
@@ -122,14 +310,61 @@ def create_all_logs_tab():
         outputs=[status_text],
     )
     
-    def handle_delete_all():
-        status, files = delete_all_logs()
+    def make_policy(max_mb, max_age, keep_last, keep_failed):
+        return RetentionPolicy(
+            max_total_bytes=None if max_mb is None else int(max_mb * 1024 * 1024),
+            max_age_days=max_age,
+            keep_last_per_package=None if keep_last is None else int(keep_last),
+            keep_failed=keep_failed,
+        )
+    
+    retention_inputs = [retention_max_mb, retention_max_age, retention_keep_last, retention_keep_failed]
+    
+    @instrument("all_logs.preview_retention")
+    def preview_retention(max_mb, max_age, keep_last, keep_failed):
+        plan = plan_retention(make_policy(max_mb, max_age, keep_last, keep_failed))
+        return format_retention_plan(plan)
+    
+    retention_preview_btn.click(
+        fn=preview_retention,
+        inputs=retention_inputs,
+        outputs=[retention_result],
+    )
+    
+    @instrument("all_logs.apply_retention")
+    def apply_retention(max_mb, max_age, keep_last, keep_failed):
+        # Planned again from a fresh snapshot, in case logs changed since the preview
+        plan = plan_retention(make_policy(max_mb, max_age, keep_last, keep_failed))
+        if not plan.delete:
+            yield "Nothing to delete", gr.update(), gr.update(), gr.update(), gr.update()
+            return
+        if not start_retention(plan):
+            yield "A retention policy is already being applied", gr.update(), gr.update(), gr.update(), gr.update()
+            return
+        
+        while get_retention_progress()[0]:
+            yield format_retention_progress(), gr.update(), gr.update(), gr.update(), gr.update()
+            time.sleep(RETENTION_UPDATE_INTERVAL)
+        
+        # The dropdown and stats are refreshed once, after the last batch
+        files = list_log_files()
+        yield format_retention_progress(), gr.update(choices=files, value=None), get_log_stats(), "No file selected", ""
+    
+    retention_apply_btn.click(
+        fn=apply_retention,
+        inputs=retention_inputs,
+        outputs=[retention_result, log_dropdown, log_stats, log_info, log_content],
+    )
+
+    @instrument("all_logs.handle_archive")
+    def handle_archive(days, fmt):
+        status, files = archive_old_logs(days, fmt)
         stats = get_log_stats()
-        return status, files, stats, "No file selected", ""
+        return status, gr.update(choices=files, value=None), stats, "No file selected", ""
     
-    delete_all_btn.click(
-        fn=handle_delete_all,
-        inputs=[],
+    archive_btn.click(
+        fn=handle_archive,
+        inputs=[archive_days, archive_format],
         outputs=[status_text, log_dropdown, log_stats, log_info, log_content],
     ).then(
         fn=lambda x: gr.update(visible=True) if x else gr.update(visible=False),
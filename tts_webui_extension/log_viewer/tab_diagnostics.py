@@ -0,0 +1,81 @@
+"""UI for the Diagnostics tab."""
+
+import gradio as gr
+
+try:
+    from .diagnostics import (
+        DIAGNOSTICS_HEADERS,
+        get_diagnostics_rows,
+        format_profile_report,
+        set_profiling,
+        is_profiling,
+        reset_diagnostics,
+    )
+    from .analyzer import format_analysis_cache_stats
+except ImportError:
+    from diagnostics import (
+        DIAGNOSTICS_HEADERS,
+        get_diagnostics_rows,
+        format_profile_report,
+        set_profiling,
+        is_profiling,
+        reset_diagnostics,
+    )
+    from analyzer import format_analysis_cache_stats
+
+
+def create_diagnostics_tab():
+    """Create the Diagnostics tab UI."""
+    gr.Markdown(
+        "### Call Timings\n"
+        "Latency of every Log Viewer callback and the functions behind it since startup. "
+        "Bytes read and files touched include everything a call reads through the functions it calls."
+    )
+    with gr.Row():
+        refresh_btn = gr.Button("🔄 Refresh", size="sm")
+        reset_btn = gr.Button("🗑️ Reset", size="sm")
+        profile_toggle = gr.Checkbox(label="Profile calls (cProfile, slows them down)", value=is_profiling())
+    cache_stats = gr.Markdown("")
+    stats_table = gr.Dataframe(
+        headers=DIAGNOSTICS_HEADERS,
+        value=[],
+        interactive=False,
+        wrap=True,
+    )
+    profile_report = gr.Textbox(
+        label="Profile (by cumulative time)",
+        lines=20,
+        max_lines=40,
+        show_copy_button=True,
+        interactive=False,
+    )
+    
+    # Event handlers
+    def refresh_diagnostics():
+        return format_analysis_cache_stats(), get_diagnostics_rows(), format_profile_report()
+    
+    refresh_btn.click(
+        fn=refresh_diagnostics,
+        inputs=[],
+        outputs=[cache_stats, stats_table, profile_report],
+    )
+    
+    def handle_reset():
+        reset_diagnostics()
+        return refresh_diagnostics()
+    
+    reset_btn.click(
+        fn=handle_reset,
+        inputs=[],
+        outputs=[cache_stats, stats_table, profile_report],
+    )
+    
+    def toggle_profiling(enabled):
+        set_profiling(enabled)
+        return format_profile_report()
+    
+    profile_toggle.change(
+        fn=toggle_profiling,
+        inputs=[profile_toggle],
+        outputs=[profile_report],
+    )
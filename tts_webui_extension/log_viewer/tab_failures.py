@@ -0,0 +1,75 @@
+"""UI for the Failures tab."""
+
+import time
+
+import gradio as gr
+
+try:
+    from .loading import on_page_load, on_tab_select
+    from .diagnostics import instrument
+    from .catalog import FTS5_AVAILABLE, get_top_failures, schedule_catalog_update, format_catalog_state
+except ImportError:
+    from loading import on_page_load, on_tab_select
+    from diagnostics import instrument
+    from catalog import FTS5_AVAILABLE, get_top_failures, schedule_catalog_update, format_catalog_state
+
+
+FAILURES_HEADERS = ["Failed Logs", "Logs", "Occurrences", "Signature", "Packages", "Example", "Newest Log"]
+
+# Packages listed per signature before the rest are counted
+MAX_LISTED_PACKAGES = 5
+
+
+def _format_packages(packages):
+    if len(packages) <= MAX_LISTED_PACKAGES:
+        return ", ".join(packages)
+    return ", ".join(packages[:MAX_LISTED_PACKAGES]) + f" (+{len(packages) - MAX_LISTED_PACKAGES} more)"
+
+
+def create_failures_tab(tab=None):
+    """Create the Failures tab UI; the catalog is updated when tab is opened."""
+    gr.Markdown(
+        "### Common Failures\n"
+        "Error lines from every pip log, grouped by signature: versions, paths, hashes, "
+        "timestamps and numbers are ignored, so the same failure matches across packages."
+    )
+    with gr.Row():
+        failures_refresh_btn = gr.Button("🔄 Refresh", size="sm")
+        failures_status = gr.Markdown("Loading...")
+    failures_summary = gr.Markdown("")
+    failures_table = gr.Dataframe(
+        headers=FAILURES_HEADERS,
+        value=[],
+        interactive=False,
+        wrap=True,
+    )
+    
+    # Event handlers
+    @instrument("failures.refresh_failures")
+    def refresh_failures():
+        if not FTS5_AVAILABLE:
+            return format_catalog_state(), "", []
+        started = time.perf_counter()
+        failures = get_top_failures()
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        rows = []
+        for signature, occurrences, logs, failed, packages, example, newest in failures:
+            rows.append([failed, logs, occurrences, signature, _format_packages(packages), example, newest])
+        summary = f"**{len(rows)}** most common failure signatures ({elapsed:.0f} ms)" if rows else "No errors found in pip logs"
+        return format_catalog_state(), summary, rows
+    
+    def update_failures():
+        # New and changed logs are ingested in the background; refresh again to see them
+        schedule_catalog_update()
+        return refresh_failures()
+    
+    failures_refresh_btn.click(
+        fn=update_failures,
+        inputs=[],
+        outputs=[failures_status, failures_summary, failures_table],
+    )
+    
+    on_tab_select(tab, update_failures, outputs=[failures_status, failures_summary, failures_table])
+    
+    on_page_load(refresh_failures, outputs=[failures_status, failures_summary, failures_table])
@@ -0,0 +1,156 @@
+"""UI for the Packages tab."""
+
+import time
+from datetime import datetime
+
+import gradio as gr
+
+try:
+    from .loading import on_page_load, on_tab_select
+    from .diagnostics import instrument
+    from .catalog import (
+        FTS5_AVAILABLE, get_package_history, get_package_logs, get_package_set, diff_package_sets,
+        schedule_catalog_update, format_catalog_state,
+    )
+    from .models import Status
+except ImportError:
+    from loading import on_page_load, on_tab_select
+    from diagnostics import instrument
+    from catalog import (
+        FTS5_AVAILABLE, get_package_history, get_package_logs, get_package_set, diff_package_sets,
+        schedule_catalog_update, format_catalog_state,
+    )
+    from models import Status
+
+
+PACKAGE_HISTORY_HEADERS = ["When", "Status", "Log", "Action", "Package", "Version", "Change"]
+PACKAGE_DIFF_HEADERS = ["Package", "Before", "After", "Change"]
+
+_ACTION_LABELS = {"installed": "📥 installed", "uninstalled": "🗑️ uninstalled", "satisfied": "✔️ already satisfied"}
+
+
+def create_packages_tab(tab=None):
+    """Create the Packages tab UI; the catalog is updated when tab is opened."""
+    gr.Markdown(
+        "### Package History\n"
+        "Every install, uninstall and already-satisfied requirement recorded in the pip logs. "
+        "Use `*` as a wildcard, e.g. `nvidia-*`."
+    )
+    with gr.Row():
+        package_query = gr.Textbox(
+            label="Package",
+            placeholder="e.g. torch",
+            scale=4,
+        )
+        package_search_btn = gr.Button("🔍 Search", scale=1)
+    
+    packages_status = gr.Markdown("Loading...")
+    history_summary = gr.Markdown("")
+    history_table = gr.Dataframe(
+        headers=PACKAGE_HISTORY_HEADERS,
+        value=[],
+        interactive=False,
+        wrap=True,
+    )
+    
+    gr.Markdown("### Compare Installs\nThe packages two pip runs left installed, and what changed between them.")
+    with gr.Row():
+        before_dropdown = gr.Dropdown(label="Before", choices=[], interactive=True)
+        after_dropdown = gr.Dropdown(label="After", choices=[], interactive=True)
+    with gr.Row():
+        compare_btn = gr.Button("⚖️ Compare")
+        packages_refresh_btn = gr.Button("🔄 Refresh", size="sm")
+    diff_summary = gr.Markdown("")
+    diff_table = gr.Dataframe(
+        headers=PACKAGE_DIFF_HEADERS,
+        value=[],
+        interactive=False,
+        wrap=True,
+    )
+    
+    # Event handlers
+    @instrument("packages.refresh_packages")
+    def refresh_packages():
+        if not FTS5_AVAILABLE:
+            return format_catalog_state(), gr.update(choices=[]), gr.update(choices=[])
+        logs = get_package_logs()
+        return format_catalog_state(), gr.update(choices=logs), gr.update(choices=logs)
+    
+    def update_packages():
+        # New and changed logs are ingested in the background; refresh again to see them
+        schedule_catalog_update()
+        return refresh_packages()
+    
+    packages_refresh_btn.click(
+        fn=update_packages,
+        inputs=[],
+        outputs=[packages_status, before_dropdown, after_dropdown],
+    )
+    
+    on_tab_select(tab, update_packages, outputs=[packages_status, before_dropdown, after_dropdown])
+    
+    on_page_load(refresh_packages, outputs=[packages_status, before_dropdown, after_dropdown])
+    
+    @instrument("packages.search_packages")
+    def search_packages(query):
+        if not FTS5_AVAILABLE:
+            return format_catalog_state(), "", []
+        if not query or not query.strip():
+            return format_catalog_state(), "Enter a package name", []
+        schedule_catalog_update()
+        
+        started = time.perf_counter()
+        records, total = get_package_history(query.strip())
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        rows = []
+        for when, filename, status, action, name, version, change in records:
+            icon = Status(status).icon if status else ""
+            when = datetime.fromtimestamp(when).strftime("%Y-%m-%d %H:%M") if when else ""
+            rows.append([when, icon, filename, _ACTION_LABELS.get(action, action), name, version or "", change])
+        
+        if total == 0:
+            summary = f"No records found for '{query.strip()}'"
+        else:
+            changes = sum(1 for row in rows if row[6])
+            summary = f"**{total}** records, **{changes}** version changes ({elapsed:.0f} ms)"
+            if total > len(rows):
+                summary += f", showing the newest {len(rows)}"
+        return format_catalog_state(), summary, rows
+    
+    package_search_btn.click(
+        fn=search_packages,
+        inputs=[package_query],
+        outputs=[packages_status, history_summary, history_table],
+    )
+    
+    package_query.submit(
+        fn=search_packages,
+        inputs=[package_query],
+        outputs=[packages_status, history_summary, history_table],
+    )
+    
+    @instrument("packages.compare_installs")
+    def compare_installs(before, after):
+        if not FTS5_AVAILABLE:
+            return format_catalog_state(), []
+        if not before or not after:
+            return "Select two logs to compare", []
+        
+        old, new = get_package_set(before), get_package_set(after)
+        rows = [list(row) for row in diff_package_sets(old, new)]
+        if not rows:
+            return f"No differences between the **{len(old)}** packages of both runs", []
+        counts = {}
+        for row in rows:
+            counts[row[3]] = counts.get(row[3], 0) + 1
+        summary = f"**{len(rows)}** of **{len(old.keys() | new.keys())}** packages differ: " + ", ".join(
+            f"{count} {change}" for change, count in sorted(counts.items())
+        )
+        return summary, rows
+    
+    compare_btn.click(
+        fn=compare_installs,
+        inputs=[before_dropdown, after_dropdown],
+        outputs=[diff_summary, diff_table],
+    )
@@ -1,13 +1,39 @@
 """UI for Pip Install Logs tab."""
 
+import time
+
 import gradio as gr
 
 try:
-    from .utils import get_pip_install_logs, get_log_file_info, read_log_file
-    from .analyzer import analyze_pip_log, get_pip_log_summary
+    from .loading import on_page_load, latest_only, LOG_LOAD_CONCURRENCY
+    from .diagnostics import instrument
+    from .utils import get_pip_install_logs, get_log_file_info, stream_log_view
+    from .analyzer import (
+        stream_pip_log_analysis, analyze_pip_log_timeline, get_pip_log_summary, wait_for_background_analyses,
+    )
+    from .follow import follow_log_file
+    from .levels import LEVEL_CHOICES
+    from .batch import BATCH_TABLE_HEADERS, iter_batch_analysis, get_batch_rows, format_batch_progress
 except ImportError:
-    from utils import get_pip_install_logs, get_log_file_info, read_log_file
-    from analyzer import analyze_pip_log, get_pip_log_summary
+    from loading import on_page_load, latest_only, LOG_LOAD_CONCURRENCY
+    from diagnostics import instrument
+    from utils import get_pip_install_logs, get_log_file_info, stream_log_view
+    from analyzer import (
+        stream_pip_log_analysis, analyze_pip_log_timeline, get_pip_log_summary, wait_for_background_analyses,
+    )
+    from follow import follow_log_file
+    from levels import LEVEL_CHOICES
+    from batch import BATCH_TABLE_HEADERS, iter_batch_analysis, get_batch_rows, format_batch_progress
+
+
+# Seconds between progress updates sent to the browser during a batch
+BATCH_UPDATE_INTERVAL = 0.25
+
+# Longest the summary waits for the background analyses of large logs it
+# started before it gives up; Refresh shows them later
+SUMMARY_WAIT_TIMEOUT = 120.0
+
+TIMELINE_PLACEHOLDER = "Open this tab after selecting a log to see where its time went"
 
 
 def create_pip_install_tab():
@@ -15,24 +41,30 @@ def create_pip_install_tab():
     with gr.Row():
         with gr.Column(scale=1):
             gr.Markdown("### Installation Logs")
-            pip_summary = gr.Markdown(get_pip_log_summary())
+            pip_summary = gr.Markdown("Loading summary...")
             refresh_pip_btn = gr.Button("🔄 Refresh", size="sm")
             
-            # Get initial choices - use cleaned names for display, filenames as values
-            initial_pip_logs = get_pip_install_logs()
+            # Choices are filled in on page load, see refresh_pip
             pip_install_dropdown = gr.Dropdown(
                 label="Select Installation Log",
-                choices=[(name, fname) for name, fname in initial_pip_logs],
+                choices=[],
                 value=None,
                 interactive=True,
             )
             pip_info = gr.Markdown("No file selected")
+            # Paths of the large logs the summary shows a provisional status for
+            summary_pending = gr.State([])
         
         with gr.Column(scale=3):
             with gr.Tabs():
                 with gr.Tab("📊 Analysis"):
                     pip_analysis = gr.Markdown("Select a log file to see analysis")
                 
+                # The timeline takes a second pass over the log, so it is only built here
+                with gr.Tab("⏱️ Timeline") as timeline_tab:
+                    pip_timeline_btn = gr.Button("🔄 Refresh Timeline", size="sm")
+                    pip_timeline = gr.Markdown(TIMELINE_PLACEHOLDER)
+                
                 with gr.Tab("📄 Raw Log"):
                     with gr.Row():
                         pip_search = gr.Textbox(
@@ -50,6 +82,24 @@ def create_pip_install_tab():
                         )
                         pip_view_btn = gr.Button("👁️ View", scale=1)
                     
+                    with gr.Row():
+                        pip_search_regex = gr.Checkbox(label="Regex", value=False)
+                        pip_search_context = gr.Number(
+                            label="Context Lines",
+                            value=0,
+                            minimum=0,
+                            maximum=20,
+                            step=1,
+                            precision=0,
+                        )
+                        pip_level_filter = gr.CheckboxGroup(
+                            label="Levels (none checked shows all lines)",
+                            choices=LEVEL_CHOICES,
+                            value=[],
+                        )
+                        pip_follow_btn = gr.Button("▶️ Follow", size="sm")
+                        pip_stop_follow_btn = gr.Button("⏹️ Stop Following", size="sm")
+                    
                     pip_content = gr.Textbox(
                         label="Log Content",
                         lines=25,
@@ -58,40 +108,146 @@ def create_pip_install_tab():
                         interactive=False,
                     )
     
+                with gr.Tab("📋 Batch Status"):
+                    with gr.Row():
+                        batch_btn = gr.Button("▶️ Analyze All", scale=1)
+                        batch_progress = gr.Markdown("Analyze every pip log at once; unchanged logs are skipped on later runs")
+                    batch_table = gr.Dataframe(
+                        headers=BATCH_TABLE_HEADERS,
+                        value=[],
+                        interactive=False,
+                        wrap=True,
+                    )
+    
     # Event handlers
+    @instrument("pip_install.refresh_pip")
     def refresh_pip():
         logs = get_pip_install_logs()
-        summary = get_pip_log_summary()
+        pending = []
+        summary = get_pip_log_summary(pending)
         choices = [(name, fname) for name, fname in logs]
-        return gr.update(choices=choices, value=None), summary, "No file selected", "Select a log file to see analysis"
+        return gr.update(choices=choices, value=None), summary, "No file selected", "Select a log file to see analysis", pending
+    
+    @instrument("pip_install.finish_summary")
+    def finish_summary(pending):
+        # Replace provisional statuses once the analyses this summary started are done
+        if not pending or not wait_for_background_analyses(pending, SUMMARY_WAIT_TIMEOUT):
+            return gr.update()
+        return get_pip_log_summary()
     
+    refresh_outputs = [pip_install_dropdown, pip_summary, pip_info, pip_analysis, summary_pending]
+    
+    # The wait runs as its own event without a concurrency limit, so it never
+    # holds up page loads of other sessions
     refresh_pip_btn.click(
         fn=refresh_pip,
         inputs=[],
-        outputs=[pip_install_dropdown, pip_summary, pip_info, pip_analysis],
+        outputs=refresh_outputs,
+    ).then(
+        fn=finish_summary,
+        inputs=[summary_pending],
+        outputs=[pip_summary],
+        concurrency_limit=None,
+    )
+    
+    page_load = on_page_load(refresh_pip, outputs=refresh_outputs)
+    if page_load is not None:
+        page_load.then(
+            fn=finish_summary,
+            inputs=[summary_pending],
+            outputs=[pip_summary],
+            concurrency_limit=None,
+        )
+    
+    @instrument("pip_install.update_pip_info_and_analyze")
+    def update_pip_info_and_analyze(filename, request: gr.Request):
+        if not filename:
+            yield "No file selected", "Select a log file to see analysis", TIMELINE_PLACEHOLDER
+            return
+        info = get_log_file_info(filename)
+        for analysis in latest_only("pip_install.analysis", request, stream_pip_log_analysis(filename)):
+            yield info, analysis, TIMELINE_PLACEHOLDER
+    
+    timeline_tab.select(
+        fn=analyze_pip_log_timeline,
+        inputs=[pip_install_dropdown],
+        outputs=[pip_timeline],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
+    )
+    
+    pip_timeline_btn.click(
+        fn=analyze_pip_log_timeline,
+        inputs=[pip_install_dropdown],
+        outputs=[pip_timeline],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
+    )
+    
+    # Follow mode streams appended lines of an install that is still running
+    pip_follow_event = pip_follow_btn.click(
+        fn=instrument("pip_install.follow_log_file")(follow_log_file),
+        inputs=[pip_install_dropdown, pip_max_lines],
+        outputs=[pip_content],
     )
     
-    def update_pip_info_and_analyze(filename):
-        if filename:
-            info = get_log_file_info(filename)
-            analysis = analyze_pip_log(filename)
-            return info, analysis
-        return "No file selected", "Select a log file to see analysis"
+    pip_stop_follow_btn.click(fn=None, inputs=None, outputs=None, cancels=[pip_follow_event])
     
     pip_install_dropdown.change(
         fn=update_pip_info_and_analyze,
         inputs=[pip_install_dropdown],
-        outputs=[pip_info, pip_analysis],
+        outputs=[pip_info, pip_analysis, pip_timeline],
+        # A newer selection starts at once and stops the stale analysis
+        trigger_mode="multiple",
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
+        cancels=[pip_follow_event],
     )
     
+    @instrument("pip_install.view_log")
+    def view_log(filename, search_term, max_lines_val, use_regex, context_val, levels, request: gr.Request):
+        view = stream_log_view(filename, search_term, max_lines_val, use_regex, context_val, levels)
+        yield from latest_only("pip_install.content", request, view)
+    
+    pip_view_inputs = [
+        pip_install_dropdown, pip_search, pip_max_lines, pip_search_regex, pip_search_context, pip_level_filter,
+    ]
+    
     pip_view_btn.click(
-        fn=read_log_file,
-        inputs=[pip_install_dropdown, pip_search, pip_max_lines],
+        fn=view_log,
+        inputs=pip_view_inputs,
         outputs=[pip_content],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
     )
     
     pip_search.submit(
-        fn=read_log_file,
-        inputs=[pip_install_dropdown, pip_search, pip_max_lines],
+        fn=view_log,
+        inputs=pip_view_inputs,
+        outputs=[pip_content],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
+    )
+    
+    pip_level_filter.change(
+        fn=view_log,
+        inputs=pip_view_inputs,
         outputs=[pip_content],
+        trigger_mode="multiple",
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
+    )
+
+    @instrument("pip_install.run_batch")
+    def run_batch():
+        last_update = 0.0
+        for done, total, reused in iter_batch_analysis():
+            now = time.monotonic()
+            if done < total and now - last_update < BATCH_UPDATE_INTERVAL:
+                continue
+            last_update = now
+            if done < total:
+                # Leave the table alone until the batch is complete
+                yield format_batch_progress(done, total, reused), gr.update()
+            else:
+                yield format_batch_progress(done, total, reused), get_batch_rows()
+    
+    batch_btn.click(
+        fn=run_batch,
+        inputs=[],
+        outputs=[batch_progress, batch_table],
     )
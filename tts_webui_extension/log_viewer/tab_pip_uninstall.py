@@ -3,11 +3,17 @@
 import gradio as gr
 
 try:
-    from .utils import get_pip_uninstall_logs, get_log_file_info, read_log_file
-    from .analyzer import analyze_pip_log
+    from .loading import on_page_load, latest_only, LOG_LOAD_CONCURRENCY
+    from .diagnostics import instrument
+    from .utils import get_pip_uninstall_logs, get_log_file_info, stream_log_view
+    from .analyzer import stream_pip_log_analysis
+    from .levels import LEVEL_CHOICES
 except ImportError:
-    from utils import get_pip_uninstall_logs, get_log_file_info, read_log_file
-    from analyzer import analyze_pip_log
+    from loading import on_page_load, latest_only, LOG_LOAD_CONCURRENCY
+    from diagnostics import instrument
+    from utils import get_pip_uninstall_logs, get_log_file_info, stream_log_view
+    from analyzer import stream_pip_log_analysis
+    from levels import LEVEL_CHOICES
 
 
 def create_pip_uninstall_tab():
@@ -15,14 +21,13 @@ def create_pip_uninstall_tab():
     with gr.Row():
         with gr.Column(scale=1):
             gr.Markdown("### Uninstallation Logs")
-            uninstall_count = gr.Markdown(f"**Total Uninstall Logs:** {len(get_pip_uninstall_logs())}")
+            uninstall_count = gr.Markdown("Loading...")
             refresh_uninstall_btn = gr.Button("🔄 Refresh", size="sm")
             
-            # Get initial choices - use cleaned names for display, filenames as values
-            initial_uninstall_logs = get_pip_uninstall_logs()
+            # Choices are filled in on page load, see refresh_uninstall
             pip_uninstall_dropdown = gr.Dropdown(
                 label="Select Uninstallation Log",
-                choices=[(name, fname) for name, fname in initial_uninstall_logs],
+                choices=[],
                 value=None,
                 interactive=True,
             )
@@ -50,6 +55,22 @@ def create_pip_uninstall_tab():
                         )
                         uninstall_view_btn = gr.Button("👁️ View", scale=1)
                     
+                    with gr.Row():
+                        uninstall_search_regex = gr.Checkbox(label="Regex", value=False)
+                        uninstall_search_context = gr.Number(
+                            label="Context Lines",
+                            value=0,
+                            minimum=0,
+                            maximum=20,
+                            step=1,
+                            precision=0,
+                        )
+                        uninstall_level_filter = gr.CheckboxGroup(
+                            label="Levels (none checked shows all lines)",
+                            choices=LEVEL_CHOICES,
+                            value=[],
+                        )
+                    
                     uninstall_content = gr.Textbox(
                         label="Log Content",
                         lines=25,
@@ -59,6 +80,7 @@ def create_pip_uninstall_tab():
                     )
     
     # Event handlers
+    @instrument("pip_uninstall.refresh_uninstall")
     def refresh_uninstall():
         logs = get_pip_uninstall_logs()
         count = f"**Total Uninstall Logs:** {len(logs)}"
@@ -71,27 +93,54 @@ def create_pip_uninstall_tab():
         outputs=[pip_uninstall_dropdown, uninstall_count, uninstall_info, uninstall_analysis],
     )
     
-    def update_uninstall_info_and_analyze(filename):
-        if filename:
-            info = get_log_file_info(filename)
-            analysis = analyze_pip_log(filename)
-            return info, analysis
-        return "No file selected", "Select a log file to see analysis"
+    on_page_load(refresh_uninstall, outputs=[pip_uninstall_dropdown, uninstall_count, uninstall_info, uninstall_analysis])
+    
+    @instrument("pip_uninstall.update_uninstall_info_and_analyze")
+    def update_uninstall_info_and_analyze(filename, request: gr.Request):
+        if not filename:
+            yield "No file selected", "Select a log file to see analysis"
+            return
+        info = get_log_file_info(filename)
+        for analysis in latest_only("pip_uninstall.analysis", request, stream_pip_log_analysis(filename)):
+            yield info, analysis
     
     pip_uninstall_dropdown.change(
         fn=update_uninstall_info_and_analyze,
         inputs=[pip_uninstall_dropdown],
         outputs=[uninstall_info, uninstall_analysis],
+        # A newer selection starts at once and stops the stale analysis
+        trigger_mode="multiple",
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
     )
     
+    @instrument("pip_uninstall.view_log")
+    def view_log(filename, search_term, max_lines_val, use_regex, context_val, levels, request: gr.Request):
+        view = stream_log_view(filename, search_term, max_lines_val, use_regex, context_val, levels)
+        yield from latest_only("pip_uninstall.content", request, view)
+    
+    uninstall_view_inputs = [
+        pip_uninstall_dropdown, uninstall_search, uninstall_max_lines, uninstall_search_regex,
+        uninstall_search_context, uninstall_level_filter,
+    ]
+    
     uninstall_view_btn.click(
-        fn=read_log_file,
-        inputs=[pip_uninstall_dropdown, uninstall_search, uninstall_max_lines],
+        fn=view_log,
+        inputs=uninstall_view_inputs,
         outputs=[uninstall_content],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
     )
     
     uninstall_search.submit(
-        fn=read_log_file,
-        inputs=[pip_uninstall_dropdown, uninstall_search, uninstall_max_lines],
+        fn=view_log,
+        inputs=uninstall_view_inputs,
+        outputs=[uninstall_content],
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
+    )
+    
+    uninstall_level_filter.change(
+        fn=view_log,
+        inputs=uninstall_view_inputs,
         outputs=[uninstall_content],
+        trigger_mode="multiple",
+        concurrency_limit=LOG_LOAD_CONCURRENCY,
     )
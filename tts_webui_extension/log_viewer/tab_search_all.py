@@ -0,0 +1,105 @@
+"""UI for the Search All Logs tab."""
+
+import sqlite3
+import time
+
+import gradio as gr
+
+try:
+    from .loading import on_page_load, on_tab_select
+    from .diagnostics import instrument
+    from .catalog import FTS5_AVAILABLE, search_catalog, schedule_catalog_update, format_catalog_state
+    from .models import Status
+except ImportError:
+    from loading import on_page_load, on_tab_select
+    from diagnostics import instrument
+    from catalog import FTS5_AVAILABLE, search_catalog, schedule_catalog_update, format_catalog_state
+    from models import Status
+
+
+SEARCH_ALL_HEADERS = ["Status", "File", "Line", "Text"]
+
+
+def create_search_all_tab(tab=None):
+    """Create the Search All Logs tab UI; the catalog is updated when tab is opened."""
+    gr.Markdown("### Search Every Log")
+    with gr.Row():
+        search_all_query = gr.Textbox(
+            label="Search",
+            placeholder="e.g. No matching distribution found",
+            scale=4,
+        )
+        search_all_btn = gr.Button("🔍 Search", scale=1)
+    
+    with gr.Row():
+        search_all_fts = gr.Checkbox(
+            label="FTS5 syntax (AND, OR, NOT, prefix*)",
+            value=False,
+        )
+        update_catalog_btn = gr.Button("🔄 Update Catalog", size="sm")
+    
+    catalog_status = gr.Markdown("Loading...")
+    search_all_summary = gr.Markdown("")
+    search_all_results = gr.Dataframe(
+        headers=SEARCH_ALL_HEADERS,
+        value=[],
+        interactive=False,
+        wrap=True,
+    )
+    
+    # Event handlers
+    @instrument("search_all.update_catalog_status")
+    def update_catalog_status():
+        # Ingestion runs in the background; the status shows how far it got
+        schedule_catalog_update()
+        return format_catalog_state()
+    
+    update_catalog_btn.click(
+        fn=update_catalog_status,
+        inputs=[],
+        outputs=[catalog_status],
+    )
+    
+    on_tab_select(tab, update_catalog_status, outputs=[catalog_status])
+    
+    on_page_load(format_catalog_state, outputs=[catalog_status])
+    
+    @instrument("search_all.search_all")
+    def search_all(query, fts_syntax):
+        if not FTS5_AVAILABLE:
+            return format_catalog_state(), "", []
+        if not query or not query.strip():
+            return format_catalog_state(), "Enter a search term", []
+        schedule_catalog_update()
+        
+        started = time.perf_counter()
+        try:
+            hits, total, files = search_catalog(query.strip(), fts_syntax=fts_syntax)
+        except sqlite3.OperationalError as e:
+            return format_catalog_state(), f"Invalid query: {str(e)}", []
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        rows = []
+        for filename, line, text, status in hits:
+            icon = Status(status).icon if status else ""
+            rows.append([icon, filename, line, text])
+        
+        if total == 0:
+            summary = f"No matches found for '{query.strip()}'"
+        else:
+            summary = f"**{total}** matching lines in **{files}** logs ({elapsed:.0f} ms)"
+            if total > len(rows):
+                summary += f", showing the first {len(rows)}, newest logs first"
+        return format_catalog_state(), summary, rows
+    
+    search_all_btn.click(
+        fn=search_all,
+        inputs=[search_all_query, search_all_fts],
+        outputs=[catalog_status, search_all_summary, search_all_results],
+    )
+    
+    search_all_query.submit(
+        fn=search_all,
+        inputs=[search_all_query, search_all_fts],
+        outputs=[catalog_status, search_all_summary, search_all_results],
+    )
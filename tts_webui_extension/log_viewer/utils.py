@@ -1,13 +1,73 @@
 """Utility functions for log file operations."""
 
 import os
-import glob
+import re
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque, namedtuple
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from .search import compile_search_pattern, iter_search_blocks, search_hit_prefix
+    from .compression import (
+        is_log_filename, is_compressed, strip_log_suffix, open_log, get_raw_size, compress_log,
+    )
+    from .reader import iter_log_blocks, read_log_bytes, read_log_spans, update_fingerprint, read_fingerprint
+    from .levels import line_levels, level_table, select_lines, count_selected
+    from .diagnostics import instrument, record_read
+    from .rendering import render_log_text
+except ImportError:
+    from search import compile_search_pattern, iter_search_blocks, search_hit_prefix
+    from compression import (
+        is_log_filename, is_compressed, strip_log_suffix, open_log, get_raw_size, compress_log,
+    )
+    from reader import iter_log_blocks, read_log_bytes, read_log_spans, update_fingerprint, read_fingerprint
+    from levels import line_levels, level_table, select_lines, count_selected
+    from diagnostics import instrument, record_read
+    from rendering import render_log_text
+
+
+# Block size used when reading backwards from the end of a log
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Block size used when scanning a log front to back
+SCAN_BLOCK_SIZE = 1024 * 1024
+
+# Minimum seconds between partial results while searching
+SEARCH_UPDATE_INTERVAL = 0.25
+
+# How many line indexes to keep in memory (8 bytes per line each, plus one
+# for line levels)
+MAX_LINE_INDEXES = 16
+
+# filepath -> LineIndex, least recently used first
+_line_indexes = OrderedDict()
+
+_NEWLINE = re.compile(b"\n")
+
+# Seconds a directory snapshot is reused while the directory mtime is
+# unchanged. Appending to a log doesn't touch the directory mtime, so this
+# bounds how stale sizes and ordering can get.
+SNAPSHOT_MAX_AGE = 5.0
+
+# Youngest logs archive_old_logs will compress, in days
+ARCHIVE_MIN_AGE_DAYS = 1
+
+LogEntry = namedtuple("LogEntry", ["name", "path", "size", "mtime", "inode"])
+
+# Logs directory given to set_log_directory, used instead of the default
+_log_directory = None
+
+# (log_dir, dir mtime_ns, time taken, entries)
+_snapshot = (None, None, 0.0, [])
+
 
 def get_log_directory():
     """Get the path to the logs directory."""
+    if _log_directory is not None:
+        return _log_directory
     # Logs are now stored under installer_scripts/logs relative to CWD
     log_dir = Path.cwd() / "installer_scripts" / "logs"
     try:
@@ -17,58 +77,91 @@ def get_log_directory():
     return str(log_dir)
 
 
-def list_log_files():
-    """List all log files in the logs directory."""
+def set_log_directory(path):
+    """Read logs from path instead of installer_scripts/logs under the working directory.
+
+    None goes back to the default.
+    """
+    global _log_directory
+    _log_directory = None if path is None else os.path.abspath(path)
+    invalidate_log_snapshot()
+
+
+@instrument("utils.get_log_snapshot")
+def get_log_snapshot(refresh=False):
+    """Get the log files in the logs directory as LogEntry tuples, newest first.
+
+    The directory is read with one os.scandir pass, and the result is reused
+    until the directory's mtime changes, SNAPSHOT_MAX_AGE passes, or refresh
+    is set. Every listing and statistics function reads from it.
+    """
+    global _snapshot
     log_dir = get_log_directory()
-    if not os.path.exists(log_dir):
+    try:
+        dir_mtime = os.stat(log_dir).st_mtime_ns
+    except OSError:
         return []
     
-    log_files = glob.glob(os.path.join(log_dir, "*.log"))
-    # Sort by modification time (newest first)
-    log_files.sort(key=os.path.getmtime, reverse=True)
+    cached_dir, cached_mtime, taken, entries = _snapshot
+    now = time.monotonic()
+    if not refresh and cached_dir == log_dir and cached_mtime == dir_mtime and now - taken < SNAPSHOT_MAX_AGE:
+        return entries
     
-    # Return just the filenames
-    return [os.path.basename(f) for f in log_files]
+    entries = []
+    with os.scandir(log_dir) as it:
+        for entry in it:
+            # Same files as glob("*.log"), which skips hidden files, plus archives
+            if not is_log_filename(entry.name):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                # Deleted while scanning
+                continue
+            entries.append(LogEntry(entry.name, entry.path, stat.st_size, stat.st_mtime, stat.st_ino))
+    
+    entries.sort(key=lambda e: e.mtime, reverse=True)
+    _snapshot = (log_dir, dir_mtime, now, entries)
+    return entries
 
 
-def get_pip_install_logs():
-    """Get list of pip installation log files with cleaned names."""
-    log_dir = get_log_directory()
-    if not os.path.exists(log_dir):
-        return []
+def invalidate_log_snapshot():
+    """Forget the cached directory snapshot, e.g. after deleting files."""
+    global _snapshot
+    _snapshot = (None, None, 0.0, [])
+
+
+@instrument("utils.list_log_files")
+def list_log_files():
+    """List all log files in the logs directory."""
+    # Sorted by modification time (newest first)
+    return [entry.name for entry in get_log_snapshot()]
     
-    log_files = glob.glob(os.path.join(log_dir, "pip-install-*.log"))
-    log_files.sort(key=os.path.getmtime, reverse=True)
     
-    # Clean up the filenames for display
+def _get_pip_logs(prefix):
+    """Get (cleaned name, filename) pairs for logs starting with prefix."""
     cleaned = []
-    for f in log_files:
-        basename = os.path.basename(f)
-        # Remove "pip-install-" prefix and ".log" suffix
-        name = basename.replace("pip-install-", "").replace(".log", "")
-        cleaned.append((name, basename))
-    
+    for entry in get_log_snapshot():
+        if entry.name.startswith(prefix):
+            # Remove the prefix and ".log" (or archive) suffix
+            name = strip_log_suffix(entry.name.replace(prefix, ""))
+            cleaned.append((name, entry.name))
     return cleaned
 
 
+def get_pip_install_logs():
+    """Get list of pip installation log files with cleaned names."""
+    return _get_pip_logs("pip-install-")
+
+
 def get_pip_uninstall_logs():
     """Get list of pip uninstallation log files with cleaned names."""
-    log_dir = get_log_directory()
-    if not os.path.exists(log_dir):
-        return []
-    
-    log_files = glob.glob(os.path.join(log_dir, "pip-uninstall-*.log"))
-    log_files.sort(key=os.path.getmtime, reverse=True)
-    
-    cleaned = []
-    for f in log_files:
-        basename = os.path.basename(f)
-        name = basename.replace("pip-uninstall-", "").replace(".log", "")
-        cleaned.append((name, basename))
-    
-    return cleaned
+    return _get_pip_logs("pip-uninstall-")
 
 
+@instrument("utils.get_log_file_info")
 def get_log_file_info(filename):
     """Get information about a log file."""
     if not filename:
@@ -84,11 +177,278 @@ def get_log_file_info(filename):
     size_kb = stat.st_size / 1024
     modified = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
     
+    if is_compressed(filepath):
+        try:
+            raw_kb = get_raw_size(filepath) / 1024
+        except OSError:
+            # Unreadable here, e.g. .log.zst without zstandard: show the size on disk
+            return f"**File:** {filename}\n**Size:** {size_kb:.2f} KB compressed\n**Modified:** {modified}"
+        size = f"{size_kb:.2f} KB compressed ({raw_kb:.2f} KB uncompressed)"
+        return f"**File:** {filename}\n**Size:** {size}\n**Modified:** {modified}"
     return f"**File:** {filename}\n**Size:** {size_kb:.2f} KB\n**Modified:** {modified}"
 
 
-def read_log_file(filename, search_term="", max_lines=1000):
-    """Read and return the contents of a log file."""
+def _split_lines(data):
+    """Split bytes into lines the way readlines() does, keeping the newlines."""
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+        return [line + b"\n" for line in lines]
+    return [line + b"\n" for line in lines[:-1]] + [lines[-1]]
+
+
+class LineIndex:
+    """Byte offsets of every newline in a log file, and optionally the level of every line.
+
+    levels is None until asked for, then holds one byte per line with the
+    levels.LEVEL_BITS of that line, classified in the same pass that finds
+    the newlines. The index remembers the file identity it was built for, so
+    a grown log is extended from where the previous scan stopped instead of
+    being rebuilt.
+    Offsets of archived logs are positions in the decompressed data; size is
+    the decompressed size and file_size the size on disk.
+    """
+    
+    __slots__ = ("inode", "size", "file_size", "mtime_ns", "newlines", "levels", "fingerprint")
+    
+    def __init__(self):
+        self.inode = None
+        self.size = 0
+        self.file_size = 0
+        self.mtime_ns = None
+        self.newlines = array("Q")
+        self.levels = None
+        # Start and end of the bytes indexed, see reader.update_fingerprint
+        self.fingerprint = (b"", b"")
+    
+    @property
+    def line_count(self):
+        """Number of lines, counting a trailing line without a newline."""
+        last_end = self.newlines[-1] + 1 if self.newlines else 0
+        return len(self.newlines) + (1 if self.size > last_end else 0)
+    
+    def line_start(self, line):
+        """Byte offset where the 0-based line starts."""
+        return self.newlines[line - 1] + 1 if line > 0 else 0
+    
+    def line_end(self, line):
+        """Byte offset just past the 0-based line, including its newline."""
+        return self.newlines[line] + 1 if line < len(self.newlines) else self.size
+    
+    def line_at(self, offset):
+        """0-based line number containing the byte offset."""
+        return bisect_right(self.newlines, offset - 1) if offset > 0 else 0
+    
+    def update(self, filepath, stat, with_levels=False):
+        """Bring the index up to date with the file described by stat.
+
+        Levels are kept up to date once with_levels has been asked for.
+        """
+        compressed = is_compressed(filepath)
+        grown = (
+            not compressed
+            and self.inode == stat.st_ino
+            and stat.st_size >= self.size
+            and (stat.st_size > self.size or stat.st_mtime_ns == self.mtime_ns)
+            # Classifying an indexed file means scanning it again anyway
+            and (self.levels is not None or not with_levels)
+        )
+        if grown and stat.st_size > self.size:
+            # A log reopened with mode "w" for a new run keeps its inode and
+            # may well be larger; only extend if the indexed bytes are still there
+            try:
+                grown = read_fingerprint(filepath, self.size) == self.fingerprint
+            except OSError:
+                grown = False
+        if not grown:
+            # New, truncated, rewritten or archived file: start over
+            with_levels = with_levels or self.levels is not None
+            self.newlines = array("Q")
+            self.levels = array("B") if with_levels else None
+            self.size = 0
+            self.fingerprint = (b"", b"")
+        
+        if compressed or stat.st_size > self.size:
+            # An unfinished last line is read again, so its level covers all of it
+            start = self.line_start(len(self.newlines))
+            if self.levels is not None:
+                del self.levels[len(self.newlines):]
+            # Archives are read to the end, their size on disk says nothing
+            end = None if compressed else stat.st_size
+            for base, block in iter_log_blocks(filepath, SCAN_BLOCK_SIZE, start, end):
+                self.newlines.extend(m.start() + base for m in _NEWLINE.finditer(block))
+                if self.levels is not None:
+                    self.levels.extend(line_levels(block))
+                # The rescanned last line is in the fingerprint already
+                self.fingerprint = update_fingerprint(self.fingerprint, block[max(0, self.size - base):])
+                self.size = base + len(block)
+        
+        self.inode = stat.st_ino
+        self.file_size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+
+
+@instrument("utils.get_line_index")
+def get_line_index(filepath, with_levels=False):
+    """Get an up-to-date line index for a file, reusing and extending cached ones.
+
+    with_levels makes sure the index has line levels. They are only built
+    for logs that get filtered by level, since classifying takes several
+    times longer than finding newlines.
+    """
+    stat = os.stat(filepath)
+    index = _line_indexes.pop(filepath, None) or LineIndex()
+    if (index.inode, index.file_size, index.mtime_ns) != (stat.st_ino, stat.st_size, stat.st_mtime_ns) or (
+        with_levels and index.levels is None
+    ):
+        index.update(filepath, stat, with_levels)
+    
+    _line_indexes[filepath] = index
+    while len(_line_indexes) > MAX_LINE_INDEXES:
+        _line_indexes.popitem(last=False)
+    return index
+
+
+def count_lines(filepath):
+    """Count the lines in a file using its cached line index."""
+    return get_line_index(filepath).line_count
+    
+
+@instrument("utils.read_line_range")
+def read_line_range(filepath, start, count):
+    """Return up to count decoded lines starting at the 0-based line start.
+
+    Only the bytes covering the requested lines are read, so any page of a
+    large log costs the same once its line index exists; idle plain logs are
+    sliced from a mapping. Archived logs are decompressed up to the page.
+    """
+    index = get_line_index(filepath)
+    end = min(start + count, index.line_count)
+    if start >= end:
+        return []
+    
+    byte_start = index.line_start(start)
+    byte_end = index.line_end(end - 1)
+    data = read_log_bytes(filepath, byte_start, byte_end)
+    return [line.decode("utf-8", errors="ignore") for line in _split_lines(data)]
+    
+
+def get_log_line_count(filename):
+    """Get the number of lines in a log file, or 0 if it can't be read."""
+    if not filename:
+        return 0
+    
+    filepath = os.path.join(get_log_directory(), filename)
+    try:
+        return count_lines(filepath)
+    except OSError:
+        return 0
+
+
+@instrument("utils.tail_lines")
+def tail_lines(filepath, max_lines):
+    """Return the last max_lines lines of a file, seeking backwards from EOF.
+
+    Only the blocks needed to cover those lines are read and decoded. The second
+    value is True when the whole file was read, i.e. there are no earlier lines.
+    Archived logs can't be read backwards and are streamed to the end instead.
+    """
+    if is_compressed(filepath):
+        return _tail_stream(filepath, max_lines)
+    
+    with open(filepath, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        chunks = []
+        newlines = 0
+        # One extra newline is needed to know where the first kept line starts
+        while pos > 0 and newlines <= max_lines:
+            read_size = min(TAIL_BLOCK_SIZE, pos)
+            pos -= read_size
+            f.seek(pos)
+            chunk = f.read(read_size)
+            record_read(filepath, len(chunk))
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    
+    lines = _split_lines(b"".join(reversed(chunks))) if chunks else []
+    reached_start = pos == 0
+    if not reached_start:
+        # The first line is only partially read
+        lines = lines[1:]
+    if len(lines) > max_lines:
+        lines = lines[-max_lines:]
+        reached_start = False
+    return [line.decode("utf-8", errors="ignore") for line in lines], reached_start
+
+
+def _tail_stream(filepath, max_lines):
+    """tail_lines for files that can only be read front to back."""
+    lines = deque(maxlen=max_lines)
+    total = 0
+    pending = b""
+    with open_log(filepath) as f:
+        while True:
+            chunk = f.read(SCAN_BLOCK_SIZE)
+            if not chunk:
+                break
+            record_read(filepath, len(chunk))
+            data = pending + chunk
+            cut = data.rfind(b"\n") + 1
+            pending = data[cut:]
+            if cut:
+                block = _split_lines(data[:cut])
+                total += len(block)
+                lines.extend(block[-max_lines:])
+    if pending:
+        lines.append(pending)
+        total += 1
+    return [line.decode("utf-8", errors="ignore") for line in lines], total <= max_lines
+
+
+def _numbered(lines, first_line):
+    """Pair decoded lines with the line number prefix of search hits."""
+    return [(search_hit_prefix(number, True), line) for number, line in enumerate(lines, first_line)]
+
+
+def read_level_tail(filepath, table, max_lines):
+    """Return the last max_lines lines at the levels table selects, and how many there are.
+
+    Lines come as (line number prefix, line) pairs. The selection is made on
+    the line index's level bytes, and only the selected lines are read.
+    """
+    index = get_line_index(filepath, with_levels=True)
+    runs = select_lines(index.levels, table)
+    total = count_selected(index.levels, table)
+    
+    wanted = []
+    left = max_lines
+    for start, end in reversed(runs):
+        if left <= 0:
+            break
+        start = max(start, end - left)
+        wanted.append((start, end))
+        left -= end - start
+    wanted.reverse()
+    
+    spans = [(index.line_start(start), index.line_end(end - 1)) for start, end in wanted]
+    lines = []
+    for (start, _), data in zip(wanted, read_log_spans(filepath, spans)):
+        decoded = [line.decode("utf-8", errors="ignore") for line in _split_lines(data)]
+        lines.extend(_numbered(decoded, start + 1))
+    return lines, total
+
+
+@instrument("utils.read_log_file")
+def read_log_file(filename, search_term="", max_lines=1000, start_line=None, use_regex=False, context_lines=0, levels=None):
+    """Read and return the contents of a log file.
+
+    Without a search term, start_line (1-based) selects a page of max_lines
+    lines; when it is empty the last max_lines lines are shown. With a search
+    term, this returns the final result of stream_log_search. levels, names
+    from levels.LINE_LEVELS, limits every view to lines at those levels; the
+    lines then carry their line numbers.
+    """
     if not filename:
         return "No file selected"
     
@@ -98,32 +458,206 @@ def read_log_file(filename, search_term="", max_lines=1000):
     if not os.path.exists(filepath):
         return "File not found"
     
+    max_lines = int(max_lines)
+    table = level_table(levels)
+    
     try:
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
+        if not search_term and start_line:
+            total_lines = count_lines(filepath)
+            start = min(max(int(start_line), 1), max(total_lines, 1))
+            lines = read_line_range(filepath, start - 1, max_lines)
+            if not lines:
+                return "Log file is empty"
+            end = start + len(lines) - 1
+            header = f"[Showing lines {start}-{end} of {total_lines}]\n\n"
+            if table is not None:
+                level_bytes = get_line_index(filepath, with_levels=True).levels
+                lines = [
+                    item for line, item in enumerate(_numbered(lines, start), start - 1)
+                    if table[level_bytes[line]]
+                ]
+                header = f"[Showing lines {start}-{end} of {total_lines}, {len(lines)} at the selected levels]\n\n"
+            return render_log_text(lines, header, keep_end=False)
         
-        # Apply search filter if provided
-        if search_term:
-            lines = [line for line in lines if search_term.lower() in line.lower()]
+        if not search_term and table is not None:
+            lines, total = read_level_tail(filepath, table, max_lines)
+            if not lines:
+                return "No lines at the selected levels"
+            if total > len(lines):
+                return render_log_text(lines, f"[Showing last {len(lines)} of {total} lines at the selected levels]\n\n")
+            return render_log_text(lines, f"[{total} lines at the selected levels]\n\n")
         
-        # Limit number of lines
-        total_lines = len(lines)
-        if total_lines > max_lines:
-            lines = lines[-max_lines:]
-            content = f"[Showing last {max_lines} of {total_lines} lines]\n\n" + "".join(lines)
-        else:
-            content = "".join(lines)
-        
-        if not content.strip():
-            if search_term:
-                return f"No matches found for '{search_term}'"
-            return "Log file is empty"
+        if not search_term:
+            lines, complete = tail_lines(filepath, max_lines)
+            if not "".join(lines).strip():
+                return "Log file is empty"
+            if complete:
+                return render_log_text(lines)
+            total_lines = count_lines(filepath)
+            return render_log_text(lines, f"[Showing last {max_lines} of {total_lines} lines]\n\n")
         
+        content = ""
+        for content in stream_log_search(filename, search_term, max_lines, use_regex, context_lines, levels):
+            pass
         return content
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
 
+class _LevelFilter:
+    """Drops search hits at unselected levels, keeping the context of kept matches.
+
+    A context line can come in an earlier block than the match it leads up
+    to, so the last dropped lines of a block are held back until the next
+    block shows whether a kept match follows.
+    """
+    
+    __slots__ = ("level_bytes", "table", "context", "last_kept", "held")
+    
+    def __init__(self, level_bytes, table, context):
+        self.level_bytes = level_bytes
+        self.table = table
+        self.context = context
+        self.last_kept = None
+        self.held = []
+    
+    def selected(self, number):
+        # Lines appended since the index was built count as "other"
+        level = self.level_bytes[number - 1] if number <= len(self.level_bytes) else 0
+        return self.table[level]
+    
+    def filter(self, hits):
+        """Return the hits of one block to show, in order."""
+        hits = self.held + hits
+        kept_matches = [number for number, _, is_match in hits if is_match and self.selected(number)]
+        kept = []
+        dropped = []
+        i = 0
+        for hit in hits:
+            number = hit[0]
+            while i < len(kept_matches) and kept_matches[i] < number:
+                self.last_kept = kept_matches[i]
+                i += 1
+            if i < len(kept_matches) and kept_matches[i] == number:
+                kept.append(hit)
+            elif (self.last_kept is not None and number - self.last_kept <= self.context) or (
+                i < len(kept_matches) and kept_matches[i] - number <= self.context
+            ):
+                # Matches at other levels can still be context of a kept one
+                kept.append((number, hit[1], False))
+            else:
+                dropped.append(hit)
+        if kept_matches:
+            self.last_kept = kept_matches[-1]
+        last = hits[-1][0] if hits else 0
+        self.held = [hit for hit in dropped if hit[0] > last - self.context]
+        return kept
+
+
+def iter_log_hits(filepath, pattern, context_lines=0, levels=None):
+    """iter_search_blocks, keeping only matches at levels (names from levels.LINE_LEVELS) if given."""
+    table = level_table(levels)
+    if table is None:
+        yield from iter_search_blocks(filepath, pattern, context_lines)
+        return
+    level_filter = _LevelFilter(get_line_index(filepath, with_levels=True).levels, table, context_lines)
+    for scanned, hits in iter_search_blocks(filepath, pattern, context_lines):
+        yield scanned, level_filter.filter(hits)
+
+
+@instrument("utils.stream_log_search")
+def stream_log_search(filename, search_term, max_lines=1000, use_regex=False, context_lines=0, levels=None):
+    """Search a log file, yielding the result text as it grows.
+
+    The file is scanned in binary blocks, so memory stays constant however
+    large the log is, and intermediate results carry a progress header. The
+    last value yielded is the complete result, showing the last max_lines
+    lines of output with their line numbers. With levels, only matches at
+    those levels are kept, looked up in the line index.
+    """
+    if not filename:
+        yield "No file selected"
+        return
+    
+    filepath = os.path.join(get_log_directory(), filename)
+    if not os.path.exists(filepath):
+        yield "File not found"
+        return
+    
+    max_lines = int(max_lines)
+    context_lines = int(context_lines or 0)
+    try:
+        pattern = compile_search_pattern(search_term, use_regex)
+    except re.error as e:
+        yield f"Invalid regex: {str(e)}"
+        return
+    
+    table = level_table(levels)
+    
+    size = get_raw_size(filepath) or 1
+    output = deque(maxlen=max_lines)
+    total_output = 0
+    matches = 0
+    last_line = None
+    last_yield = time.monotonic()
+    
+    def render(progress=None):
+        header = ""
+        if progress is not None:
+            header = f"[Searching... {progress:.0%}, {matches} matching lines so far]\n\n"
+        elif total_output > len(output):
+            header = f"[Showing last {len(output)} of {total_output} lines]\n\n"
+        return render_log_text(output, header)
+    
+    try:
+        for scanned, hits in iter_log_hits(filepath, pattern, context_lines, levels):
+            for line_number, text, is_match in hits:
+                if context_lines and last_line is not None and line_number > last_line + 1:
+                    output.append("--\n")
+                    total_output += 1
+                output.append((search_hit_prefix(line_number, is_match), text + "\n"))
+                total_output += 1
+                matches += is_match
+                last_line = line_number
+            
+            now = time.monotonic()
+            if now - last_yield >= SEARCH_UPDATE_INTERVAL:
+                last_yield = now
+                yield render(min(scanned / size, 1.0))
+    except Exception as e:
+        yield f"Error reading file: {str(e)}"
+        return
+    
+    if not matches:
+        where = " at the selected levels" if table is not None else ""
+        yield f"No matches found for '{search_term}'{where}"
+        return
+    yield render()
+
+
+def stream_log_view(filename, search_term="", max_lines=1000, use_regex=False, context_lines=0, levels=None):
+    """Yield the log view for the UI: a streamed search, or the log tail.
+
+    The line count in the header of a long tail needs the whole log indexed
+    the first time it is shown, so the tail is yielded on its own first.
+    A view filtered by levels needs the index anyway and is not.
+    """
+    if search_term and filename:
+        yield from stream_log_search(filename, search_term, max_lines, use_regex, context_lines, levels)
+        return
+    
+    filepath = os.path.join(get_log_directory(), filename) if filename else None
+    if filepath and level_table(levels) is None and filepath not in _line_indexes and not is_compressed(filepath):
+        try:
+            lines, complete = tail_lines(filepath, int(max_lines))
+        except OSError:
+            lines, complete = [], True
+        if not complete:
+            yield render_log_text(lines, f"[Showing last {int(max_lines)} lines, counting lines...]\n\n")
+    yield read_log_file(filename, search_term, max_lines, levels=levels)
+
+
+@instrument("utils.delete_log_file")
 def delete_log_file(filename):
     """Delete a log file."""
     if not filename:
@@ -137,27 +671,30 @@ def delete_log_file(filename):
     
     try:
         os.remove(filepath)
+        invalidate_log_snapshot()
         return f"Successfully deleted {filename}", list_log_files()
     except Exception as e:
         return f"Error deleting file: {str(e)}", list_log_files()
 
 
+@instrument("utils.delete_all_logs")
 def delete_all_logs():
     """Delete all log files."""
     log_dir = get_log_directory()
     if not os.path.exists(log_dir):
         return "Logs directory not found", []
     
-    log_files = glob.glob(os.path.join(log_dir, "*.log"))
     deleted_count = 0
     errors = []
     
-    for filepath in log_files:
+    for entry in get_log_snapshot(refresh=True):
         try:
-            os.remove(filepath)
+            os.remove(entry.path)
             deleted_count += 1
         except Exception as e:
-            errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+            errors.append(f"{entry.name}: {str(e)}")
+    
+    invalidate_log_snapshot()
     
     result = f"Deleted {deleted_count} log file(s)"
     if errors:
@@ -166,14 +703,69 @@ def delete_all_logs():
     return result, list_log_files()
 
 
+@instrument("utils.archive_old_logs")
+def archive_old_logs(older_than_days, fmt="gz"):
+    """Compress the logs last modified more than older_than_days days ago.
+
+    Each log is replaced by a .log.gz or .log.zst archive, which every view
+    reads transparently.
+    """
+    log_dir = get_log_directory()
+    if not os.path.exists(log_dir):
+        return "Logs directory not found", []
+    
+    older_than_days = float(older_than_days or 0)
+    if older_than_days < ARCHIVE_MIN_AGE_DAYS:
+        # Recent logs may still be written to by a running install
+        return f"Only logs older than {ARCHIVE_MIN_AGE_DAYS} day(s) can be archived", list_log_files()
+    
+    cutoff = time.time() - older_than_days * 24 * 60 * 60
+    archived_count = 0
+    saved = 0
+    errors = []
+    
+    for entry in get_log_snapshot(refresh=True):
+        if is_compressed(entry.path) or entry.mtime >= cutoff:
+            continue
+        try:
+            target = compress_log(entry.path, fmt)
+            archived_count += 1
+            saved += entry.size - os.path.getsize(target)
+        except (OSError, ValueError) as e:
+            errors.append(f"{entry.name}: {str(e)}")
+    
+    invalidate_log_snapshot()
+    
+    result = f"Archived {archived_count} log file(s), saving {saved / (1024 * 1024):.2f} MB"
+    if errors:
+        result += f"\n\nErrors:\n" + "\n".join(errors)
+    
+    return result, list_log_files()
+
+
+@instrument("utils.get_log_stats")
 def get_log_stats():
     """Get statistics about the logs directory."""
     log_dir = get_log_directory()
     if not os.path.exists(log_dir):
         return "Logs directory not found"
     
-    log_files = glob.glob(os.path.join(log_dir, "*.log"))
-    total_size = sum(os.path.getsize(f) for f in log_files)
+    log_files = get_log_snapshot()
+    total_size = sum(entry.size for entry in log_files)
     total_size_mb = total_size / (1024 * 1024)
     
-    return f"**Total Log Files:** {len(log_files)}\n**Total Size:** {total_size_mb:.2f} MB"
+    archived = [entry for entry in log_files if is_compressed(entry.path)]
+    if not archived:
+        return f"**Total Log Files:** {len(log_files)}\n**Total Size:** {total_size_mb:.2f} MB"
+
+    raw_size = total_size
+    for entry in archived:
+        try:
+            raw_size += get_raw_size(entry.path) - entry.size
+        except OSError:
+            pass
+    raw_size_mb = raw_size / (1024 * 1024)
+    return (
+        f"**Total Log Files:** {len(log_files)} ({len(archived)} archived)\n"
+        f"**Total Size:** {total_size_mb:.2f} MB on disk, {raw_size_mb:.2f} MB uncompressed"
+    )